@@ -4,7 +4,15 @@ import os
 # Add the project root to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from backend.app import app
+# With COMPACT_MODEL_PATH set, serve resume analysis from the NumPy-only
+# export instead: a much faster cold start, without the other endpoints
+if os.environ.get('COMPACT_MODEL_PATH'):
+    from backend.lite_app import create_app
+else:
+    from backend.app import create_app
+
+# Load and warm up the model once per cold start
+app = create_app()
 
 # Required for Vercel serverless deployment
-handler = app
\ No newline at end of file
+handler = app
@@ -2,16 +2,26 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 import json
 import os
-from werkzeug.utils import secure_filename
-import PyPDF2
-import docx
+import sys
 import re
 
+# Share the text extraction code with the backend service
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from docx_text import extract_docx_text
+from pdf_text import extract_pdf_text
+from skill_taxonomy import get_skill_index
+from user_store import DuplicateEmail, UserStore, parse_skills
+
 app = Flask(__name__)
 CORS(app)
 
-# User data storage (in production, use a database)
-users = []
+# Registered users, kept in SQLite and shared by every worker
+user_store = UserStore()
+# Upper bound on users registered by a single /api/register request
+MAX_BULK_USERS = int(os.environ.get('MAX_BULK_USERS', 10000))
+# A password takes about 0.3s of one core to hash, so far fewer users
+# with a password are taken per request
+MAX_BULK_PASSWORDS = int(os.environ.get('MAX_BULK_PASSWORDS', 20))
 
 # Career recommendations based on skills
 CAREER_RECOMMENDATIONS = {
@@ -21,48 +31,24 @@ CAREER_RECOMMENDATIONS = {
     'business': ['Business Analyst', 'Project Manager', 'Product Manager']
 }
 
-UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf', 'docx'}
 
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
-
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_UPLOAD_MB', 10)) * 1024 * 1024
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def extract_text_from_pdf(pdf_path):
-    text = ""
-    with open(pdf_path, 'rb') as file:
-        reader = PyPDF2.PdfReader(file)
-        for page in reader.pages:
-            text += page.extract_text()
-    return text
-
-def extract_text_from_docx(docx_path):
-    doc = docx.Document(docx_path)
-    text = ""
-    for paragraph in doc.paragraphs:
-        text += paragraph.text + "\n"
-    return text
+def extract_text_from_pdf(pdf_file):
+    # Pages are read straight from the upload stream, one at a time
+    return extract_pdf_text(pdf_file)
+
+def extract_text_from_docx(docx_file):
+    # Paragraphs are parsed straight from the upload stream, never saved to disk
+    return extract_docx_text(docx_file)
 
 def extract_skills(text):
-    # Simple skill extraction using common keywords
-    skill_keywords = [
-        'python', 'java', 'javascript', 'html', 'css', 'react', 'angular', 'vue',
-        'sql', 'database', 'aws', 'azure', 'docker', 'kubernetes', 'git',
-        'machine learning', 'data analysis', 'project management', 'leadership',
-        'communication', 'problem solving', 'teamwork', 'agile', 'scrum'
-    ]
-    
-    found_skills = []
-    text_lower = text.lower()
-    for skill in skill_keywords:
-        if skill in text_lower:
-            found_skills.append(skill)
-    
-    return found_skills
+    # Whole-word matching against the skill taxonomy, synonyms included
+    return get_skill_index().find(text)
 
 def analyze_resume(resume_text, job_description):
     # Extract skills from both resume and job description
@@ -80,15 +66,50 @@ def analyze_resume(resume_text, job_description):
 
 @app.route('/api/register', methods=['POST'])
 def register():
-    data = request.json
-    users.append(data)
-    return jsonify({'message': 'User registered successfully'})
+    # One user, or a list of users to register in bulk
+    data = request.get_json(silent=True)
+    users = data if isinstance(data, list) else [data]
+    if not users or not all(isinstance(user, dict) for user in users):
+        return jsonify({'message': 'Please provide a user or a list of users'}), 400
+    if len(users) > MAX_BULK_USERS:
+        return jsonify({'message': f'At most {MAX_BULK_USERS} users can be registered per request'}), 400
+    if sum(1 for user in users if user.get('password')) > MAX_BULK_PASSWORDS:
+        return jsonify({'message': f'At most {MAX_BULK_PASSWORDS} users with a password can be registered per request'}), 400
+
+    try:
+        user_ids = user_store.add_many(users)
+    except DuplicateEmail as e:
+        return jsonify({'message': str(e)}), 409
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    if isinstance(data, list):
+        return jsonify({'message': f'{len(user_ids)} users registered successfully', 'user_ids': user_ids})
+    return jsonify({'message': 'User registered successfully', 'user_id': user_ids[0]})
 
 @app.route('/api/recommendations', methods=['POST'])
 def get_recommendations():
-    data = request.json
-    skills = data.get('skills', '').lower()
-    
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    try:
+        skills = parse_skills(data.get('skills'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # Skills given at registration, looked up by user id or email
+    if data.get('user_id') is not None:
+        if not isinstance(data['user_id'], int):
+            return jsonify({'error': 'user_id must be an integer'}), 400
+        stored = user_store.skills(data['user_id'])
+    elif data.get('email'):
+        stored = user_store.skills_by_email(data['email'])
+    else:
+        stored = []
+    if stored is None:
+        return jsonify({'error': 'User not found'}), 404
+    skills = ', '.join([*skills, *stored])
+
     # Simple recommendation logic based on skills
     recommendations = []
     for category, careers in CAREER_RECOMMENDATIONS.items():
@@ -110,22 +131,18 @@ def analyze_resume_endpoint():
         return jsonify({'error': 'No selected file'}), 400
     
     if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        
-        # Extract text based on file type
-        if filename.endswith('.pdf'):
-            resume_text = extract_text_from_pdf(filepath)
-        else:
-            resume_text = extract_text_from_docx(filepath)
+        # Extract text based on file type, in memory from the upload
+        try:
+            if file.filename.lower().endswith('.pdf'):
+                resume_text = extract_text_from_pdf(file.stream)
+            else:
+                resume_text = extract_text_from_docx(file.stream)
+        except Exception:
+            return jsonify({'error': 'Could not read the resume file'}), 400
         
         # Analyze resume
         analysis = analyze_resume(resume_text, job_description)
         
-        # Clean up
-        os.remove(filepath)
-        
         return jsonify(analysis)
     
     return jsonify({'error': 'Invalid file type'}), 400
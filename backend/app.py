@@ -1,21 +1,35 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import pandas as pd
-import joblib
+import logging
 import os
-# Change this line
-from backend.resume_analyzer import ResumeAnalyzer
-# To this
-from resume_analyzer import ResumeAnalyzer
-import PyPDF2
-from io import BytesIO
-import re
-from flask import Flask, request, jsonify, send_from_directory
+import sys
+import time
+# Make the sibling modules importable both from the project root
+# (gunicorn backend.app) and from inside backend/ (gunicorn --chdir backend)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from resume_analyzer import SCORING_MODE, SCORING_MODES, ResumeAnalyzer, section_digests
+from result_cache import analysis_key, create_cache, hash_upload
+from revision_store import RevisionStore
+from extraction_pool import ExtractionPool, ExtractionPoolBusy, EXTRACTION_RETRY_AFTER
+from section_parser import is_resume_data, parse_sections
+from skill_taxonomy import get_skill_index
+from career_matrix import CareerMatrix, load_careers
+from job_index import DEFAULT_INDEX_PATH, JobIndex, resume_text
+from resume_store import create_store
+from job_queue import JOB_RETRY_AFTER, JobQueueFull, create_queue
+from model_registry import ModelWatcher, create_registry
+import telemetry
+from telemetry import configure_logging, span
+from flask import Flask, request, jsonify, send_from_directory, g
+
+# JSON log lines on stderr; LOG_LEVEL=OFF silences them
+configure_logging()
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__, static_folder='../static')
+# Reject oversized uploads up front so per-request memory stays bounded
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_UPLOAD_MB', 10)) * 1024 * 1024
 
 # Serve frontend
 @app.route('/')
@@ -29,9 +43,46 @@ def serve_static(path):
 CORS(app)  # Enable CORS for all routes
 
 # Initialize resume analyzer
-print("Initializing ResumeAnalyzer...")
+logger.info("Initializing ResumeAnalyzer...")
 resume_analyzer = ResumeAnalyzer()
 
+# With MODEL_REGISTRY_DIR set, the active version comes from the registry and
+# each worker swaps in new versions as they are activated
+model_registry = create_registry()
+model_watcher = None
+
+# PDF parsing runs in separate processes so a slow or malformed document
+# cannot block the request thread
+extraction_pool = ExtractionPool()
+
+# Extracted text and analysis results keyed on the SHA-256 of the upload
+result_cache = create_cache()
+
+# The last analysis of every resume_id, shared with the job queue workers
+revision_store = RevisionStore()
+# Longest resume_id accepted for tracking the revisions of a resume
+MAX_RESUME_ID_LENGTH = 200
+
+# Upper bound on resumes scored by a single /api/analyze-resumes request
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', 5000))
+
+# Filled in by create_app and reported by /healthz
+model_state = {
+    'ready': False,
+    'model_version': None,
+    'load_seconds': None,
+    'warmup_seconds': None,
+    'error': None
+}
+
+# Scored once at startup so the first real request does not pay for lazy
+# imports and the first scikit-learn call
+WARMUP_RESUME = {
+    'skills': ['Python', 'SQL', 'Communication'],
+    'experience': 'Software Developer with 3 years experience',
+    'education': 'Bachelor in Computer Science'
+}
+
 # Sample career data (in a real application, this would come from a database)
 careers_data = {
     'Software Engineer': {
@@ -71,211 +122,471 @@ careers_data = {
     }
 }
 
-# Create TF-IDF vectorizer
-vectorizer = TfidfVectorizer()
+# A larger catalog can be loaded from a JSONL file instead
+if os.environ.get('CAREERS_CATALOG_PATH'):
+    careers_data = load_careers(os.environ['CAREERS_CATALOG_PATH'])
 
-# Prepare training data
-all_skills = [' '.join(career['skills']) for career in careers_data.values()]
-vectorizer.fit(all_skills)
+# Precompute the career vectors once, before gunicorn forks
+career_matrix = CareerMatrix(careers_data)
 
-def calculate_career_match(user_skills, career_skills):
-    try:
-        # Convert skills to TF-IDF vectors
-        user_vector = vectorizer.transform([' '.join(user_skills)])
-        career_vector = vectorizer.transform([' '.join(career_skills)])
-        
-        # Calculate cosine similarity
-        similarity = cosine_similarity(user_vector, career_vector)[0][0]
-        return similarity * 100
-    except Exception as e:
-        print(f"Error in calculate_career_match: {str(e)}")
-        return 0
+def recommend_careers(data):
+    # The top 3 careers for a profile, as a (body, status) pair. Shared with
+    # the ASGI entry point in asgi_app.py.
+    if not isinstance(data, dict):
+        return {'error': 'Request body must be a JSON object'}, 400
+    user_skills = data.get('skills', [])
+    expected_salary = data.get('expected_salary', 0)
+    years_experience = data.get('years_experience', 0)
+    education_level = data.get('education_level', '')
 
-def adjust_match_by_salary(match_score, user_expected_salary, career_salary_range):
-    try:
-        salary_match = 1.0
-        if user_expected_salary > career_salary_range['max']:
-            salary_match = 0.7
-        elif user_expected_salary < career_salary_range['min']:
-            salary_match = 0.9
-        return match_score * salary_match
-    except Exception as e:
-        print(f"Error in adjust_match_by_salary: {str(e)}")
-        return match_score
+    if not user_skills:
+        return {'error': 'Please provide at least one skill'}, 400
+
+    # Map synonyms such as 'k8s' or 'reactjs' onto the names used in careers_data
+    user_skills = get_skill_index().normalize(user_skills)
+
+    # Score every career at once, then keep the top 3
+    scores = career_matrix.score(user_skills, expected_salary, years_experience, education_level)
+    recommendations = []
+    for index in career_matrix.top(scores, 3):
+        career_data = career_matrix.careers[index]
+        recommendations.append({
+            'career': career_matrix.names[index],
+            'match_score': round(float(scores[index]), 2),
+            'description': career_data['description'],
+            'required_skills': career_data['skills'],
+            'salary_range': career_data['salary_range']
+        })
+    return {'recommendations': recommendations}, 200
 
 @app.route('/api/career-recommendations', methods=['POST'])
 def get_career_recommendations():
     try:
-        data = request.json
-        
-        user_skills = data.get('skills', [])
-        expected_salary = data.get('expected_salary', 0)
-        years_experience = data.get('years_experience', 0)
-        education_level = data.get('education_level', '')
-        
-        if not user_skills:
-            return jsonify({'error': 'Please provide at least one skill'}), 400
-        
-        recommendations = []
-        
-        for career_name, career_data in careers_data.items():
-            # Calculate base match score
-            match_score = calculate_career_match(user_skills, career_data['skills'])
-            
-            # Adjust score based on salary expectations
-            match_score = adjust_match_by_salary(
-                match_score,
-                expected_salary,
-                career_data['salary_range']
-            )
-            
-            # Additional adjustments based on experience and education
-            if years_experience >= 5:
-                match_score *= 1.1
-            if education_level.lower() in ['masters', 'phd']:
-                match_score *= 1.05
-                
-            recommendations.append({
-                'career': career_name,
-                'match_score': round(match_score, 2),
-                'description': career_data['description'],
-                'required_skills': career_data['skills'],
-                'salary_range': career_data['salary_range']
-            })
-        
-        # Sort by match score and return top 3
-        recommendations.sort(key=lambda x: x['match_score'], reverse=True)
-        return jsonify({'recommendations': recommendations[:3]})
+        body, status = recommend_careers(request.json)
+        return jsonify(body), status
     
     except Exception as e:
-        print(f"Error in get_career_recommendations: {str(e)}")
+        logger.exception("Error in get_career_recommendations")
+        return jsonify({'error': 'An error occurred while processing your request'}), 500
+
+# Analyzed uploads are kept for /api/rank-candidates when RESUME_STORE_PATH is set
+resume_store = create_store(resume_analyzer)
+MAX_RANKED_CANDIDATES = int(os.environ.get('MAX_RANKED_CANDIDATES', 100))
+
+# Analyses submitted with async=1 wait here for the job_queue.py workers
+job_queue = create_queue()
+
+# Optional ANN index over a large job catalog, built with job_index.py and
+# memory-mapped by create_app when present
+job_index = None
+MAX_JOB_MATCHES = int(os.environ.get('MAX_JOB_MATCHES', 50))
+
+@app.route('/api/job-matches', methods=['POST'])
+def get_job_matches():
+    try:
+        if job_index is None:
+            return jsonify({'error': 'No job catalog index is loaded'}), 503
+
+        data = request.get_json(silent=True)
+        if not is_resume_data(data):
+            return jsonify({'error': 'Request body must be an object with a list of skills and '
+                                     'experience and education texts'}), 400
+        if not data.get('skills') and not data.get('experience'):
+            return jsonify({'error': 'Please provide skills or experience'}), 400
+
+        try:
+            top_k = min(int(data.get('top_k', 10)), MAX_JOB_MATCHES)
+            nprobe = data.get('nprobe')
+            nprobe = None if nprobe is None else int(nprobe)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'top_k and nprobe must be integers'}), 400
+        if top_k < 1 or (nprobe is not None and nprobe < 1):
+            return jsonify({'error': 'top_k and nprobe must be at least 1'}), 400
+        matches = job_index.search(resume_text(data), k=top_k, nprobe=nprobe)
+        jobs = job_index.jobs([job_id for job_id, _ in matches])
+        return jsonify({'matches': [
+            {**job, 'match_score': round(score * 100, 2)} for job, (_, score) in zip(jobs, matches)
+        ]})
+
+    except Exception as e:
+        logger.exception("Error in get_job_matches")
         return jsonify({'error': 'An error occurred while processing your request'}), 500
 
 def extract_text_from_pdf(pdf_file):
     try:
-        print("Reading PDF file...")
-        pdf_reader = PyPDF2.PdfReader(BytesIO(pdf_file.read()))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        print(f"Extracted {len(text)} characters from PDF")
+        with span('pdf_parse'):
+            text = extraction_pool.extract(pdf_file.stream)
+        logger.debug("Extracted %d characters from PDF", len(text))
         return text
+    except ExtractionPoolBusy:
+        raise
     except Exception as e:
-        print(f"Error extracting text from PDF: {str(e)}")
+        logger.exception("Error extracting text from PDF")
         return None
 
 def extract_resume_data(text):
     try:
-        print("Extracting resume data from text...")
-        # Initialize sections
-        skills = []
-        experience = ""
-        education = ""
-        
-        # Split text into lines
-        lines = text.split('\n')
-        
-        # Keywords to identify sections
-        skill_keywords = ['skills', 'technical skills', 'expertise', 'proficiencies']
-        experience_keywords = ['experience', 'work history', 'employment', 'professional experience']
-        education_keywords = ['education', 'academic background', 'qualifications']
-        
-        current_section = None
-        
-        for line in lines:
-            line = line.strip().lower()
-            
-            # Check for section headers
-            if any(keyword in line for keyword in skill_keywords):
-                current_section = 'skills'
-                continue
-            elif any(keyword in line for keyword in experience_keywords):
-                current_section = 'experience'
-                continue
-            elif any(keyword in line for keyword in education_keywords):
-                current_section = 'education'
-                continue
-            
-            # Process content based on current section
-            if current_section == 'skills' and line:
-                # Split skills by common delimiters
-                skills.extend([skill.strip() for skill in re.split(r'[,;]', line) if skill.strip()])
-            elif current_section == 'experience' and line:
-                experience += line + " "
-            elif current_section == 'education' and line:
-                education += line + " "
-        
-        print(f"Extracted {len(skills)} skills, {len(experience)} characters of experience, {len(education)} characters of education")
-        return {
-            'skills': skills,
-            'experience': experience.strip(),
-            'education': education.strip()
-        }
+        with span('section_extraction'):
+            resume_data = parse_sections(text)
+        logger.debug("Extracted resume sections", extra={
+            'skills': len(resume_data['skills']),
+            'experience_chars': len(resume_data['experience']),
+            'education_chars': len(resume_data['education'])
+        })
+        return resume_data
     except Exception as e:
-        print(f"Error extracting resume data: {str(e)}")
+        logger.exception("Error extracting resume data")
         return None
 
+def active_analyzer():
+    # The analyzer serving this request. Handlers take it once, so a model
+    # swap in the middle of a request does not mix two versions.
+    analyzer = resume_analyzer
+    g.model_version = analyzer.model_version
+    return analyzer
+
+def swap_analyzer(analyzer):
+    # Called by the model watcher with a loaded and warmed up analyzer. The
+    # resume store catches up first, on the watcher's thread, so no request
+    # pays for vectorizing every stored resume under the new version.
+    global resume_analyzer
+    if resume_store is not None:
+        resume_store.swap(analyzer)
+    resume_analyzer = analyzer
+    model_state['model_version'] = analyzer.model_version
+
+def pool_busy_response():
+    telemetry.rejections_total.inc('extraction_busy')
+    response = jsonify({'error': 'Server is busy, please retry shortly'})
+    response.headers['Retry-After'] = str(EXTRACTION_RETRY_AFTER)
+    return response, 503
+
 @app.route('/api/analyze-resume', methods=['POST'])
 def analyze_resume():
     try:
-        print("Received request to analyze resume")
+        if not model_state['ready']:
+            return jsonify({'error': 'Model is not loaded yet'}), 503
         
         if 'file' not in request.files:
-            print("No file in request.files")
-            print("Request files:", request.files)
             return jsonify({'error': 'No file provided'}), 400
             
         file = request.files['file']
-        print(f"Received file: {file.filename}")
         
         if file.filename == '':
-            print("Empty filename")
             return jsonify({'error': 'No file selected'}), 400
             
         if not file.filename.lower().endswith('.pdf'):
-            print(f"Invalid file type: {file.filename}")
             return jsonify({'error': 'Only PDF files are supported'}), 400
             
-        print("Extracting text from PDF...")
+        with span('upload_read'):
+            upload_hash = hash_upload(file.stream)
+
+        # With async=1 the analysis runs in the job queue workers and the
+        # client polls /api/jobs/<id> for the result
+        if request.values.get('async', '').lower() in ('1', 'true'):
+            return submit_analysis_job(file, upload_hash, request.values.get('resume_id'),
+                                       request.values.get('mode', SCORING_MODE))
+
+        body, status = analyze_upload(active_analyzer(), file, upload_hash, request.values.get('resume_id'),
+                                      request.values.get('mode', SCORING_MODE))
+        return jsonify(body), status
+
+    except ExtractionPoolBusy as e:
+        logger.warning("Rejecting request: %s", e)
+        return pool_busy_response()
+        
+    except Exception as e:
+        logger.exception("Error in analyze_resume endpoint")
+        return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
+
+def analyze_upload(analyzer, file, upload_hash, resume_id=None, mode=SCORING_MODE):
+    # Analysis of an uploaded PDF as a (body, status) pair. Shared with the
+    # ASGI entry point in asgi_app.py; raises ExtractionPoolBusy when the
+    # extraction pool is full. With a resume_id, the body also says which
+    # sections changed since the last upload under that id.
+    if resume_id is not None and len(resume_id) > MAX_RESUME_ID_LENGTH:
+        return {'error': f'resume_id must be at most {MAX_RESUME_ID_LENGTH} characters'}, 400
+    if mode not in SCORING_MODES:
+        return {'error': f"mode must be one of {', '.join(SCORING_MODES)}"}, 400
+
+    # Re-uploads of the same PDF are served from the cache
+    cache_key = analysis_key(upload_hash, analyzer.model_version, mode)
+    analysis = result_cache.get('analysis', cache_key)
+    sections = result_cache.get('sections', upload_hash) if resume_id and analysis is not None else None
+    if analysis is not None and (not resume_id or sections is not None):
+        logger.debug("Returning cached analysis", extra={'upload_hash': upload_hash})
+        body = {**analysis, 'model_version': analyzer.model_version}
+        if resume_id:
+            body['revision'] = revision_store.record(resume_id, sections, analysis['overall_score'])
+        return body, 200
+
+    text = result_cache.get('text', upload_hash)
+    if text is None:
         # Extract text from PDF
         text = extract_text_from_pdf(file)
         if text is None:
-            print("Failed to extract text from PDF")
-            return jsonify({'error': 'Failed to extract text from PDF'}), 400
-            
-        print("Extracting resume data...")
-        # Extract resume data
-        resume_data = extract_resume_data(text)
-        if resume_data is None:
-            print("Failed to extract resume data")
-            return jsonify({'error': 'Failed to extract resume data'}), 400
-            
-        print("Analyzing resume...")
-        # Analyze resume
-        analysis = resume_analyzer.analyze_resume(resume_data)
-        if analysis is None:
-            print("Failed to analyze resume")
-            return jsonify({'error': 'Failed to analyze resume'}), 500
-            
-        print("Analysis completed successfully")
-        return jsonify(analysis)
-        
+            return {'error': 'Failed to extract text from PDF'}, 400
+        result_cache.set('text', upload_hash, text)
+
+    # Extract resume data
+    resume_data = extract_resume_data(text)
+    if resume_data is None:
+        return {'error': 'Failed to extract resume data'}, 400
+
+    # Analyze resume
+    analysis = analyzer.analyze_resume(resume_data, mode)
+    if analysis is None:
+        return {'error': 'Failed to analyze resume'}, 500
+
+    result_cache.set('analysis', cache_key, analysis)
+    if resume_store is not None:
+        resume_store.add(upload_hash, file.filename, resume_data, analysis)
+
+    logger.info("Analyzed resume", extra={
+        'upload_hash': upload_hash, 'overall_score': float(analysis['overall_score'])
+    })
+    body = {**analysis, 'model_version': analyzer.model_version}
+    if resume_id:
+        sections = section_digests(resume_data)
+        result_cache.set('sections', upload_hash, sections)
+        body['revision'] = revision_store.record(resume_id, sections, analysis['overall_score'])
+    return body, 200
+
+def submit_analysis_job(file, upload_hash, resume_id=None, mode=SCORING_MODE):
+    # The job's result carries the revision too when a resume_id is given
+    if job_queue is None:
+        return jsonify({'error': 'Asynchronous analysis is not enabled'}), 503
+    if resume_id is not None and len(resume_id) > MAX_RESUME_ID_LENGTH:
+        return jsonify({'error': f'resume_id must be at most {MAX_RESUME_ID_LENGTH} characters'}), 400
+    if mode not in SCORING_MODES:
+        return jsonify({'error': f"mode must be one of {', '.join(SCORING_MODES)}"}), 400
+    try:
+        job_id = job_queue.submit(file.stream, file.filename, upload_hash, resume_id or None, mode)
+    except JobQueueFull as e:
+        logger.warning("Rejecting request: %s", e)
+        telemetry.rejections_total.inc('queue_full')
+        response = jsonify({'error': 'Too many analyses are waiting, please retry shortly'})
+        response.headers['Retry-After'] = str(JOB_RETRY_AFTER)
+        return response, 503
+    logger.info("Queued analysis job %s", job_id)
+    response = jsonify({'job_id': job_id, 'status': 'queued', 'status_url': f'/api/jobs/{job_id}'})
+    response.headers['Location'] = f'/api/jobs/{job_id}'
+    return response, 202
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    if job_queue is None:
+        return jsonify({'error': 'Asynchronous analysis is not enabled'}), 503
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(job)
+
+@app.route('/api/queue-stats')
+def queue_stats():
+    if job_queue is None:
+        return jsonify({'error': 'Asynchronous analysis is not enabled'}), 503
+    return jsonify(job_queue.stats())
+
+@app.route('/api/analyze-resumes', methods=['POST'])
+def analyze_resumes():
+    try:
+        if not model_state['ready']:
+            return jsonify({'error': 'Model is not loaded yet'}), 503
+
+        files = request.files.getlist('files')
+        data = {} if files else request.get_json(silent=True)
+        if data is None:
+            data = {}
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        # Checked before anything is extracted, so an oversized upload costs nothing
+        if len(files) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'At most {MAX_BATCH_SIZE} resumes can be analyzed per request'}), 400
+        mode = request.values.get('mode') or data.get('mode') or SCORING_MODE
+        if mode not in SCORING_MODES:
+            return jsonify({'error': f"mode must be one of {', '.join(SCORING_MODES)}"}), 400
+
+        if files:
+            # Extract resume data from every uploaded PDF, keeping upload order
+            batch = []
+            uploads = []
+            for file in files:
+                if not file.filename.lower().endswith('.pdf'):
+                    return jsonify({'error': f'Only PDF files are supported: {file.filename}'}), 400
+                with span('upload_read'):
+                    uploads.append((hash_upload(file.stream), file.filename))
+                text = extract_text_from_pdf(file)
+                if text is None:
+                    return jsonify({'error': f'Failed to extract text from PDF: {file.filename}'}), 400
+                resume_data = extract_resume_data(text)
+                if resume_data is None:
+                    return jsonify({'error': f'Failed to extract resume data: {file.filename}'}), 400
+                batch.append(resume_data)
+        else:
+            # Already extracted resume data, e.g. when re-scoring a backlog
+            batch = data.get('resumes', [])
+            uploads = None
+            if not isinstance(batch, list) or not all(is_resume_data(item) for item in batch):
+                return jsonify({'error': 'resumes must be a list of objects with skills, experience and education'}), 400
+
+        if not batch:
+            return jsonify({'error': 'Please provide at least one resume'}), 400
+
+        if len(batch) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'At most {MAX_BATCH_SIZE} resumes can be analyzed per request'}), 400
+
+        analyzer = active_analyzer()
+        analyses = analyzer.analyze_resumes(batch, mode)
+        if analyses is None:
+            return jsonify({'error': 'Failed to analyze resumes'}), 500
+
+        if resume_store is not None and uploads:
+            resume_store.add_many([
+                (upload_hash, filename, resume_data, analysis)
+                for (upload_hash, filename), resume_data, analysis in zip(uploads, batch, analyses)
+            ])
+
+        logger.info("Analyzed %d resumes in bulk", len(analyses))
+        return jsonify({'results': analyses, 'model_version': analyzer.model_version})
+
+    except ExtractionPoolBusy as e:
+        logger.warning("Rejecting request: %s", e)
+        return pool_busy_response()
+
+    except Exception as e:
+        logger.exception("Error in analyze_resumes endpoint")
+        return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
+
+@app.route('/api/rank-candidates', methods=['POST'])
+def rank_candidates():
+    try:
+        if resume_store is None:
+            return jsonify({'error': 'No resume store is configured'}), 503
+        if not model_state['ready']:
+            return jsonify({'error': 'Model is not loaded yet'}), 503
+
+        data = request.get_json(silent=True) or request.form
+        job_description = data.get('job_description', '')
+        if not job_description.strip():
+            return jsonify({'error': 'Please provide a job description'}), 400
+
+        try:
+            top_n = min(int(data.get('top_n', 10)), MAX_RANKED_CANDIDATES)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'top_n must be an integer'}), 400
+        if top_n < 1:
+            return jsonify({'error': 'top_n must be at least 1'}), 400
+        candidates, scored = resume_store.rank(job_description, top_n)
+        pool_size = len(resume_store)
+        logger.debug("Ranked %d of %d stored resumes", scored, pool_size)
+        return jsonify({'candidates': candidates, 'candidates_scored': scored, 'pool_size': pool_size})
+
     except Exception as e:
-        print(f"Error in analyze_resume endpoint: {str(e)}")
+        logger.exception("Error in rank_candidates endpoint")
         return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
 
+@app.route('/api/cache-stats')
+def cache_stats():
+    stats = result_cache.stats()
+    if resume_analyzer.section_cache is not None:
+        # Per section hit rates of this worker's vectorized sections
+        stats['section_cache'] = resume_analyzer.section_cache.stats()
+    return jsonify(stats)
+
+# Request latency and status counts, by endpoint. Endpoints without their own
+# label (static files, health checks) are counted under 'other'.
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    if model_watcher is not None:
+        model_watcher.start()
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is not None and telemetry.METRICS_ENABLED:
+        endpoint = request.endpoint if request.endpoint in telemetry.ENDPOINTS else 'other'
+        telemetry.request_seconds.observe(endpoint, value=time.perf_counter() - started)
+        status = min(max(response.status_code // 100, 2), 5)
+        telemetry.requests_total.inc(endpoint, f'{status}xx')
+    # Every response scored by the model says which version scored it
+    if g.get('model_version'):
+        response.headers['X-Model-Version'] = g.model_version
+    return response
+
+@app.route('/metrics')
+def metrics():
+    # Prometheus text exposition format
+    if not telemetry.METRICS_ENABLED:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    return telemetry.registry.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+@app.route('/healthz')
+def healthz():
+    status = 'ready' if model_state['ready'] else ('error' if model_state['error'] else 'loading')
+    return jsonify({'status': status, **model_state}), 200 if model_state['ready'] else 503
+
 @app.route('/')
 def home():
     return jsonify({'message': 'Resume Analyzer API is running'}), 200
 
+def create_app():
+    # Load the fitted model and warm it up. Under gunicorn --preload this runs
+    # once in the master, and the forked workers share the loaded model
+    # copy-on-write instead of each loading their own.
+    logger.info("Building skill taxonomy index...")
+    get_skill_index()
+
+    global job_index
+    if os.path.exists(os.path.join(DEFAULT_INDEX_PATH, 'meta.json')):
+        logger.info("Loading job index from %s...", DEFAULT_INDEX_PATH)
+        job_index = JobIndex(DEFAULT_INDEX_PATH)
+        logger.info("Job index holds %d jobs", len(job_index))
+
+    global model_watcher
+    version = model_registry.active_version() if model_registry is not None else None
+    if version is not None:
+        resume_analyzer.model_path = model_registry.path(version)
+
+    logger.info("Loading resume analyzer model...")
+    start = time.perf_counter()
+    if not resume_analyzer.load_model():
+        model_state['error'] = f'Failed to load model from {resume_analyzer.model_path}'
+        logger.error(model_state['error'])
+        return app
+    model_state['load_seconds'] = round(time.perf_counter() - start, 3)
+
+    logger.info("Warming up resume analyzer...")
+    start = time.perf_counter()
+    if resume_analyzer.analyze_resume(WARMUP_RESUME) is None:
+        model_state['error'] = 'Warm-up prediction failed'
+        logger.error(model_state['error'])
+        return app
+    # The same path as /api/career-recommendations, whatever the catalog holds
+    recommend_careers({'skills': WARMUP_RESUME['skills']})
+    model_state['warmup_seconds'] = round(time.perf_counter() - start, 3)
+
+    if resume_store is not None:
+        # Load the stored resumes before forking so workers start warm
+        resume_store.refresh()
+        logger.info("Resume store holds %d resumes", len(resume_store))
+
+    model_state['model_version'] = resume_analyzer.model_version
+    model_state['error'] = None
+    model_state['ready'] = True
+    logger.info("Model loaded in %ss, warmed up in %ss", model_state['load_seconds'], model_state['warmup_seconds'])
+
+    if model_registry is not None:
+        # Started by the first request of each worker, after gunicorn forks
+        model_watcher = ModelWatcher(model_registry, version, swap_analyzer, WARMUP_RESUME)
+    return app
+
 if __name__ == '__main__':
-    # Create models directory if it doesn't exist
-    os.makedirs('models', exist_ok=True)
-    
     # Train the model if it hasn't been trained yet
-    if not os.path.exists('models/resume_model.joblib'):
-        print("Training the resume analyzer model...")
+    if not os.path.exists(resume_analyzer.model_path):
+        logger.info("Training the resume analyzer model...")
         if not resume_analyzer.train_model():
-            print("Failed to train the model")
+            logger.error("Failed to train the model")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    create_app().run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,200 @@
+import asyncio
+import importlib.util
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.datastructures import FileStorage
+
+# starlette, python-multipart and uvicorn are not in requirements.txt, since
+# only this entry point needs them: pip install -r requirements-asgi.txt.
+# create_app says so when they are missing.
+try:
+    from starlette.applications import Starlette
+    from starlette.datastructures import UploadFile
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse, Response
+    from starlette.routing import Route
+except ImportError:
+    Starlette = None
+
+# Same sibling imports as app.py
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import app as wsgi
+from extraction_pool import EXTRACTION_RETRY_AFTER, ExtractionPoolBusy
+from result_cache import hash_upload
+import telemetry
+from telemetry import span
+
+# ASGI entry point for uvicorn, serving resume analysis and career
+# recommendations from the same model, caches and extraction pool as app.py.
+# Uploads are read from the socket by the event loop, so a slow client holds
+# a coroutine instead of a worker; parsing and scoring run in a small thread
+# pool.
+#
+#   uvicorn --app-dir backend --factory asgi_app:create_app --workers 2
+
+logger = logging.getLogger(__name__)
+
+# Requests in flight, including those still uploading; more get a 503
+ASGI_MAX_REQUESTS = int(os.environ.get('ASGI_MAX_REQUESTS', 256))
+# Threads for the CPU-bound part of a request: hashing, waiting on the
+# extraction pool, section parsing and scoring
+ASGI_WORKER_THREADS = int(os.environ.get('ASGI_WORKER_THREADS', 4))
+ASGI_RETRY_AFTER = int(os.environ.get('ASGI_RETRY_AFTER', 1))
+MAX_UPLOAD_BYTES = wsgi.app.config['MAX_CONTENT_LENGTH']
+
+ENDPOINTS = {'/api/analyze-resume': 'analyze_resume', '/api/career-recommendations': 'get_career_recommendations'}
+
+executor = ThreadPoolExecutor(ASGI_WORKER_THREADS, thread_name_prefix='asgi-worker')
+
+class UploadTooLarge(Exception):
+    pass
+
+def _limited(receive, max_bytes):
+    # Stop reading a body that grows past max_bytes, whatever Content-Length said
+    received = 0
+    async def limited_receive():
+        nonlocal received
+        message = await receive()
+        if message['type'] == 'http.request':
+            received += len(message.get('body', b''))
+            if received > max_bytes:
+                raise UploadTooLarge()
+        return message
+    return limited_receive
+
+async def run_blocking(function, *args):
+    return await asyncio.get_running_loop().run_in_executor(executor, function, *args)
+
+def busy_response(retry_after):
+    return JSONResponse({'error': 'Server is busy, please retry shortly'}, 503,
+                        headers={'Retry-After': str(retry_after)})
+
+def _analyze(stream, filename, resume_id, mode):
+    # Runs in the executor. The analyzer is taken once, like in app.py, so a
+    # model swap during the request does not mix two versions.
+    analyzer = wsgi.resume_analyzer
+    with span('upload_read'):
+        upload_hash = hash_upload(stream)
+    return wsgi.analyze_upload(analyzer, FileStorage(stream, filename), upload_hash, resume_id, mode)
+
+async def analyze_resume(request):
+    if not wsgi.model_state['ready']:
+        return JSONResponse({'error': 'Model is not loaded yet'}, 503)
+    if int(request.headers.get('content-length') or 0) > MAX_UPLOAD_BYTES:
+        return JSONResponse({'error': 'Upload is too large'}, 413)
+
+    # Starlette parses the multipart body as it arrives and spools files over
+    # 1 MiB to disk, so memory per upload stays bounded
+    request = Request(request.scope, _limited(request.receive, MAX_UPLOAD_BYTES))
+    try:
+        form = await request.form(max_files=1, max_fields=10)
+    except UploadTooLarge:
+        return JSONResponse({'error': 'Upload is too large'}, 413)
+    try:
+        file = form.get('file')
+        if not isinstance(file, UploadFile):
+            return JSONResponse({'error': 'No file provided'}, 400)
+        if not file.filename:
+            return JSONResponse({'error': 'No file selected'}, 400)
+        if not file.filename.lower().endswith('.pdf'):
+            return JSONResponse({'error': 'Only PDF files are supported'}, 400)
+
+        resume_id = form.get('resume_id')
+        body, status = await run_blocking(_analyze, file.file, file.filename,
+                                          resume_id if isinstance(resume_id, str) else None,
+                                          form.get('mode') or wsgi.SCORING_MODE)
+        headers = {'X-Model-Version': body['model_version']} if body.get('model_version') else None
+        return JSONResponse(body, status, headers=headers)
+
+    except ExtractionPoolBusy as e:
+        logger.warning("Rejecting request: %s", e)
+        telemetry.rejections_total.inc('extraction_busy')
+        return busy_response(EXTRACTION_RETRY_AFTER)
+
+    except Exception as e:
+        logger.exception("Error in analyze_resume endpoint")
+        return JSONResponse({'error': f'An unexpected error occurred: {str(e)}'}, 500)
+
+    finally:
+        await form.close()
+
+async def career_recommendations(request):
+    try:
+        data = await request.json()
+    except ValueError:
+        return JSONResponse({'error': 'Request body must be JSON'}, 400)
+    try:
+        body, status = await run_blocking(wsgi.recommend_careers, data)
+        return JSONResponse(body, status)
+    except Exception as e:
+        logger.exception("Error in get_career_recommendations")
+        return JSONResponse({'error': 'An error occurred while processing your request'}, 500)
+
+async def healthz(request):
+    state = wsgi.model_state
+    status = 'ready' if state['ready'] else ('error' if state['error'] else 'loading')
+    return JSONResponse({'status': status, **state}, 200 if state['ready'] else 503)
+
+async def metrics(request):
+    if not telemetry.METRICS_ENABLED:
+        return JSONResponse({'error': 'Metrics are disabled'}, 404)
+    return Response(telemetry.registry.render(), media_type='text/plain; version=0.0.4; charset=utf-8')
+
+class RequestLimit:
+    # Turns requests away with a 503 once ASGI_MAX_REQUESTS are in flight,
+    # and records request latency and status like app.py does
+    def __init__(self, app, max_requests=ASGI_MAX_REQUESTS):
+        self.app = app
+        self.max_requests = max_requests
+        self.in_flight = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        if self.in_flight >= self.max_requests:
+            telemetry.rejections_total.inc('too_many_requests')
+            return await busy_response(ASGI_RETRY_AFTER)(scope, receive, send)
+
+        started = time.perf_counter()
+        status = []
+        async def send_status(message):
+            if message['type'] == 'http.response.start':
+                status.append(message['status'])
+            await send(message)
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            self.in_flight -= 1
+            if telemetry.METRICS_ENABLED:
+                endpoint = ENDPOINTS.get(scope['path'], 'other')
+                telemetry.request_seconds.observe(endpoint, value=time.perf_counter() - started)
+                status_class = min(max((status[0] if status else 500) // 100, 2), 5)
+                telemetry.requests_total.inc(endpoint, f'{status_class}xx')
+
+def create_app():
+    # Called by uvicorn --factory in every worker process: load and warm up
+    # the model, then follow the model registry if one is configured
+    if Starlette is None or importlib.util.find_spec('multipart') is None:
+        raise RuntimeError("asgi_app needs starlette and python-multipart, and uvicorn to serve it: "
+                           "pip install -r requirements-asgi.txt")
+    wsgi.create_app()
+    if wsgi.model_watcher is not None:
+        wsgi.model_watcher.start()
+    routes = [
+        Route('/api/analyze-resume', analyze_resume, methods=['POST']),
+        Route('/api/career-recommendations', career_recommendations, methods=['POST']),
+        Route('/healthz', healthz),
+        Route('/metrics', metrics)
+    ]
+    return RequestLimit(Starlette(routes=routes))
+
+if __name__ == '__main__':
+    import uvicorn
+
+    uvicorn.run(create_app(), host='0.0.0.0', port=int(os.environ.get('PORT', 8000)))
@@ -0,0 +1,52 @@
+"""Throughput of the batch CLI against the number of parsing processes.
+
+Usage: python backend/benchmarks/bench_batch_cli.py [--resumes 400] [--workers 1 2 4 8]
+
+Writes synthetic multi-page PDF resumes into a ZIP archive, then scores
+the archive with `resume-analyzer batch` at each worker count and
+reports resumes per second and the speedup over a single worker.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import zipfile
+
+from common import fitted_analyzer, quiet, resume_pages, write_pdf
+from cli import run_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=400)
+    parser.add_argument('--pages', type=int, default=2)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        with quiet():
+            analyzer = fitted_analyzer()
+        with zipfile.ZipFile('resumes.zip', 'w') as archive:
+            for number in range(args.resumes):
+                archive.writestr(f'resume-{number}.pdf', write_pdf(resume_pages(rng, args.pages)))
+
+        print(f"{os.cpu_count()} cores, {args.resumes} resumes of {args.pages} pages")
+        print(f"{'workers':>8} {'seconds':>8} {'resumes/s':>10} {'speedup':>8}")
+        baseline = None
+        for workers in args.workers:
+            output = f'results-{workers}.jsonl'
+            start = time.perf_counter()
+            with quiet():
+                run_batch(['resumes.zip'], output, workers=workers, model_path=analyzer.model_path,
+                          progress_every=float('inf'))
+            elapsed = time.perf_counter() - start
+            rate = args.resumes / elapsed
+            baseline = baseline or rate
+            print(f"{workers:>8} {elapsed:>8.2f} {rate:>10.1f} {rate / baseline:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
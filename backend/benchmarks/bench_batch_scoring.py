@@ -0,0 +1,44 @@
+"""Compare ResumeAnalyzer.analyze_resumes against analyze_resume in a loop.
+
+Usage: python backend/benchmarks/bench_batch_scoring.py [--sizes 100 1000 10000]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from common import fitted_analyzer, quiet, synthetic_resumes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--train-size', type=int, default=500)
+    args = parser.parse_args()
+
+    # train_model saves under models/, so keep the artifacts out of the checkout
+    os.chdir(tempfile.mkdtemp(prefix='bench-batch-'))
+    analyzer = fitted_analyzer(args.train_size)
+
+    print(f"{'resumes':>8} {'loop s':>10} {'batch s':>10} {'loop/s':>10} {'batch/s':>10} {'speedup':>8}")
+    for size in args.sizes:
+        batch = synthetic_resumes(size, seed=size)
+
+        with quiet():
+            start = time.perf_counter()
+            looped = [analyzer.analyze_resume(resume) for resume in batch]
+            loop_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            batched = analyzer.analyze_resumes(batch)
+            batch_time = time.perf_counter() - start
+
+        # Batch results must match the per-resume path, in input order
+        assert [r['overall_score'] for r in looped] == [r['overall_score'] for r in batched]
+
+        print(f"{size:>8} {loop_time:>10.3f} {batch_time:>10.3f} {size / loop_time:>10.0f} "
+              f"{size / batch_time:>10.0f} {loop_time / batch_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
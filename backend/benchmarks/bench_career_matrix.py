@@ -0,0 +1,94 @@
+"""Latency of career scoring with the precomputed career matrix.
+
+Usage: python backend/benchmarks/bench_career_matrix.py [--roles 7 1000 50000]
+
+Compares the previous per-career loop (two transforms and a cosine
+similarity per career) with one sparse product over the career matrix.
+The loop is only timed up to --loop-limit roles.
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+import common  # noqa: F401 - puts the backend modules on sys.path
+from career_matrix import CareerMatrix
+from skill_taxonomy import get_skill_index
+
+
+def synthetic_catalog(size, skills, rng):
+    catalog = {}
+    for number in range(size):
+        low = rng.randrange(40000, 150000, 5000)
+        catalog[f'Role {number}'] = {
+            'skills': rng.sample(skills, rng.randint(4, 10)),
+            'salary_range': {'min': low, 'max': low + rng.randrange(20000, 80000, 5000)},
+            'description': f'Synthetic role {number}'
+        }
+    return catalog
+
+
+def loop_scores(matrix, user_skills, expected_salary, years_experience, education_level):
+    # The previous implementation of /api/career-recommendations
+    recommendations = []
+    for name, career in zip(matrix.names, matrix.careers):
+        user_vector = matrix.vectorizer.transform([' '.join(user_skills)])
+        career_vector = matrix.vectorizer.transform([' '.join(career['skills'])])
+        score = cosine_similarity(user_vector, career_vector)[0][0] * 100
+        if expected_salary > career['salary_range']['max']:
+            score *= 0.7
+        elif expected_salary < career['salary_range']['min']:
+            score *= 0.9
+        if years_experience >= 5:
+            score *= 1.1
+        if education_level.lower() in ['masters', 'phd']:
+            score *= 1.05
+        recommendations.append((name, round(score, 2)))
+    recommendations.sort(key=lambda x: x[1], reverse=True)
+    return recommendations[:3]
+
+
+def percentiles(samples):
+    return np.percentile(np.array(samples) * 1000, [50, 99])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--roles', type=int, nargs='+', default=[7, 1000, 50000])
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--loop-limit', type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    skills = get_skill_index().skills
+    queries = [(rng.sample(skills, rng.randint(1, 8)), rng.choice([0, 60000, 120000, 200000]),
+                rng.randint(0, 10), rng.choice(['', 'masters', 'bachelors'])) for _ in range(args.requests)]
+
+    print(f"{'roles':>7} {'build s':>8} {'matrix p50 ms':>14} {'matrix p99 ms':>14} {'loop p50 ms':>12} {'loop p99 ms':>12}")
+    for size in args.roles:
+        start = time.perf_counter()
+        matrix = CareerMatrix(synthetic_catalog(size, skills, rng))
+        build_time = time.perf_counter() - start
+
+        samples = []
+        for query in queries:
+            start = time.perf_counter()
+            matrix.top(matrix.score(*query), 3)
+            samples.append(time.perf_counter() - start)
+        matrix_p50, matrix_p99 = percentiles(samples)
+
+        loop = '-', '-'
+        if size <= args.loop_limit:
+            samples = []
+            for query in queries[:max(10, args.requests * 7 // size)]:
+                start = time.perf_counter()
+                loop_scores(matrix, *query)
+                samples.append(time.perf_counter() - start)
+            loop = [f'{value:.2f}' for value in percentiles(samples)]
+        print(f"{size:>7} {build_time:>8.2f} {matrix_p50:>14.2f} {matrix_p99:>14.2f} {loop[0]:>12} {loop[1]:>12}")
+
+
+if __name__ == '__main__':
+    main()
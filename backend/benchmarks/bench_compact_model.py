@@ -0,0 +1,95 @@
+"""Cold start and latency of the NumPy-only compact model against the scikit-learn pipeline.
+
+Usage: python backend/benchmarks/bench_compact_model.py [--starts 5] [--resumes 1000]
+
+Trains a benchmark model, exports it with export_model.py and checks that
+both paths give identical scores. Cold start is the wall time of a fresh
+interpreter importing the serverless entry point api/index.py (which loads
+and warms the model) in each mode. Latency is that of analyze_resume on
+single resumes, and throughput that of analyze_resumes on the whole set.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from common import fitted_analyzer, quiet, synthetic_resumes, synthetic_vocabulary
+
+API_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'api')
+COLD_START = 'import time; start = time.perf_counter(); import index; print(time.perf_counter() - start)'
+
+
+def cold_start(env, starts):
+    # Seconds for the whole process and for the import alone, best of `starts`
+    totals, imports = [], []
+    for _ in range(starts):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', COLD_START], cwd=API_DIR, env=env, check=True,
+                                capture_output=True, text=True).stdout
+        totals.append(time.perf_counter() - start)
+        imports.append(float(output.split()[-1]))
+    return min(totals), min(imports)
+
+
+def latency(analyze, resumes):
+    samples = []
+    for resume in resumes:
+        start = time.perf_counter()
+        analyze(resume)
+        samples.append(time.perf_counter() - start)
+    return np.percentile(np.array(samples) * 1000, [50, 99])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--starts', type=int, default=5, help='cold starts per mode')
+    parser.add_argument('--resumes', type=int, default=1000)
+    parser.add_argument('--train-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    from compact_model import CompactModel
+    from export_model import export_compact_model
+
+    os.chdir(tempfile.mkdtemp(prefix='bench-compact-'))
+    vocabulary = synthetic_vocabulary(5000)
+    with quiet():
+        analyzer = fitted_analyzer(args.train_size, vocabulary=vocabulary)
+    compact_path = export_compact_model(analyzer, os.path.abspath('models/resume_model.npz'))
+    compact = CompactModel(compact_path)
+
+    resumes = synthetic_resumes(args.resumes, seed=1, vocabulary=vocabulary)
+    with quiet():
+        expected = analyzer.pipeline.predict(analyzer._to_columns(resumes))
+    identical = np.array_equal(expected, compact.predict(resumes))
+    print(f"Scores identical on {len(resumes)} resumes: {identical}")
+    print(f"Artifact size: joblib {os.path.getsize(analyzer.model_path) / 2 ** 20:.1f} MiB, "
+          f"compact {os.path.getsize(compact_path) / 2 ** 20:.1f} MiB")
+
+    env = {**os.environ, 'LOG_LEVEL': 'OFF', 'RESUME_MODEL_PATH': os.path.abspath(analyzer.model_path)}
+    env.pop('COMPACT_MODEL_PATH', None)
+    full_start = cold_start(env, args.starts)
+    compact_start = cold_start({**env, 'COMPACT_MODEL_PATH': compact_path}, args.starts)
+
+    with quiet():
+        full_latency = latency(analyzer.analyze_resume, resumes)
+        start = time.perf_counter()
+        analyzer.analyze_resumes(resumes)
+        full_rate = len(resumes) / (time.perf_counter() - start)
+    compact_latency = latency(compact.analyze_resume, resumes)
+    start = time.perf_counter()
+    compact.analyze_resumes(resumes)
+    compact_rate = len(resumes) / (time.perf_counter() - start)
+
+    print(f"{'path':>12} {'process s':>10} {'import s':>9} {'p50 ms':>7} {'p99 ms':>7} {'batch/s':>8}")
+    for name, (total, imported), (p50, p99), rate in (
+            ('scikit-learn', full_start, full_latency, full_rate),
+            ('compact', compact_start, compact_latency, compact_rate)):
+        print(f"{name:>12} {total:>10.2f} {imported:>9.2f} {p50:>7.2f} {p99:>7.2f} {rate:>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
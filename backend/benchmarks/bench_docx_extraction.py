@@ -0,0 +1,98 @@
+"""Streaming DOCX text extraction against python-docx on documents of growing length.
+
+Usage: python backend/benchmarks/bench_docx_extraction.py [--pages 1 10 100 500] [--repeat 5]
+
+Compares ways of getting the text of an uploaded DOCX:
+  python-docx+disk  what the root app used to do: save the upload, build the
+                    python-docx object model from the file, delete the file
+  python-docx       the object model built from the in-memory upload
+  streaming         docx_text.extract_docx_text, iterparse over the ZIP member
+  paragraphs        the paragraph generator alone, without building the text
+Time is the best of --repeat runs; memory is the tracemalloc peak of one run,
+which misses lxml's own allocations and so understates python-docx.
+The streaming text also holds table cells, which python-docx leaves out, so
+outputs are compared on these table-free documents.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO
+
+from common import resume_pages, write_docx
+
+
+def python_docx_from_disk(upload):
+    import docx
+
+    path = os.path.join(tempfile.gettempdir(), f'bench-upload-{os.getpid()}.docx')
+    with open(path, 'wb') as f:
+        f.write(upload)
+    try:
+        return ''.join(paragraph.text + '\n' for paragraph in docx.Document(path).paragraphs)
+    finally:
+        os.remove(path)
+
+
+def python_docx_in_memory(upload):
+    import docx
+
+    return ''.join(paragraph.text + '\n' for paragraph in docx.Document(BytesIO(upload)).paragraphs)
+
+
+def streaming(upload):
+    from docx_text import extract_docx_text
+
+    return extract_docx_text(BytesIO(upload))
+
+
+def paragraphs(upload):
+    from docx_text import iter_docx_paragraphs
+
+    for _ in iter_docx_paragraphs(BytesIO(upload)):
+        pass
+
+
+def measure(extract, upload, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = extract(upload)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    extract(upload)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return text, best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 10, 100, 500])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    extractors = [('streaming', streaming), ('paragraphs', paragraphs)]
+    try:
+        import docx
+        extractors = [('python-docx+disk', python_docx_from_disk), ('python-docx', python_docx_in_memory)] + extractors
+    except ImportError:
+        print('python-docx is not installed, timing the streaming extractor only')
+
+    rng = random.Random(0)
+    print(f"{'pages':>6} {'KiB':>7} {'extractor':>17} {'ms':>9} {'peak MiB':>9} {'same text':>10}")
+    for pages in args.pages:
+        upload = write_docx(resume_pages(rng, pages))
+        expected = None
+        for name, extract in extractors:
+            text, seconds, peak = measure(extract, upload, args.repeat)
+            expected = text if expected is None else expected
+            same = '-' if text is None else str(text == expected)
+            print(f"{pages:>6} {len(upload) / 1024:>7.0f} {name:>17} {seconds * 1000:>9.2f} "
+                  f"{peak / 2 ** 20:>9.2f} {same:>10}")
+
+
+if __name__ == '__main__':
+    main()
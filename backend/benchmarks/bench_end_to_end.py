@@ -0,0 +1,224 @@
+"""End-to-end latency and throughput of resume analysis, checked against a baseline.
+
+Usage: python backend/benchmarks/bench_end_to_end.py [--requests 200] [--concurrency 1 4 16]
+           [--url http://localhost:8000] [--output results.json] [--baseline baseline.json]
+
+Times each step of an analysis on its own (extract_text_from_pdf,
+extract_resume_data, ResumeAnalyzer.analyze_resume, recommend_careers
+and DOCX text extraction), then drives /api/analyze-resume and
+/api/career-recommendations from concurrent threads, either through the
+Flask test client or against a running server given with --url, e.g.
+
+    gunicorn --chdir backend --preload "app:create_app()" --workers 4
+
+Every PDF upload is a distinct synthetic resume, so the result cache never
+answers. Reports throughput and p50/p95/p99 latency, saves them as JSON
+with --output and, with --baseline, exits with status 1 when any result
+is slower than the baseline by more than --tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import numpy as np
+
+from common import fitted_analyzer, quiet, resume_pages, synthetic_resume, write_docx, write_pdf
+
+
+def summarize(latencies, elapsed, errors=0):
+    # Latency percentiles cover successful calls only; errors are counted apart
+    samples = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {
+        'requests': len(latencies) + errors,
+        'errors': errors,
+        'throughput': round(len(latencies) / elapsed, 2),
+        'p50_ms': round(float(p50), 3),
+        'p95_ms': round(float(p95), 3),
+        'p99_ms': round(float(p99), 3)
+    }
+
+
+def time_calls(function, inputs):
+    latencies = []
+    started = time.perf_counter()
+    for item in inputs:
+        start = time.perf_counter()
+        function(item)
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+class TestClient:
+    # Requests straight into the Flask app, no network in between
+    def __init__(self, app):
+        self.app = app
+
+    def post_file(self, path, filename, content):
+        client = self.app.test_client()
+        response = client.post(path, data={'file': (BytesIO(content), filename)}, content_type='multipart/form-data')
+        return response.status_code
+
+    def post_json(self, path, payload):
+        return self.app.test_client().post(path, json=payload).status_code
+
+
+class HttpClient:
+    # Requests to a running server, standard library only
+    def __init__(self, url):
+        self.url = url.rstrip('/')
+
+    def _send(self, path, body, content_type):
+        request = urllib.request.Request(self.url + path, data=body, headers={'Content-Type': content_type})
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    def post_file(self, path, filename, content):
+        boundary = uuid.uuid4().hex
+        body = (f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+                f'Content-Type: application/octet-stream\r\n\r\n').encode() + content + f'\r\n--{boundary}--\r\n'.encode()
+        return self._send(path, body, f'multipart/form-data; boundary={boundary}')
+
+    def post_json(self, path, payload):
+        return self._send(path, json.dumps(payload).encode(), 'application/json')
+
+
+def load_test(send, payloads, concurrency):
+    # Fire every payload from `concurrency` threads and time each call
+    def call(payload):
+        start = time.perf_counter()
+        status = send(payload)
+        return status, time.perf_counter() - start
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        outcomes = list(executor.map(call, payloads))
+    elapsed = time.perf_counter() - started
+    latencies = [latency for status, latency in outcomes if status == 200]
+    return summarize(latencies, elapsed, errors=len(outcomes) - len(latencies))
+
+
+def compare(results, baseline, tolerance):
+    # Names of the results slower than the baseline beyond the tolerance
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        slower = result['p95_ms'] > before['p95_ms'] * (1 + tolerance)
+        fewer = result['throughput'] < before['throughput'] / (1 + tolerance)
+        if slower or fewer:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200, help='calls per step and per load level')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--pages', type=int, default=2)
+    parser.add_argument('--url', help='load test a running server instead of the Flask test client')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='JSON file from an earlier --output run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='allowed slowdown in p95 latency or throughput, as a fraction')
+    args = parser.parse_args()
+    output = args.output and os.path.abspath(args.output)
+    baseline_path = args.baseline and os.path.abspath(args.baseline)
+
+    os.chdir(tempfile.mkdtemp(prefix='bench-end-to-end-'))
+    with quiet():
+        analyzer = fitted_analyzer()
+    os.environ['RESUME_MODEL_PATH'] = analyzer.model_path
+
+    # Imported here so the app picks up the model path
+    import app as backend_app
+    from docx_text import extract_docx_text
+    from telemetry import configure_logging
+    from werkzeug.datastructures import FileStorage
+
+    # A log line per request (or per rejected upload) would be part of what is measured
+    configure_logging('ERROR')
+    with quiet():
+        backend_app.create_app()
+
+    rng = random.Random(0)
+    pdfs = iter(lambda: write_pdf(resume_pages(rng, args.pages)), None)
+    sample = [next(pdfs) for _ in range(args.requests)]
+
+    results = {}
+    texts = []
+
+    def extract(pdf):
+        texts.append(backend_app.extract_text_from_pdf(FileStorage(BytesIO(pdf), 'resume.pdf')))
+
+    # Start the extraction processes before anything is timed
+    for pdf in sample[:5]:
+        backend_app.extract_text_from_pdf(FileStorage(BytesIO(pdf), 'resume.pdf'))
+    results['extract_text_from_pdf'] = time_calls(extract, sample)
+    resumes = [backend_app.extract_resume_data(text) for text in texts]
+    results['extract_resume_data'] = time_calls(backend_app.extract_resume_data, texts)
+    results['analyze_resume'] = time_calls(backend_app.resume_analyzer.analyze_resume, resumes)
+    results['recommend_careers'] = time_calls(
+        lambda resume: backend_app.recommend_careers({'skills': resume['skills']}), resumes)
+    docx_files = [write_docx(resume_pages(rng, args.pages)) for _ in range(args.requests)]
+    results['extract_docx_text'] = time_calls(lambda docx: extract_docx_text(BytesIO(docx)), docx_files)
+
+    client = HttpClient(args.url) if args.url else TestClient(backend_app.app)
+    for concurrency in args.concurrency:
+        uploads = [next(pdfs) for _ in range(args.requests)]
+        results[f'POST /api/analyze-resume c={concurrency}'] = load_test(
+            lambda pdf: client.post_file('/api/analyze-resume', 'resume.pdf', pdf), uploads, concurrency)
+        profiles = [{'skills': synthetic_resume(rng)['skills'], 'years_experience': rng.randint(0, 15)}
+                    for _ in range(args.requests)]
+        results[f'POST /api/career-recommendations c={concurrency}'] = load_test(
+            lambda profile: client.post_json('/api/career-recommendations', profile), profiles, concurrency)
+
+    baseline = {}
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)['results']
+
+    print(f"{os.cpu_count()} cores, {args.requests} calls per row, {args.pages}-page resumes, "
+          f"{'server ' + args.url if args.url else 'Flask test client'}")
+    print(f"{'':<44} {'per s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} {'p95 vs base':>12}")
+    for name, result in results.items():
+        change = ''
+        if name in baseline:
+            change = f"{(result['p95_ms'] / baseline[name]['p95_ms'] - 1) * 100:+.1f}%"
+        print(f"{name:<44} {result['throughput']:>8.1f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+              f"{result['p99_ms']:>8.2f} {result['errors']:>7} {change:>12}")
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump({
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'cores': os.cpu_count(),
+                'options': {'requests': args.requests, 'pages': args.pages, 'url': args.url},
+                'results': results
+            }, f, indent=2)
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"Slower than the baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""Recall and latency of the job catalog ANN index against brute-force search.
+
+Usage: python backend/benchmarks/bench_job_index.py [--jobs 200000] [--nprobe 1 4 8 16 32]
+
+Builds an index over a synthetic catalog of clustered job postings, then
+answers the same resume queries with an exact scan over every vector and
+with the inverted-file search at several nprobe settings, reporting
+recall@k against the exact results and per-query latency.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from common import ACHIEVEMENTS, ROLES, SKILL_POOL, quiet, synthetic_vocabulary
+from job_index import JobIndex, build_index, resume_text
+
+
+def synthetic_topics(count, vocabulary, rng):
+    # Each topic is a family of similar postings sharing skills and wording
+    return [{
+        'role': rng.choice(ROLES),
+        'skills': rng.sample(SKILL_POOL, 8),
+        'words': rng.sample(vocabulary, 30)
+    } for _ in range(count)]
+
+
+def write_catalog(path, count, topics, vocabulary, rng):
+    with open(path, 'w') as f:
+        for number in range(count):
+            topic = rng.choice(topics)
+            f.write(json.dumps({
+                'id': number,
+                'title': f"{topic['role']} {number}",
+                'skills': rng.sample(topic['skills'], rng.randint(3, 6)),
+                'description': ' '.join(rng.choices(topic['words'], k=rng.randint(15, 40)) +
+                                        rng.choices(vocabulary, k=5) + rng.sample(ACHIEVEMENTS, 2))
+            }) + '\n')
+
+
+def resume_query(topic, vocabulary, rng):
+    return resume_text({
+        'skills': rng.sample(topic['skills'], rng.randint(2, 6)),
+        'experience': ' '.join(rng.choices(topic['words'], k=rng.randint(5, 20)) + rng.choices(vocabulary, k=5)),
+        'education': 'Bachelor in Computer Science'
+    })
+
+
+def timed(search, queries):
+    results, samples = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append({job_id for job_id, _ in search(query)})
+        samples.append(time.perf_counter() - start)
+    return results, np.percentile(np.array(samples) * 1000, [50, 99])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=200000)
+    parser.add_argument('--topics', type=int, default=500)
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = synthetic_vocabulary(20000)
+    topics = synthetic_topics(args.topics, vocabulary, rng)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        catalog_path = os.path.join(workdir, 'jobs.jsonl')
+        write_catalog(catalog_path, args.jobs, topics, vocabulary, rng)
+
+        start = time.perf_counter()
+        with quiet():
+            build_index(catalog_path, os.path.join(workdir, 'index'))
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = JobIndex(os.path.join(workdir, 'index'))
+        open_time = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(workdir, 'index', name))
+                   for name in os.listdir(os.path.join(workdir, 'index')))
+        print(f"{len(index)} jobs, {index.meta['n_lists']} cells, {index.meta['dim']} dims, "
+              f"{size / 2 ** 20:.0f} MiB on disk; built in {build_time:.1f}s, opened in {open_time * 1000:.1f}ms")
+
+        queries = [resume_query(rng.choice(topics), vocabulary, rng) for _ in range(args.queries)]
+        exact, (p50, p99) = timed(lambda q: index.search_exact(q, args.k), queries)
+
+        print(f"{'search':>12} {'recall@' + str(args.k):>10} {'p50 ms':>8} {'p99 ms':>8}")
+        print(f"{'exact':>12} {1.0:>10.3f} {p50:>8.2f} {p99:>8.2f}")
+        for nprobe in args.nprobe:
+            found, (p50, p99) = timed(lambda q: index.search(q, args.k, nprobe), queries)
+            recall = np.mean([len(a & b) / len(b) for a, b in zip(found, exact)])
+            print(f"{'nprobe=' + str(nprobe):>12} {recall:>10.3f} {p50:>8.2f} {p99:>8.2f}")
+        del index
+
+
+if __name__ == '__main__':
+    main()
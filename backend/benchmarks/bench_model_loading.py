@@ -0,0 +1,108 @@
+"""Cold-start time and per-worker memory for the model artifact layouts.
+
+Usage: python backend/benchmarks/bench_model_loading.py [--workers 4]
+
+Each worker is a fresh interpreter that imports the analyzer and loads the
+model, like a gunicorn worker without --preload. All workers stay alive
+until every one of them has loaded, then report RSS and PSS (proportional
+set size, which splits shared pages between the processes using them).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LEGACY_PARTS = ('resume_model', 'skills_vectorizer', 'experience_vectorizer', 'education_vectorizer', 'scaler')
+
+
+def memory_kb():
+    usage = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            if key in ('Rss', 'Pss'):
+                usage[key] = int(value.split()[0])
+    return usage
+
+
+def worker(mode, model_dir):
+    start = time.perf_counter()
+    sys.path.insert(0, BACKEND_DIR)
+    import joblib
+    from resume_analyzer import ResumeAnalyzer
+
+    analyzer = ResumeAnalyzer(model_path=os.path.join(model_dir, 'resume_model.joblib'))
+    if mode == 'legacy':
+        # The previous layout: five separately pickled objects
+        parts = [joblib.load(os.path.join(model_dir, 'legacy', f'{name}.joblib')) for name in LEGACY_PARTS]
+    elif mode == 'artifact':
+        parts = joblib.load(analyzer.model_path)
+    else:
+        analyzer.load_model()
+    load_time = time.perf_counter() - start
+
+    print('ready', flush=True)
+    sys.stdin.readline()
+    print(json.dumps({'load_time': load_time, **memory_kb()}), flush=True)
+
+
+def run_workers(mode, model_dir, count):
+    procs = [
+        subprocess.Popen([sys.executable, __file__, '--worker', mode, model_dir],
+                         stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        for _ in range(count)
+    ]
+    for proc in procs:
+        while proc.stdout.readline().strip() != 'ready':
+            pass
+    for proc in procs:
+        proc.stdin.write('\n')
+        proc.stdin.flush()
+    results = [json.loads(proc.stdout.readline()) for proc in procs]
+    for proc in procs:
+        proc.wait()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--train-size', type=int, default=5000)
+    parser.add_argument('--worker', nargs=2, metavar=('MODE', 'MODEL_DIR'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(*args.worker)
+        return
+
+    from common import fitted_analyzer, synthetic_vocabulary
+    import joblib
+
+    model_dir = tempfile.mkdtemp(prefix='bench-loading-')
+    os.chdir(model_dir)
+    analyzer = fitted_analyzer(args.train_size, vocabulary=synthetic_vocabulary(20000))
+    os.replace(analyzer.model_path, os.path.join(model_dir, 'resume_model.joblib'))
+
+    # Write the same fitted components in the previous five-file layout
+    os.makedirs('legacy')
+    features = analyzer.pipeline.named_steps['features'].named_transformers_
+    legacy = [analyzer.pipeline.named_steps['model'], features['skills'], features['experience'],
+              features['education'], analyzer.pipeline.named_steps['scaler']]
+    for name, part in zip(LEGACY_PARTS, legacy):
+        joblib.dump(part, os.path.join('legacy', f'{name}.joblib'))
+
+    print(f"{'layout':>14} {'workers':>8} {'load s':>8} {'RSS MB':>8} {'PSS MB':>8} {'total PSS MB':>13}")
+    for mode in ('legacy', 'artifact', 'artifact-mmap'):
+        results = run_workers(mode, model_dir, args.workers)
+        load_time = sum(r['load_time'] for r in results) / len(results)
+        rss = sum(r['Rss'] for r in results) / len(results) / 1024
+        pss = sum(r['Pss'] for r in results) / len(results) / 1024
+        print(f"{mode:>14} {args.workers:>8} {load_time:>8.2f} {rss:>8.1f} {pss:>8.1f} {pss * args.workers:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
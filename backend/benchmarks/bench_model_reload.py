@@ -0,0 +1,153 @@
+"""Latency and errors of a gunicorn server while the registry swaps models under load.
+
+Usage: python backend/benchmarks/bench_model_reload.py [--workers 2] [--clients 4] [--seconds 20] [--swap-every 2]
+
+Trains two model versions into a registry directory and starts gunicorn
+with --preload and MODEL_REGISTRY_DIR pointing at it. Clients then score
+single resumes for --seconds with the active version fixed, and as long
+again while the active version flips between the two every --swap-every
+seconds. Reports failed requests, latency percentiles of both phases, and
+how long after each activation the last response from the old version came.
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.request
+
+import numpy as np
+
+from common import fitted_analyzer, synthetic_resumes
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VERSIONS = ('20260101000000', '20260102000000')
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(url, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f'{url}/healthz', timeout=2) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('Server did not become ready')
+
+
+def client(url, resumes, stop, samples):
+    # (finished at, seconds, ok, model version) per request
+    index = 0
+    while not stop.is_set():
+        body = json.dumps({'resumes': [resumes[index % len(resumes)]]}).encode()
+        index += 1
+        request = urllib.request.Request(f'{url}/api/analyze-resumes', body, {'Content-Type': 'application/json'})
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                version = json.load(response)['model_version']
+                ok = response.status == 200
+        except Exception:
+            version, ok = None, False
+        samples.append((time.perf_counter(), time.perf_counter() - start, ok, version))
+
+
+def run_phase(url, resumes, clients, seconds, swap=None):
+    stop = threading.Event()
+    samples = []
+    threads = [threading.Thread(target=client, args=(url, resumes, stop, samples)) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    activations = []
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        time.sleep(0.05)
+        if swap is not None:
+            activation = swap(time.perf_counter() - started)
+            if activation:
+                activations.append((time.perf_counter(), activation))
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return samples, activations
+
+
+def summarize(name, samples):
+    latencies = np.array([seconds for _, seconds, ok, _ in samples if ok]) * 1000
+    failed = sum(1 for sample in samples if not sample[2])
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(f"{name:>8} {len(samples):>9} {failed:>7} {p50:>8.2f} {p95:>8.2f} {p99:>8.2f} {latencies.max():>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=20)
+    parser.add_argument('--swap-every', type=float, default=2)
+    parser.add_argument('--train-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    from model_registry import ModelRegistry
+
+    os.chdir(tempfile.mkdtemp(prefix='bench-reload-'))
+    registry = ModelRegistry(os.path.abspath('models'))
+    for seed, version in enumerate(VERSIONS):
+        analyzer = fitted_analyzer(args.train_size, seed=seed, model_path=registry.path(version))
+        analyzer.model_version = version
+        analyzer.save_model()
+    registry.activate(VERSIONS[0])
+
+    port = free_port()
+    url = f'http://127.0.0.1:{port}'
+    env = {**os.environ, 'MODEL_REGISTRY_DIR': registry.directory, 'MODEL_RELOAD_INTERVAL': '0.5',
+           'LOG_LEVEL': 'WARNING', 'RESUME_MODEL_PATH': registry.path(VERSIONS[0])}
+    server = subprocess.Popen(['gunicorn', '--chdir', BACKEND_DIR, '--preload', '--workers', str(args.workers),
+                               '--bind', f'127.0.0.1:{port}', '--log-level', 'warning', 'app:create_app()'], env=env)
+    try:
+        wait_ready(url)
+        resumes = synthetic_resumes(200, seed=7)
+        # Let every worker start its watcher before measuring
+        run_phase(url, resumes, args.clients, 2)
+
+        steady, _ = run_phase(url, resumes, args.clients, args.seconds)
+
+        swaps = {'count': 0}
+        def swap(elapsed):
+            if elapsed >= (swaps['count'] + 1) * args.swap_every:
+                swaps['count'] += 1
+                return registry.activate(VERSIONS[swaps['count'] % 2])
+        swapping, activations = run_phase(url, resumes, args.clients, args.seconds, swap)
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"{'phase':>8} {'requests':>9} {'failed':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    summarize('steady', steady)
+    summarize('swapping', swapping)
+
+    # Seconds from each activation to the last response still scored by the
+    # version it replaced, i.e. until every worker had swapped
+    lags = []
+    for number, (activated_at, version) in enumerate(activations):
+        until = activations[number + 1][0] if number + 1 < len(activations) else float('inf')
+        old = [finished for finished, _, ok, served in swapping
+               if ok and activated_at <= finished < until and served != version]
+        lags.append(max(old) - activated_at if old else 0.0)
+    if lags:
+        print(f"{len(activations)} activations, all workers swapped within "
+              f"{np.median(lags):.2f}s median, {max(lags):.2f}s max")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Throughput and section-header recall of each PDF text backend.
+
+Usage: python backend/benchmarks/bench_pdf_backends.py [--corpus DIR] [--documents 30]
+
+Without --corpus, a corpus of generated resumes of 1-20 pages is written to
+a temp directory. Every document is expected to contain the skills,
+experience and education headers; recall is the share of those found.
+"""
+import argparse
+import glob
+import os
+import random
+import tempfile
+import time
+
+from common import resume_pages, write_pdf
+from pdf_text import PDF_BACKENDS, SECTION_KEYWORDS, find_sections
+
+
+def build_corpus(directory, documents):
+    rng = random.Random(0)
+    for number in range(documents):
+        path = os.path.join(directory, f'resume-{number:03d}.pdf')
+        with open(path, 'wb') as f:
+            f.write(write_pdf(resume_pages(rng, rng.randint(1, 20))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', help='directory of PDFs to use instead of generated ones')
+    parser.add_argument('--documents', type=int, default=30)
+    args = parser.parse_args()
+
+    corpus = args.corpus
+    if not corpus:
+        corpus = tempfile.mkdtemp(prefix='bench-pdf-')
+        build_corpus(corpus, args.documents)
+    paths = sorted(glob.glob(os.path.join(corpus, '*.pdf')))
+
+    print(f"Corpus: {len(paths)} PDFs in {corpus}")
+    print(f"{'backend':>9} {'pages':>7} {'seconds':>8} {'pages/s':>8} {'recall':>7} {'failures':>9}")
+    for name, backend in PDF_BACKENDS.items():
+        if not backend.available():
+            print(f"{name:>9}   not installed")
+            continue
+        pages = failures = 0
+        found = 0
+        start = time.perf_counter()
+        for path in paths:
+            with open(path, 'rb') as stream:
+                try:
+                    texts = list(backend.iter_pages(stream))
+                except Exception:
+                    failures += 1
+                    continue
+            pages += len(texts)
+            found += len(find_sections(''.join(texts)))
+        elapsed = time.perf_counter() - start
+        recall = found / (len(paths) * len(SECTION_KEYWORDS))
+        print(f"{name:>9} {pages:>7} {elapsed:>8.2f} {pages / elapsed:>8.1f} {recall:>7.2f} {failures:>9}")
+
+
+if __name__ == '__main__':
+    main()
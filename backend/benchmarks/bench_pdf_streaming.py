@@ -0,0 +1,63 @@
+"""Peak memory and latency of the PDF text extraction strategies.
+
+Usage: python backend/benchmarks/bench_pdf_streaming.py [--pages 1 10 50 200]
+
+'copy' is the previous approach: BytesIO(upload.read()) and text += page.
+'stream' reads pages one at a time from the upload stream and joins once.
+'early' additionally stops after the page with the last section header.
+'stream' and 'early' use --backend, PyPDF2 by default to match 'copy'.
+"""
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO
+
+import PyPDF2
+
+from common import resume_pages, write_pdf
+from pdf_text import extract_pdf_text
+
+
+def extract_copy(stream):
+    reader = PyPDF2.PdfReader(BytesIO(stream.read()))
+    text = ""
+    for page in reader.pages:
+        text += page.extract_text()
+    return text
+
+
+def strategies(backend):
+    return {
+        'copy': extract_copy,
+        'stream': lambda stream: extract_pdf_text(stream, backends=backend),
+        'early': lambda stream: extract_pdf_text(stream, stop_after_sections=True, backends=backend),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 10, 50, 200])
+    parser.add_argument('--backend', default='pypdf2')
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'PDF KB':>8} {'strategy':>9} {'peak KB':>9} {'seconds':>8} {'chars':>9}")
+    for pages in args.pages:
+        data = write_pdf(resume_pages(random.Random(pages), pages))
+        for name, extract in strategies(args.backend).items():
+            # Uploads arrive as a spooled temp file, not as bytes in memory
+            with tempfile.TemporaryFile() as upload:
+                upload.write(data)
+                upload.seek(0)
+                tracemalloc.start()
+                start = time.perf_counter()
+                text = extract(upload)
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            print(f"{pages:>6} {len(data) / 1024:>8.0f} {name:>9} {peak / 1024:>9.0f} {elapsed:>8.3f} {len(text):>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Latency of ranking a stored resume pool against job descriptions.
+
+Usage: python backend/benchmarks/bench_resume_store.py [--pool 100000] [--queries 200]
+
+Fills a resume store with synthetic parsed resumes, reopens it as a fresh
+worker would, then ranks the pool for random job descriptions with the
+inverted skill index pruning candidates, and with every resume scored.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from common import ACHIEVEMENTS, fitted_analyzer, quiet, synthetic_resumes, synthetic_vocabulary
+from resume_store import ResumeStore
+from skill_taxonomy import get_skill_index
+
+
+def popular_skills(rng, skills, count):
+    # Skill popularity is long-tailed: a few skills appear on most resumes
+    weights = 1 / np.arange(1, len(skills) + 1)
+    return list(dict.fromkeys(rng.choices(skills, weights=weights, k=count)))
+
+
+def job_description(rng, skills):
+    return (f"We are hiring an engineer who {rng.choice(ACHIEVEMENTS)}. Required skills: "
+            f"{', '.join(popular_skills(rng, skills, rng.randint(2, 5)))}.")
+
+
+def timed(rank, queries):
+    results, scored, samples = [], [], []
+    for query in queries:
+        start = time.perf_counter()
+        ranked, count = rank(query)
+        samples.append(time.perf_counter() - start)
+        results.append([candidate['resume_id'] for candidate in ranked])
+        scored.append(count)
+    return results, np.mean(scored), np.percentile(np.array(samples) * 1000, [50, 99])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pool', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = synthetic_vocabulary(5000)
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        with quiet():
+            analyzer = fitted_analyzer(vocabulary=vocabulary)
+        store = ResumeStore(os.path.join(workdir, 'resumes.sqlite3'), analyzer)
+
+        skills = get_skill_index().skills
+        resumes = synthetic_resumes(args.pool, seed=1, vocabulary=vocabulary)
+        for resume in resumes:
+            resume['skills'] = popular_skills(rng, skills, rng.randint(3, 12))
+        start = time.perf_counter()
+        for offset in range(0, args.pool, 5000):
+            chunk = resumes[offset:offset + 5000]
+            with quiet():
+                analyses = analyzer.analyze_resumes(chunk)
+            store.add_many([(f'resume-{offset + i}', f'resume-{offset + i}.pdf', resume, analysis)
+                            for i, (resume, analysis) in enumerate(zip(chunk, analyses))])
+        print(f"Stored {args.pool} resumes in {time.perf_counter() - start:.1f}s (analysis included)")
+
+        store = ResumeStore(os.path.join(workdir, 'resumes.sqlite3'), analyzer)
+        start = time.perf_counter()
+        store.refresh()
+        print(f"Loaded {len(store)} resumes into a fresh process in {time.perf_counter() - start:.2f}s")
+
+        queries = [job_description(rng, skills) for _ in range(args.queries)]
+        pruned, pruned_scored, (pruned_p50, pruned_p99) = timed(lambda q: store.rank(q, args.top), queries)
+        full, full_scored, (full_p50, full_p99) = timed(lambda q: store.rank(q, args.top, prune=False), queries)
+        overlap = np.mean([len(set(a) & set(b)) / len(b) for a, b in zip(pruned, full) if b])
+
+        print(f"{'ranking':>10} {'scored':>8} {'p50 ms':>8} {'p99 ms':>8}")
+        print(f"{'pruned':>10} {pruned_scored:>8.0f} {pruned_p50:>8.2f} {pruned_p99:>8.2f}")
+        print(f"{'full':>10} {full_scored:>8.0f} {full_p50:>8.2f} {full_p99:>8.2f}")
+        print(f"Top-{args.top} overlap between pruned and full ranking: {overlap:.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Section cache hit rate and latency on sequences of resume edits.
+
+Usage: python backend/benchmarks/bench_section_cache.py [--resumes 200] [--edits 10] [--vocabulary 20000]
+
+Each resume is analyzed once, then re-analyzed after each of --edits edits,
+the way a candidate polishes a resume between uploads. An edit touches one
+section: a skill added or dropped, a sentence appended to the experience, or
+a new degree. Every version is scored twice, with the section cache and with
+it turned off, and the scores are checked to match. Reports the hit rate per
+section and the latency of vectorization alone and of analyze_resume as a whole.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from common import (ACHIEVEMENTS, DEGREES, FIELDS, SKILL_POOL, fitted_analyzer, quiet,
+                    synthetic_resumes, synthetic_vocabulary)
+
+
+def edit(rng, resume, vocabulary):
+    resume = dict(resume, skills=list(resume['skills']))
+    section = rng.choice(['skills', 'skills', 'experience', 'experience', 'education'])
+    if section == 'skills':
+        missing = [skill for skill in SKILL_POOL if skill not in resume['skills']]
+        if len(resume['skills']) > 3 and (not missing or rng.random() < 0.3):
+            resume['skills'].remove(rng.choice(resume['skills']))
+        else:
+            resume['skills'].append(rng.choice(missing))
+    elif section == 'experience':
+        resume['experience'] += f", {rng.choice(ACHIEVEMENTS)} " + ' '.join(rng.choices(vocabulary, k=5))
+    else:
+        resume['education'] = f"{rng.choice(DEGREES)} in {rng.choice(FIELDS)}, {rng.randint(2005, 2024)}"
+    return resume
+
+
+def edit_sequences(resumes, edits, vocabulary, seed=0):
+    # Every version of every resume, in upload order
+    rng = random.Random(seed)
+    versions = []
+    for resume in resumes:
+        versions.append(resume)
+        for _ in range(edits):
+            resume = edit(rng, resume, vocabulary)
+            versions.append(resume)
+    return versions
+
+
+def timed(function, versions):
+    latencies = []
+    results = []
+    for resume in versions:
+        start = time.perf_counter()
+        results.append(function(resume))
+        latencies.append(time.perf_counter() - start)
+    return results, np.array(latencies) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=200)
+    parser.add_argument('--edits', type=int, default=10, help='edits re-uploaded per resume')
+    parser.add_argument('--train-size', type=int, default=2000)
+    parser.add_argument('--vocabulary', type=int, default=20000)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix='bench-section-cache-'))
+    vocabulary = synthetic_vocabulary(args.vocabulary)
+    versions = edit_sequences(synthetic_resumes(args.resumes, seed=1, vocabulary=vocabulary),
+                              args.edits, vocabulary)
+    print(f"{args.resumes} resumes x {args.edits + 1} versions, vocabulary ~{args.vocabulary} filler words")
+
+    for sparse in (False, True):
+        analyzer = fitted_analyzer(args.train_size, vocabulary=vocabulary, sparse=sparse)
+        cache = analyzer.section_cache
+        path = 'sparse' if sparse else 'dense'
+
+        def vectorize(resume):
+            return analyzer._transform(analyzer._to_columns([resume]))
+
+        with quiet():
+            rows = {}
+            for name, enabled in (('off', False), ('on', True)):
+                analyzer.section_cache = cache if enabled else None
+                cache.clear()
+                _, vectorize_ms = timed(vectorize, versions)
+                cache.clear()
+                results, analyze_ms = timed(analyzer.analyze_resume, versions)
+                rows[name] = ([result['overall_score'] for result in results], vectorize_ms, analyze_ms)
+
+        print(f"\n{path} features")
+        hit_rates = ', '.join(f"{section} {stats['hit_rate']:.0%}"
+                              for section, stats in sorted(cache.stats()['namespaces'].items()))
+        print(f"  hit rate: {hit_rates}")
+        print(f"  {'cache':>5} {'vectorize p50 ms':>17} {'mean ms':>8} {'analyze p50 ms':>15} {'mean ms':>8} {'same scores':>12}")
+        for name, (scores, vectorize_ms, analyze_ms) in rows.items():
+            print(f"  {name:>5} {np.percentile(vectorize_ms, 50):>17.3f} {vectorize_ms.mean():>8.3f} "
+                  f"{np.percentile(analyze_ms, 50):>15.3f} {analyze_ms.mean():>8.3f} "
+                  f"{str(scores == rows['off'][0]):>12}")
+
+
+if __name__ == '__main__':
+    main()
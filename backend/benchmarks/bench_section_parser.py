@@ -0,0 +1,70 @@
+"""Compare the single-pass section parser with the previous line-by-line scan.
+
+Usage: python backend/benchmarks/bench_section_parser.py [--pages 1 5 20 100]
+"""
+import argparse
+import random
+import re
+import timeit
+
+from common import resume_pages
+from section_parser import SECTION_KEYWORDS, parse_sections
+
+
+def extract_resume_data_linear(text):
+    # The previous implementation of extract_resume_data
+    skills = []
+    experience = ""
+    education = ""
+    lines = text.split('\n')
+    skill_keywords = SECTION_KEYWORDS['skills']
+    experience_keywords = SECTION_KEYWORDS['experience']
+    education_keywords = SECTION_KEYWORDS['education']
+    current_section = None
+    for line in lines:
+        line = line.strip().lower()
+        if any(keyword in line for keyword in skill_keywords):
+            current_section = 'skills'
+            continue
+        elif any(keyword in line for keyword in experience_keywords):
+            current_section = 'experience'
+            continue
+        elif any(keyword in line for keyword in education_keywords):
+            current_section = 'education'
+            continue
+        if current_section == 'skills' and line:
+            skills.extend([skill.strip() for skill in re.split(r'[,;]', line) if skill.strip()])
+        elif current_section == 'experience' and line:
+            experience += line + " "
+        elif current_section == 'education' and line:
+            education += line + " "
+    return {'skills': skills, 'experience': experience.strip(), 'education': education.strip()}
+
+
+def long_resume(rng, pages):
+    # Repeat the section headers throughout, as multi-role resumes do
+    lines = []
+    for page in resume_pages(rng, pages):
+        lines.extend(page)
+        lines.extend(['Work History', f'Engineer, {rng.randint(1, 9)} yrs', 'Technical Skills', 'Go; Rust, C++'])
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 5, 20, 100])
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'chars':>9} {'linear ms':>10} {'single-pass ms':>15} {'speedup':>8}")
+    for pages in args.pages:
+        text = long_resume(random.Random(pages), pages)
+        assert parse_sections(text) == extract_resume_data_linear(text)
+
+        number = max(1, 200 // pages)
+        linear = min(timeit.repeat(lambda: extract_resume_data_linear(text), number=number, repeat=5)) / number
+        single = min(timeit.repeat(lambda: parse_sections(text), number=number, repeat=5)) / number
+        print(f"{pages:>6} {len(text):>9} {linear * 1000:>10.2f} {single * 1000:>15.2f} {linear / single:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
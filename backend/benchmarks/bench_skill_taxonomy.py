@@ -0,0 +1,62 @@
+"""Build cost and matching time of the skill index as the taxonomy grows.
+
+Usage: python backend/benchmarks/bench_skill_taxonomy.py [--sizes 1000 10000 30000 100000]
+
+Synthetic taxonomies of one to three word skills, each with a synonym, are
+matched against the same two-page resume. Matching time should stay flat
+while a substring scan over the same names grows with the taxonomy.
+"""
+import argparse
+import random
+import time
+import timeit
+import tracemalloc
+
+from common import resume_pages, synthetic_vocabulary
+from skill_taxonomy import SkillIndex, get_skill_index
+
+
+def synthetic_taxonomy(size, vocabulary, rng):
+    entries = []
+    for _ in range(size):
+        name = ' '.join(rng.choices(vocabulary, k=rng.randint(1, 3)))
+        entries.append((name, [name.replace(' ', '-') + 'js']))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 30000, 100000])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = synthetic_vocabulary(50000)
+    # Sprinkle taxonomy vocabulary into the resume so some skills match
+    text = '\n'.join(line for page in resume_pages(rng, 2) for line in page)
+    text += ' ' + ' '.join(rng.choices(vocabulary, k=200))
+
+    shipped = get_skill_index()
+    print(f"Shipped taxonomy: {len(shipped)} skills, "
+          f"{timeit.timeit(lambda: shipped.find(text), number=100) * 10:.2f} ms per resume")
+
+    print(f"{'skills':>8} {'build s':>8} {'index MB':>9} {'match ms':>9} {'matches':>8} {'substring ms':>13}")
+    for size in args.sizes:
+        entries = synthetic_taxonomy(size, vocabulary, rng)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        index = SkillIndex(entries)
+        build_time = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        match_time = timeit.timeit(lambda: index.find(text), number=20) / 20
+        lowered = text.lower()
+        names = [name.lower() for name, _ in entries]
+        substring_time = timeit.timeit(lambda: [n for n in names if n in lowered], number=3) / 3
+        print(f"{size:>8} {build_time:>8.2f} {memory / 1e6:>9.1f} {match_time * 1000:>9.2f} "
+              f"{len(index.find(text)):>8} {substring_time * 1000:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""Throughput and tail latency under slow uploads: gunicorn sync workers against the ASGI app.
+
+Usage: python backend/benchmarks/bench_slow_clients.py [--workers 2] [--slow 32] [--fast 8] [--seconds 20]
+
+Starts each server in turn with the same number of worker processes:
+  gunicorn  gunicorn --preload "app:create_app()" (sync workers, as in the Procfile)
+  uvicorn   uvicorn --factory asgi_app:create_app
+and runs two groups of clients against it for --seconds:
+  slow  upload a resume to /api/analyze-resume in ten pieces, --upload-seconds
+        in total, like a client on a poor mobile link
+  fast  post profiles to /api/career-recommendations and upload resumes to
+        /api/analyze-resume at full speed
+Reports completed requests per second, latency percentiles and errors for
+each group. A request that gets no response within --timeout counts as an error.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import tempfile
+import time
+import urllib.request
+import uuid
+
+import numpy as np
+
+from common import fitted_analyzer, quiet, resume_pages, synthetic_resume, write_pdf
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(port, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/healthz', timeout=2) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('Server did not become ready')
+
+
+def multipart(filename, content):
+    boundary = uuid.uuid4().hex
+    body = (f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            f'Content-Type: application/pdf\r\n\r\n').encode() + content + f'\r\n--{boundary}--\r\n'.encode()
+    return f'multipart/form-data; boundary={boundary}', body
+
+
+async def send_request(port, path, content_type, body, pieces=1, upload_seconds=0.0):
+    # Raw HTTP/1.1 so the body can be sent in timed pieces; returns the status
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        writer.write((f'POST {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Type: {content_type}\r\n'
+                      f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n').encode())
+        size = -(-len(body) // pieces)
+        for start in range(0, len(body), size):
+            writer.write(body[start:start + size])
+            await writer.drain()
+            if pieces > 1:
+                await asyncio.sleep(upload_seconds / pieces)
+        status = int((await reader.readline()).split()[1])
+        await reader.read()
+        return status
+    finally:
+        writer.close()
+
+
+async def client(port, make_request, deadline, timeout, samples):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            status = await asyncio.wait_for(make_request(), timeout)
+        except (asyncio.TimeoutError, OSError, ValueError, IndexError):
+            status = None
+        samples.append((time.perf_counter() - start, status))
+
+
+async def run_load(port, args, pdfs, profiles):
+    rng = random.Random(0)
+
+    def slow():
+        content_type, body = multipart('resume.pdf', rng.choice(pdfs))
+        return send_request(port, '/api/analyze-resume', content_type, body, 10, args.upload_seconds)
+
+    def fast():
+        if rng.random() < 0.5:
+            content_type, body = multipart('resume.pdf', rng.choice(pdfs))
+            return send_request(port, '/api/analyze-resume', content_type, body)
+        return send_request(port, '/api/career-recommendations', 'application/json',
+                            json.dumps(rng.choice(profiles)).encode())
+
+    deadline = time.perf_counter() + args.seconds
+    slow_samples, fast_samples = [], []
+    await asyncio.gather(
+        *[client(port, slow, deadline, args.timeout, slow_samples) for _ in range(args.slow)],
+        *[client(port, fast, deadline, args.timeout, fast_samples) for _ in range(args.fast)]
+    )
+    return slow_samples, fast_samples
+
+
+def summarize(server, group, samples, seconds):
+    ok = np.array([latency for latency, status in samples if status == 200]) * 1000
+    errors = sum(1 for _, status in samples if status != 200)
+    p50, p95, p99 = np.percentile(ok, [50, 95, 99]) if len(ok) else (float('nan'),) * 3
+    print(f"{server:>9} {group:>5} {len(ok) / seconds:>8.1f} {p50:>9.0f} {p95:>9.0f} {p99:>9.0f} {errors:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--slow', type=int, default=32, help='slow uploading clients')
+    parser.add_argument('--fast', type=int, default=8, help='clients sending at full speed')
+    parser.add_argument('--seconds', type=float, default=20)
+    parser.add_argument('--upload-seconds', type=float, default=3, help='time a slow client takes to upload')
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--pages', type=int, default=2)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix='bench-slow-clients-'))
+    with quiet():
+        analyzer = fitted_analyzer()
+    rng = random.Random(1)
+    pdfs = [write_pdf(resume_pages(rng, args.pages)) for _ in range(50)]
+    profiles = [{'skills': synthetic_resume(rng)['skills'], 'years_experience': rng.randint(0, 15)}
+                for _ in range(50)]
+    env = {**os.environ, 'RESUME_MODEL_PATH': os.path.abspath(analyzer.model_path), 'LOG_LEVEL': 'WARNING'}
+
+    servers = {
+        'gunicorn': ['gunicorn', '--chdir', BACKEND_DIR, '--preload', '--workers', str(args.workers),
+                     '--log-level', 'warning', '--bind', '127.0.0.1:{port}', 'app:create_app()'],
+        'uvicorn': ['uvicorn', '--app-dir', BACKEND_DIR, '--factory', '--workers', str(args.workers),
+                    '--log-level', 'warning', '--no-access-log', '--port', '{port}', 'asgi_app:create_app']
+    }
+    print(f"{os.cpu_count()} cores, {args.workers} workers, {args.slow} slow clients "
+          f"({args.upload_seconds:g}s uploads), {args.fast} fast clients, {args.seconds:g}s per server")
+    print(f"{'server':>9} {'group':>5} {'per s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for name, command in servers.items():
+        port = free_port()
+        server = subprocess.Popen([part.format(port=port) for part in command], env=env)
+        try:
+            wait_ready(port)
+            slow, fast = asyncio.run(run_load(port, args, pdfs, profiles))
+        finally:
+            server.terminate()
+            server.wait()
+        summarize(name, 'slow', slow, args.seconds)
+        summarize(name, 'fast', fast, args.seconds)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Memory and latency report for the dense and sparse ResumeAnalyzer feature paths.
+
+Usage: python backend/benchmarks/bench_sparse_features.py [--corpus 100000]
+
+The dense feature matrix for the full corpus does not fit in memory with a
+realistic vocabulary, so the dense path is measured on --dense-rows rows and
+its full-corpus footprint is extrapolated from rows x columns x 8 bytes.
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from common import fitted_analyzer, quiet, synthetic_resumes, synthetic_vocabulary
+
+
+def matrix_bytes(X):
+    if hasattr(X, 'indptr'):
+        return X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+    return X.nbytes
+
+
+def measure(analyzer, columns):
+    tracemalloc.start()
+    start = time.perf_counter()
+    X = analyzer._transform(columns)
+    transform_time = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    with quiet():
+        analyzer.pipeline.named_steps['model'].predict(X)
+    predict_time = time.perf_counter() - start
+    return X, transform_time, predict_time, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', type=int, default=100000)
+    parser.add_argument('--dense-rows', type=int, default=5000)
+    parser.add_argument('--train-size', type=int, default=2000)
+    parser.add_argument('--vocabulary', type=int, default=20000)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix='bench-sparse-'))
+    vocabulary = synthetic_vocabulary(args.vocabulary)
+    corpus = synthetic_resumes(args.corpus, seed=1, vocabulary=vocabulary)
+
+    print(f"Corpus: {args.corpus} resumes, vocabulary ~{args.vocabulary} filler words")
+    print(f"{'path':>7} {'rows':>8} {'cols':>7} {'X MB':>10} {'peak MB':>10} {'transform s':>12} {'predict s':>10}")
+
+    for sparse in (True, False):
+        start = time.perf_counter()
+        analyzer = fitted_analyzer(args.train_size, vocabulary=vocabulary, sparse=sparse)
+        train_time = time.perf_counter() - start
+
+        rows = corpus if sparse else corpus[:args.dense_rows]
+        X, transform_time, predict_time, peak = measure(analyzer, analyzer._to_columns(rows))
+
+        name = 'sparse' if sparse else 'dense'
+        print(f"{name:>7} {X.shape[0]:>8} {X.shape[1]:>7} {matrix_bytes(X) / 1e6:>10.1f} "
+              f"{peak / 1e6:>10.1f} {transform_time:>12.3f} {predict_time:>10.3f}   (train {train_time:.1f}s)")
+        if not sparse and X.shape[0] < args.corpus:
+            scale = args.corpus / X.shape[0]
+            print(f"{'dense*':>7} {args.corpus:>8} {X.shape[1]:>7} {X.shape[0] * scale * X.shape[1] * 8 / 1e6:>10.1f} "
+                  f"{'':>10} {transform_time * scale:>12.3f} {predict_time * scale:>10.3f}   (extrapolated)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Overhead of the per-stage timing spans and request metrics.
+
+Usage: python backend/benchmarks/bench_telemetry.py [--requests 1000]
+
+Posts distinct synthetic PDFs to /api/analyze-resume through the Flask test
+client, in pairs with metrics on and off, and reports the median
+request time of each and the relative overhead. Also reports the cost of a
+single span and of rendering /metrics.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from io import BytesIO
+
+from common import fitted_analyzer, quiet, resume_pages, write_pdf
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=1000, help='requests with metrics on, and as many off')
+    parser.add_argument('--pages', type=int, default=2)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix='bench-telemetry-'))
+    with quiet():
+        analyzer = fitted_analyzer()
+    os.environ['RESUME_MODEL_PATH'] = analyzer.model_path
+
+    # Imported here so the app picks up the model path
+    import telemetry
+    import app as backend_app
+
+    # One log line per request would dominate the comparison
+    telemetry.configure_logging('WARNING')
+    with quiet():
+        backend_app.create_app()
+    client = backend_app.app.test_client()
+
+    rng = random.Random(0)
+    pdfs = [write_pdf(resume_pages(rng, args.pages)) for _ in range(args.requests * 2 + 20)]
+
+    def post(pdf):
+        response = client.post('/api/analyze-resume', data={'file': (BytesIO(pdf), 'resume.pdf')},
+                               content_type='multipart/form-data')
+        assert response.status_code == 200, response.get_json()
+
+    # Warm the extraction pool before timing
+    for pdf in pdfs[:20]:
+        post(pdf)
+    pending = iter(pdfs[20:])
+
+    # Requests go in pairs, one with metrics on and one off, in random order:
+    # drift hits both sides equally and neither side always lands on the same
+    # extraction process. Medians ignore scheduling spikes.
+    timings = {True: [], False: []}
+    for _ in range(args.requests):
+        for enabled in rng.sample([True, False], 2):
+            telemetry.METRICS_ENABLED = enabled
+            start = time.perf_counter()
+            post(next(pending))
+            timings[enabled].append(time.perf_counter() - start)
+    telemetry.METRICS_ENABLED = True
+
+    on = statistics.median(timings[True]) * 1000
+    off = statistics.median(timings[False]) * 1000
+    print(f"{args.requests} requests each way, {args.pages}-page PDFs")
+    print(f"{'metrics':>8} {'p50 ms':>11}")
+    print(f"{'on':>8} {on:>11.3f}")
+    print(f"{'off':>8} {off:>11.3f}")
+    print(f"overhead: {(on - off) / off * 100:+.2f}%")
+
+    iterations = 100000
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with telemetry.span('feedback'):
+            pass
+    span_cost = (time.perf_counter() - start) / iterations
+    # Six stages plus the request histogram and counter
+    print(f"one span: {span_cost * 1e6:.2f} us, "
+          f"about {8 * span_cost * 1000 / off * 100:.3f}% of a request")
+
+    start = time.perf_counter()
+    for _ in range(100):
+        client.get('/metrics')
+    print(f"/metrics render: {(time.perf_counter() - start) / 100 * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
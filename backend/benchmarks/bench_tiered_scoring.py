@@ -0,0 +1,90 @@
+"""Agreement, latency and throughput of the fast, auto and accurate scoring modes.
+
+Usage: python backend/benchmarks/bench_tiered_scoring.py [--resumes 2000] [--threads 8] [--repeat 3] [--dense]
+
+Trains a model, which distills the linear surrogate from the forest's
+out-of-bag predictions, then scores --resumes unseen resumes in each mode:
+  accurate  the forest for every resume, as before
+  fast      the surrogate's sparse dot product only
+  auto      the surrogate, with the forest for scores near a feedback cut-off
+Agreement is the share of resumes whose written feedback matches the
+accurate mode's, and MAE the mean difference in overall score. Latency is per
+analyze_resume call; throughput is resumes per second with --threads callers
+at once, and for analyze_resumes in batches of --batch-size, best of --repeat.
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from common import fitted_analyzer, quiet, synthetic_resumes, synthetic_vocabulary
+
+
+def timed_calls(analyzer, resumes, mode):
+    results, latencies = [], []
+    for resume in resumes:
+        start = time.perf_counter()
+        results.append(analyzer.analyze_resume(resume, mode))
+        latencies.append(time.perf_counter() - start)
+    return results, np.array(latencies) * 1000
+
+
+def throughput(function, items, threads, repeat, reset):
+    best = 0
+    for _ in range(repeat):
+        reset()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(threads) as pool:
+            count = sum(len(result) if isinstance(result, list) else 1 for result in pool.map(function, items))
+        best = max(best, count / (time.perf_counter() - start))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--train-size', type=int, default=2000)
+    parser.add_argument('--vocabulary', type=int, default=20000)
+    parser.add_argument('--dense', action='store_true', help='use the dense feature path')
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix='bench-tiered-'))
+    vocabulary = synthetic_vocabulary(args.vocabulary)
+    analyzer = fitted_analyzer(args.train_size, vocabulary=vocabulary, sparse=not args.dense)
+    # Every resume is new, and the section cache is emptied between modes
+    # so no mode reuses another's vectors
+    resumes = synthetic_resumes(args.resumes, seed=1, vocabulary=vocabulary)
+    batches = [resumes[i:i + args.batch_size] for i in range(0, len(resumes), args.batch_size)]
+    surrogate = analyzer.surrogate
+    print(f"{args.resumes} resumes, {'dense' if args.dense else 'sparse'} features, surrogate fitted on "
+          f"{surrogate['rows']} out-of-bag scores, escalation margin {surrogate['margin']:.2f}")
+    print(f"{'mode':>9} {'agree':>7} {'MAE':>6} {'forest':>7} {'mean ms':>8} {'p50 ms':>7} {'p99 ms':>7} "
+          f"{'per s':>7} {'batch/s':>8}")
+
+    expected = None
+    for mode in ('accurate', 'auto', 'fast'):
+        with quiet():
+            reset = analyzer.section_cache.clear
+            reset()
+            results, latencies = timed_calls(analyzer, resumes, mode)
+            single = throughput(lambda resume: analyzer.analyze_resume(resume, mode), resumes, args.threads,
+                                args.repeat, reset)
+            batch = throughput(lambda rows: analyzer.analyze_resumes(rows, mode), batches, 1, args.repeat, reset)
+        expected = expected or results
+        agree = np.mean([result['feedback'] == reference['feedback'] for result, reference in zip(results, expected)])
+        mae = np.mean([abs(result['overall_score'] - reference['overall_score'])
+                       for result, reference in zip(results, expected)])
+        forest = np.mean([result['scored_by'] == 'forest' for result in results])
+        p50, p99 = np.percentile(latencies, [50, 99])
+        print(f"{mode:>9} {agree:>7.1%} {mae:>6.2f} {forest:>7.1%} {latencies.mean():>8.2f} {p50:>7.2f} {p99:>7.2f} "
+              f"{single:>7.0f} {batch:>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Training time and peak memory of train.py against the corpus size.
+
+Usage: python backend/benchmarks/bench_training.py [--sizes 10000 100000 1000000] [--chunk-size 20000]
+
+Writes a synthetic labelled JSONL corpus of each size and trains on it in a
+fresh process, so the reported peak RSS is that of training alone. Peak
+memory should stay flat as the corpus grows, since only one chunk, the
+search sample and the forest are ever held.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import synthetic_resume, synthetic_vocabulary
+
+TRAIN_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'train.py')
+
+
+def write_corpus(path, size, vocabulary, seed=0):
+    rng = random.Random(seed)
+    with open(path, 'w') as f:
+        for _ in range(size):
+            f.write(json.dumps(synthetic_resume(rng, with_score=True, vocabulary=vocabulary)) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--chunk-size', type=int, default=20000)
+    parser.add_argument('--trees', type=int, default=100)
+    parser.add_argument('--search-iterations', type=int, default=8)
+    args = parser.parse_args()
+
+    vocabulary = synthetic_vocabulary(20000)
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"{os.cpu_count()} cores, chunks of {args.chunk_size}, {args.trees} trees")
+        print(f"{'resumes':>9} {'corpus MB':>10} {'train s':>8} {'peak RSS MB':>12} {'holdout R2':>11} {'MAE':>6}")
+        for size in args.sizes:
+            corpus = os.path.join(workdir, f'corpus-{size}.jsonl')
+            write_corpus(corpus, size, vocabulary)
+            model = os.path.join(workdir, f'model-{size}', 'resume_model.joblib')
+            start = time.perf_counter()
+            output = subprocess.run(
+                [sys.executable, TRAIN_SCRIPT, corpus, '--model', model, '--chunk-size', str(args.chunk_size),
+                 '--trees', str(args.trees), '--search-iterations', str(args.search_iterations)],
+                check=True, capture_output=True, text=True, env={**os.environ, 'LOG_LEVEL': 'OFF'}
+            ).stdout
+            elapsed = time.perf_counter() - start
+            metrics = json.loads(output)
+            print(f"{size:>9} {os.path.getsize(corpus) / 2 ** 20:>10.1f} {elapsed:>8.1f} "
+                  f"{metrics['peak_rss_mb']:>12.1f} {metrics['holdout_r2']:>11.3f} {metrics['holdout_mae']:>6.2f}")
+            os.remove(corpus)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Insert and lookup throughput of the SQLite user store at a million users.
+
+Usage: python backend/benchmarks/bench_user_store.py [--users 1000000] [--lookups 20000] [--passwords 200]
+
+Registers --users synthetic users without a password with add_many in
+requests of --bulk-size, then a few thousand more one request per user as
+/api/register does for a single user. --passwords users with a password are
+then registered in requests of --password-bulk-size, the most the root app
+takes (MAX_BULK_PASSWORDS), where hashing dominates: it is reported per user
+and per full request. Lookups then run against the filled store, reopened
+as a fresh worker would:
+  by id     a user's skills, as /api/recommendations with user_id
+  by email  the same through the email index
+  by skill  the first 100 users with a skill, through the skill index
+For comparison, the in-memory list the root app used to keep is searched by
+email.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from common import SKILL_POOL
+from user_store import UserStore
+
+
+def synthetic_user(rng, number):
+    return {
+        'name': f'User {number}',
+        'email': f'user{number}@example.com',
+        'age': str(rng.randint(18, 65)),
+        'skills': ', '.join(rng.sample(SKILL_POOL, rng.randint(3, 12))),
+        'salaryExpectation': str(rng.randrange(30000, 200000, 1000))
+    }
+
+
+def rate(function, items):
+    start = time.perf_counter()
+    for item in items:
+        function(item)
+    return len(items) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=1000000)
+    parser.add_argument('--bulk-size', type=int, default=10000, help='users per add_many call')
+    parser.add_argument('--single', type=int, default=2000, help='users registered one at a time')
+    parser.add_argument('--passwords', type=int, default=200, help='users registered with a password')
+    parser.add_argument('--password-bulk-size', type=int, default=20, help='users with a password per add_many call')
+    parser.add_argument('--lookups', type=int, default=20000)
+    parser.add_argument('--list-users', type=int, default=100000, help='size of the in-memory list searched')
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix='bench-user-store-'))
+    path = os.path.abspath('users.sqlite3')
+    store = UserStore(path)
+    rng = random.Random(0)
+
+    start = time.perf_counter()
+    insert_seconds = 0.0
+    for first in range(0, args.users, args.bulk_size):
+        users = [synthetic_user(rng, number) for number in range(first, min(first + args.bulk_size, args.users))]
+        started = time.perf_counter()
+        store.add_many(users)
+        insert_seconds += time.perf_counter() - started
+    print(f"{args.users} users in {time.perf_counter() - start:.0f}s, "
+          f"{os.path.getsize(path) / 2 ** 20:.0f} MiB on disk")
+    print(f"{'operation':>18} {'per s':>10}")
+    print(f"{'bulk insert':>18} {args.users / insert_seconds:>10.0f}")
+    singles = [synthetic_user(rng, number) for number in range(args.users, args.users + args.single)]
+    print(f"{'single insert':>18} {rate(store.add, singles):>10.0f}")
+    first = args.users + args.single
+    with_passwords = [dict(synthetic_user(rng, number), password=f'password-{number}')
+                      for number in range(first, first + args.passwords)]
+    requests = [with_passwords[i:i + args.password_bulk_size]
+                for i in range(0, len(with_passwords), args.password_bulk_size)]
+    per_request = rate(store.add_many, requests)
+    print(f"{'bulk w/ password':>18} {per_request * args.password_bulk_size:>10.1f}")
+    print(f"{f'{args.password_bulk_size}-user request':>18} {1 / per_request:>9.2f}s")
+
+    # A fresh store, with nothing in SQLite's page cache from the inserts
+    store = UserStore(path)
+    total = args.users + args.single + args.passwords
+    ids = [rng.randint(1, total) for _ in range(args.lookups)]
+    emails = [f'user{rng.randrange(total)}@example.com' for _ in range(args.lookups)]
+    skills = [rng.choice(SKILL_POOL) for _ in range(args.lookups)]
+    lookups = [('by id', store.skills, ids), ('by email', store.skills_by_email, emails),
+               ('by skill', store.users_with_skill, skills)]
+    for name, function, items in lookups:
+        assert function(items[0]) is not None
+        print(f"{name:>18} {rate(function, items):>10.0f}")
+
+    # The list is smaller than the store, since every lookup scans all of it
+    users = [synthetic_user(rng, number) for number in range(args.list_users)]
+    queries = [f'user{rng.randrange(args.list_users)}@example.com' for _ in range(200)]
+    found = rate(lambda email: next(user for user in users if user['email'] == email), queries)
+    print(f"{f'list scan ({args.list_users // 1000}k)':>18} {found:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+import contextlib
+import logging
+import os
+import random
+import sys
+import zipfile
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+# Make the backend modules importable when running a benchmark as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_analyzer import ResumeAnalyzer
+
+SKILL_POOL = [
+    'Python', 'Java', 'JavaScript', 'SQL', 'Git', 'React', 'HTML', 'CSS', 'TypeScript',
+    'Node.js', 'AWS', 'Azure', 'Docker', 'Kubernetes', 'Terraform', 'Linux', 'Figma',
+    'Machine Learning', 'Data Analysis', 'Statistics', 'Pandas', 'NumPy', 'Agile',
+    'Project Management', 'Communication', 'Leadership', 'REST API', 'Microservices'
+]
+ROLES = [
+    'Software Developer', 'Frontend Developer', 'Backend Engineer', 'Data Scientist',
+    'DevOps Engineer', 'Product Manager', 'UX Designer', 'Data Analyst'
+]
+ACHIEVEMENTS = [
+    'built scalable services', 'led a team of engineers', 'reduced latency by 40%',
+    'migrated systems to the cloud', 'designed data pipelines', 'shipped customer features',
+    'mentored junior developers', 'improved test coverage'
+]
+DEGREES = ['Bachelor', 'Masters', 'PhD', 'Diploma']
+FIELDS = ['Computer Science', 'Information Technology', 'Statistics', 'Design', 'Business']
+
+
+def synthetic_resume(rng, with_score=False, vocabulary=None):
+    skills = rng.sample(SKILL_POOL, rng.randint(3, 12))
+    years = rng.randint(0, 15)
+    experience = f"{rng.choice(ROLES)} with {years} years experience, " + ', '.join(
+        rng.sample(ACHIEVEMENTS, rng.randint(1, 4)))
+    if vocabulary:
+        # Project, product and employer names give a realistic long-tail vocabulary
+        experience += ' ' + ' '.join(rng.choices(vocabulary, k=rng.randint(20, 80)))
+    degree = rng.choice(DEGREES)
+    education = f"{degree} in {rng.choice(FIELDS)}"
+
+    resume = {'skills': skills, 'experience': experience, 'education': education}
+    if with_score:
+        score = 40 + 2.5 * len(skills) + 1.5 * min(years, 10) + DEGREES[::-1].index(degree) * 3
+        resume['score'] = min(100, score + rng.uniform(-5, 5))
+    return resume
+
+
+def synthetic_vocabulary(size, seed=0):
+    rng = random.Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return [''.join(rng.choices(letters, k=rng.randint(4, 10))) for _ in range(size)]
+
+
+def synthetic_resumes(count, seed=0, with_score=False, vocabulary=None):
+    rng = random.Random(seed)
+    return [synthetic_resume(rng, with_score, vocabulary) for _ in range(count)]
+
+
+def resume_pages(rng, pages, lines_per_page=45):
+    # Text lines for a resume of the given length: the usual sections up front,
+    # followed by project descriptions filling the remaining pages
+    resume = synthetic_resume(rng)
+    lines = ['Jane Doe', 'Skills', ', '.join(resume['skills']), 'Experience', resume['experience'],
+             'Education', resume['education'], 'Projects']
+    while len(lines) < pages * lines_per_page:
+        lines.append(f"{rng.choice(ROLES)} project: {', '.join(rng.sample(ACHIEVEMENTS, 3))}")
+    return [lines[i:i + lines_per_page] for i in range(0, pages * lines_per_page, lines_per_page)]
+
+
+def write_pdf(pages):
+    # Minimal PDF writer: one Helvetica text object per page, no dependencies
+    def escape(line):
+        return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None, '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for lines in pages:
+        content = 'BT /F1 10 Tf 50 770 Td 14 TL ' + ' '.join(f'({escape(line)}) Tj T*' for line in lines) + ' ET'
+        objects.append(f'<< /Length {len(content)} >>\nstream\n{content}\nendstream')
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>')
+        kids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{kid} 0 R' for kid in kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f'{number} 0 obj\n{body}\nendobj\n'.encode('latin-1')
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode()
+    out += ''.join(f'{offset:010d} 00000 n \n' for offset in offsets).encode()
+    out += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode()
+    return bytes(out)
+
+
+def write_docx(pages):
+    # Minimal DOCX writer: one paragraph per line and a page break between
+    # pages, no dependencies
+    def paragraph(line):
+        return f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+
+    page_break = '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+    body = page_break.join(''.join(paragraph(line) for line in lines) for lines in pages)
+    files = {
+        '[Content_Types].xml': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>'
+        ),
+        '_rels/.rels': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+            'relationships/officeDocument" Target="word/document.xml"/></Relationships>'
+        ),
+        'word/document.xml': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f'<w:body>{body}</w:body></w:document>'
+        )
+    }
+    out = BytesIO()
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return out.getvalue()
+
+
+@contextlib.contextmanager
+def quiet():
+    # Keep benchmark output readable: silence stray prints and the analyzer's logging
+    logging.disable(logging.CRITICAL)
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def fitted_analyzer(train_size=500, seed=0, vocabulary=None, **kwargs):
+    analyzer = ResumeAnalyzer(**kwargs)
+    analyzer.sample_resumes = synthetic_resumes(train_size, seed=seed, with_score=True, vocabulary=vocabulary)
+    with quiet():
+        if not analyzer.train_model():
+            raise RuntimeError('Failed to train benchmark model')
+    return analyzer
@@ -0,0 +1,46 @@
+"""Write synthetic PDF and DOCX resumes for benchmarks and load tests.
+
+Usage: python backend/benchmarks/generate_resumes.py OUTPUT_DIR [--count 100] [--pages 1 3] [--formats pdf docx]
+
+Each resume has skills, experience and education sections drawn from the
+benchmark vocabulary, followed by project lines filling a page count picked
+between the two --pages bounds. The same --seed always writes the same files.
+"""
+import argparse
+import os
+import random
+
+from common import resume_pages, write_docx, write_pdf
+
+WRITERS = {'pdf': write_pdf, 'docx': write_docx}
+
+
+def generate(output_dir, count, min_pages=1, max_pages=3, formats=('pdf',), seed=0):
+    rng = random.Random(seed)
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for number in range(count):
+        pages = resume_pages(rng, rng.randint(min_pages, max_pages))
+        file_format = formats[number % len(formats)]
+        path = os.path.join(output_dir, f'resume-{number:05d}.{file_format}')
+        with open(path, 'wb') as f:
+            f.write(WRITERS[file_format](pages))
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('output_dir')
+    parser.add_argument('--count', type=int, default=100)
+    parser.add_argument('--pages', type=int, nargs=2, default=[1, 3], metavar=('MIN', 'MAX'))
+    parser.add_argument('--formats', nargs='+', choices=sorted(WRITERS), default=['pdf', 'docx'])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    paths = generate(args.output_dir, args.count, *args.pages, args.formats, args.seed)
+    print(f"Wrote {len(paths)} resumes to {args.output_dir}")
+
+
+if __name__ == '__main__':
+    main()
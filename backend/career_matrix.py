@@ -0,0 +1,69 @@
+import json
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+def load_careers(path):
+    # One JSON object per line:
+    # {"career": ..., "skills": [...], "salary_range": {"min": ..., "max": ...}, "description": ...}
+    careers = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                careers[record.pop('career')] = record
+    return careers
+
+# Career catalog precomputed into one L2-normalized TF-IDF matrix plus salary
+# arrays, so scoring a user against every career is a single sparse
+# matrix-vector product followed by vectorized adjustments.
+class CareerMatrix:
+    def __init__(self, careers):
+        self.names = list(careers)
+        self.careers = [careers[name] for name in self.names]
+
+        self.vectorizer = TfidfVectorizer()
+        # TfidfVectorizer L2-normalizes rows, so dot products are cosine similarities.
+        # Stored transposed (terms x careers) so a product only visits the
+        # rows of the terms the user actually has.
+        self.matrix = self.vectorizer.fit_transform([' '.join(c['skills']) for c in self.careers])
+        self._matrix_t = self.matrix.T.tocsr()
+
+        self.salary_min = np.array([c['salary_range']['min'] for c in self.careers], dtype=np.float64)
+        self.salary_max = np.array([c['salary_range']['max'] for c in self.careers], dtype=np.float64)
+
+    def __len__(self):
+        return len(self.names)
+
+    def similarities(self, user_skills):
+        user_vector = self.vectorizer.transform([' '.join(user_skills)])
+        return (user_vector @ self._matrix_t).toarray().ravel() * 100
+
+    def score(self, user_skills, expected_salary=0, years_experience=0, education_level=''):
+        scores = self.similarities(user_skills)
+
+        # Adjust scores based on salary expectations
+        scores *= np.where(expected_salary > self.salary_max, 0.7,
+                           np.where(expected_salary < self.salary_min, 0.9, 1.0))
+
+        # Additional adjustments based on experience and education
+        if years_experience >= 5:
+            scores *= 1.1
+        if education_level.lower() in ['masters', 'phd']:
+            scores *= 1.05
+        return scores
+
+    def top(self, scores, k):
+        # Indices of the k best scores, best first; ties keep catalog order
+        rounded = np.round(scores, 2)
+        if k < len(rounded):
+            threshold = rounded[np.argpartition(-rounded, k - 1)[k - 1]]
+            # Careers tied with the k-th score are taken in catalog order
+            above = np.flatnonzero(rounded > threshold)
+            tied = np.flatnonzero(rounded == threshold)[:k - len(above)]
+            candidates = np.concatenate([above, tied])
+        else:
+            candidates = np.arange(len(rounded))
+        order = np.lexsort((candidates, -rounded[candidates]))
+        return candidates[order][:k]
@@ -0,0 +1,236 @@
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+import zipfile
+from io import BytesIO
+
+from docx_text import extract_docx_text
+from extraction_pool import EXTRACTION_MAX_PAGES, EXTRACTION_STOP_AFTER_SECTIONS
+from pdf_text import extract_pdf_text
+from resume_analyzer import DEFAULT_MODEL_PATH, ResumeAnalyzer
+from section_parser import parse_sections
+
+RESUME_EXTENSIONS = ('.pdf', '.docx')
+
+def _is_resume(name):
+    return name.lower().endswith(RESUME_EXTENSIONS)
+
+def find_resumes(inputs):
+    # (source, path, member) for every resume in the given directories, glob
+    # patterns, ZIP archives and files. member is None unless it is a ZIP entry.
+    found = {}
+    for pattern in inputs:
+        paths = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for path in paths:
+            if os.path.isdir(path):
+                for root, dirs, files in os.walk(path):
+                    dirs.sort()
+                    for name in sorted(files):
+                        if _is_resume(name):
+                            file_path = os.path.join(root, name)
+                            found.setdefault(file_path, (file_path, None))
+            elif path.lower().endswith('.zip'):
+                with zipfile.ZipFile(path) as archive:
+                    for member in archive.namelist():
+                        if _is_resume(member):
+                            found.setdefault(f'{path}!{member}', (path, member))
+            elif _is_resume(path) and os.path.isfile(path):
+                found.setdefault(path, (path, None))
+    return [(source, path, member) for source, (path, member) in found.items()]
+
+# ZIP archives opened by this worker process, so each is read once
+_archives = {}
+
+def _open(path, member):
+    if member is None:
+        return open(path, 'rb')
+    archive = _archives.get(path)
+    if archive is None:
+        archive = _archives[path] = zipfile.ZipFile(path)
+    # PDF and DOCX readers need to seek, which compressed entries cannot
+    return BytesIO(archive.read(member))
+
+def parse_resume(item):
+    # Runs in a pool process: extract the text and split it into sections
+    source, path, member = item
+    try:
+        with _open(path, member) as stream:
+            if (member or path).lower().endswith('.pdf'):
+                text = extract_pdf_text(stream, EXTRACTION_MAX_PAGES, EXTRACTION_STOP_AFTER_SECTIONS)
+            else:
+                text = extract_docx_text(stream)
+        return source, parse_sections(text), None
+    except Exception as e:
+        return source, None, str(e)
+
+class JsonlWriter:
+    def __init__(self, path):
+        self.path = path
+
+    def done(self):
+        # Sources already written by an earlier run. A line cut short by a
+        # crash is dropped, and its resume is processed again.
+        if not os.path.exists(self.path):
+            return set()
+        done = set()
+        with open(self.path, 'rb+') as f:
+            valid = 0
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                done.add(json.loads(line)['source'])
+                valid += len(line)
+            f.truncate(valid)
+        return done
+
+    def write(self, records):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+class ParquetWriter:
+    # A directory of part files, each written under a temporary name and
+    # renamed into place, so a crash never leaves a half-written part
+    def __init__(self, path):
+        import pyarrow  # noqa: F401 - fail before parsing anything when pyarrow is missing
+
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.parts = len([name for name in os.listdir(path) if name.endswith('.parquet')])
+
+    def done(self):
+        import pyarrow.parquet
+
+        done = set()
+        for name in os.listdir(self.path):
+            if name.endswith('.parquet'):
+                table = pyarrow.parquet.read_table(os.path.join(self.path, name), columns=['source'])
+                done.update(table.column('source').to_pylist())
+        return done
+
+    def write(self, records):
+        import pyarrow
+        import pyarrow.parquet
+
+        schema = pyarrow.schema([
+            ('source', pyarrow.string()),
+            ('error', pyarrow.string()),
+            ('model_version', pyarrow.string()),
+            ('overall_score', pyarrow.float64()),
+            ('category_scores', pyarrow.struct([(name, pyarrow.float64())
+                                                for name in ('skills', 'experience', 'education')])),
+            ('feedback', pyarrow.list_(pyarrow.string())),
+            ('skills', pyarrow.list_(pyarrow.string())),
+            ('experience', pyarrow.string()),
+            ('education', pyarrow.string())
+        ])
+        part_path = os.path.join(self.path, f'part-{self.parts:05d}.parquet')
+        pyarrow.parquet.write_table(pyarrow.Table.from_pylist(records, schema=schema), f'{part_path}.tmp')
+        os.replace(f'{part_path}.tmp', part_path)
+        self.parts += 1
+
+def _records(batch, analyses, model_version):
+    records = []
+    for (source, resume_data), analysis in zip(batch, analyses):
+        records.append({
+            'source': source,
+            'error': None,
+            'model_version': model_version,
+            'overall_score': float(analysis['overall_score']),
+            'category_scores': {key: float(value) for key, value in analysis['category_scores'].items()},
+            'feedback': analysis['feedback'],
+            **resume_data
+        })
+    return records
+
+def _error_record(source, error):
+    return {
+        'source': source, 'error': error, 'model_version': None, 'overall_score': None,
+        'category_scores': None, 'feedback': None, 'skills': None, 'experience': None, 'education': None
+    }
+
+def run_batch(inputs, output, output_format=None, workers=None, batch_size=256, model_path=DEFAULT_MODEL_PATH,
+              progress_every=5.0):
+    output_format = output_format or ('parquet' if output.endswith('.parquet') else 'jsonl')
+    writer = ParquetWriter(output) if output_format == 'parquet' else JsonlWriter(output)
+
+    items = find_resumes(inputs)
+    done = writer.done()
+    pending = [item for item in items if item[0] not in done]
+    print(f"Found {len(items)} resumes, {len(items) - len(pending)} already in {output}", file=sys.stderr)
+    if not pending:
+        return 0
+
+    analyzer = ResumeAnalyzer(model_path=model_path)
+    if not analyzer.load_model():
+        print(f"Could not load the model from {model_path}", file=sys.stderr)
+        return 1
+
+    workers = workers or os.cpu_count()
+    processed = failed = 0
+    started = last_report = time.perf_counter()
+    batch, errors = [], []
+
+    def flush():
+        records = [_error_record(source, error) for source, error in errors]
+        if batch:
+            analyses = analyzer.analyze_resumes([resume_data for _, resume_data in batch])
+            if analyses is None:
+                records += [_error_record(source, 'Failed to analyze resume') for source, _ in batch]
+            else:
+                records += _records(batch, analyses, analyzer.model_version)
+        if records:
+            writer.write(records)
+        batch.clear()
+        errors.clear()
+
+    # Parsing is spread across the pool; predictions are batched here
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(workers) as pool:
+        chunksize = max(1, min(16, len(pending) // (workers * 4)))
+        for source, resume_data, error in pool.imap_unordered(parse_resume, pending, chunksize):
+            processed += 1
+            if error is None:
+                batch.append((source, resume_data))
+            else:
+                failed += 1
+                errors.append((source, error))
+            if len(batch) + len(errors) >= batch_size:
+                flush()
+            now = time.perf_counter()
+            if now - last_report >= progress_every:
+                print(f"{processed}/{len(pending)} resumes, {processed / (now - started):.1f}/s, "
+                      f"{failed} failed", file=sys.stderr)
+                last_report = now
+        flush()
+
+    elapsed = time.perf_counter() - started
+    print(f"Processed {processed} resumes in {elapsed:.1f}s ({processed / elapsed:.1f}/s) "
+          f"with {workers} workers, {failed} failed", file=sys.stderr)
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='resume-analyzer')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    batch = commands.add_parser('batch', help='score a directory, glob or ZIP of PDF and DOCX resumes')
+    batch.add_argument('inputs', nargs='+', help='directories, glob patterns, ZIP files or resume files')
+    batch.add_argument('--output', '-o', required=True,
+                       help='JSONL file, or a directory of Parquet parts when it ends in .parquet')
+    batch.add_argument('--format', choices=['jsonl', 'parquet'], help='override the format implied by --output')
+    batch.add_argument('--workers', type=int, help='parsing processes, default one per core')
+    batch.add_argument('--batch-size', type=int, default=256, help='resumes per prediction and write')
+    batch.add_argument('--model', default=DEFAULT_MODEL_PATH)
+
+    args = parser.parse_args(argv)
+    if args.command == 'batch':
+        return run_batch(args.inputs, args.output, args.format, args.workers, args.batch_size, args.model)
+
+if __name__ == '__main__':
+    sys.exit(main())
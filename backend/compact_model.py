@@ -0,0 +1,151 @@
+import os
+import re
+
+import numpy as np
+
+from feedback import build_result
+
+# Bump when the layout of the exported arrays changes
+COMPACT_FORMAT = 1
+
+DEFAULT_COMPACT_MODEL_PATH = os.environ.get('COMPACT_MODEL_PATH', 'models/resume_model.npz')
+
+# Rows densified at once while predicting a batch
+PREDICT_BATCH_SIZE = 64
+
+def _rotl32(value, shift):
+    return ((value << shift) | (value >> (32 - shift))) & 0xffffffff
+
+def murmurhash3_32(data, seed=0):
+    # MurmurHash3 x86_32 as a signed integer, the hash HashingVectorizer uses
+    length = len(data)
+    h = seed
+    tail_start = length - length % 4
+    for i in range(0, tail_start, 4):
+        k = int.from_bytes(data[i:i + 4], 'little')
+        k = _rotl32((k * 0xcc9e2d51) & 0xffffffff, 15)
+        h ^= (k * 0x1b873593) & 0xffffffff
+        h = (_rotl32(h, 13) * 5 + 0xe6546b64) & 0xffffffff
+    tail = data[tail_start:]
+    if tail:
+        k = int.from_bytes(tail, 'little')
+        k = _rotl32((k * 0xcc9e2d51) & 0xffffffff, 15)
+        h ^= (k * 0x1b873593) & 0xffffffff
+    h ^= length
+    h ^= h >> 16
+    h = (h * 0x85ebca6b) & 0xffffffff
+    h ^= h >> 13
+    h = (h * 0xc2b2ae35) & 0xffffffff
+    h ^= h >> 16
+    return h - 0x100000000 if h & 0x80000000 else h
+
+class CompactModel:
+    # Scores resumes from a model exported by export_model.py using NumPy
+    # alone: the same tokenization, TF-IDF weights, scaling and trees as the
+    # scikit-learn pipeline, computed in the same order so scores are identical
+    def __init__(self, path=DEFAULT_COMPACT_MODEL_PATH):
+        self.path = path
+        with np.load(path, allow_pickle=False) as arrays:
+            if int(arrays['format']) != COMPACT_FORMAT:
+                raise ValueError(f"Unsupported compact model format: {int(arrays['format'])}")
+            self.model_version = str(arrays['version'])
+            self.token_pattern = re.compile(str(arrays['token_pattern']))
+
+            self.sections = []
+            offset = 0
+            for index, name in enumerate(arrays['sections']):
+                prefix = f'section{index}_'
+                terms = arrays[prefix + 'terms']
+                idf = arrays[prefix + 'idf']
+                self.sections.append({
+                    'name': str(name),
+                    # Vocabulary sections look terms up; hashing sections have no terms
+                    'vocabulary': {term: i for i, term in enumerate(terms.tolist())} if len(terms) else None,
+                    'idf': idf,
+                    'normalize': bool(arrays[prefix + 'normalize']),
+                    'offset': offset
+                })
+                offset += len(idf)
+            self.n_features = offset
+
+            self.scaler_mean = arrays['scaler_mean']
+            self.scaler_scale = arrays['scaler_scale']
+            self.scaler_reciprocal = bool(arrays['scaler_reciprocal'])
+
+            self.roots = arrays['roots']
+            self.node_features = arrays['node_features']
+            self.thresholds = arrays['thresholds']
+            self.left = arrays['left']
+            self.right = arrays['right']
+            self.values = arrays['values']
+            self.depth = int(arrays['depth'])
+
+    def _section_vector(self, section, text):
+        # Term counts, weighted by IDF and L2-normalized, as (indices, values)
+        # in ascending index order
+        counts = {}
+        vocabulary = section['vocabulary']
+        n_features = len(section['idf'])
+        for token in self.token_pattern.findall(text.lower()):
+            if vocabulary is not None:
+                index = vocabulary.get(token)
+                if index is None:
+                    continue
+            else:
+                index = abs(murmurhash3_32(token.encode('utf-8'))) % n_features
+            counts[index] = counts.get(index, 0) + 1
+        indices = np.array(sorted(counts), dtype=np.int64)
+        values = np.array([counts[index] for index in indices.tolist()], dtype=np.float64) * section['idf'][indices]
+        if section['normalize']:
+            # Summed one term at a time, like scikit-learn, so rounding matches
+            total = 0.0
+            for value in values.tolist():
+                total += value * value
+            if total != 0.0:
+                values /= np.sqrt(total)
+        return indices, values
+
+    def transform(self, batch):
+        X = np.zeros((len(batch), self.n_features))
+        for row, resume_data in enumerate(batch):
+            texts = {
+                'skills': ' '.join(resume_data.get('skills', [])),
+                'experience': resume_data.get('experience', ''),
+                'education': resume_data.get('education', '')
+            }
+            for section in self.sections:
+                indices, values = self._section_vector(section, texts[section['name']])
+                X[row, section['offset'] + indices] = values
+        X -= self.scaler_mean
+        if self.scaler_reciprocal:
+            X *= 1.0 / self.scaler_scale
+        else:
+            X /= self.scaler_scale
+        return X
+
+    def predict_features(self, X):
+        # Walk every tree for every row at once. Leaves point at themselves,
+        # so after `depth` steps each walk has come to rest on its leaf.
+        X = X.astype(np.float32)
+        rows = np.arange(len(X))
+        nodes = np.repeat(self.roots[:, None], len(X), axis=1)
+        for _ in range(self.depth):
+            go_left = X[rows, self.node_features[nodes]] <= self.thresholds[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        # Trees are added up one at a time, in order, as scikit-learn does
+        leaf_values = self.values[nodes]
+        total = np.zeros(len(X))
+        for tree_values in leaf_values:
+            total += tree_values
+        return total / len(self.roots)
+
+    def predict(self, batch):
+        scores = [self.predict_features(self.transform(batch[start:start + PREDICT_BATCH_SIZE]))
+                  for start in range(0, len(batch), PREDICT_BATCH_SIZE)]
+        return np.concatenate(scores) if scores else np.zeros(0)
+
+    def analyze_resume(self, resume_data):
+        return build_result(self.predict([resume_data])[0])
+
+    def analyze_resumes(self, batch):
+        return [build_result(score) for score in self.predict(batch)]
@@ -0,0 +1,68 @@
+import posixpath
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+# WordprocessingML namespaces
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+RELATIONSHIPS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+OFFICE_DOCUMENT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+
+# Text of the run elements that stand for characters, as python-docx maps them
+RUN_CHARACTERS = {W + 'tab': '\t', W + 'ptab': '\t', W + 'cr': '\n', W + 'noBreakHyphen': '-'}
+
+def _document_part(archive):
+    # The main document is almost always word/document.xml, but the package
+    # relationships are what say so
+    try:
+        with archive.open('_rels/.rels') as rels:
+            for _, element in iterparse(rels):
+                if element.tag == RELATIONSHIPS + 'Relationship' and element.get('Type') == OFFICE_DOCUMENT:
+                    return posixpath.normpath(element.get('Target').lstrip('/'))
+    except KeyError:
+        pass
+    return 'word/document.xml'
+
+def iter_docx_paragraphs(stream):
+    # Paragraph texts in document order, table cells and text boxes included.
+    # The document XML is decompressed and parsed incrementally straight from
+    # the upload, and every top-level block is dropped once read, so memory
+    # stays flat however long the document is.
+    with zipfile.ZipFile(stream) as archive, archive.open(_document_part(archive)) as document:
+        paragraphs = []
+        runs = 0
+        depth = 0
+        body = None
+        for event, element in iterparse(document, events=('start', 'end')):
+            tag = element.tag
+            if event == 'start':
+                depth += 1
+                if depth == 2:
+                    body = element
+                if tag == W + 'p':
+                    paragraphs.append([])
+                elif tag == W + 'r':
+                    runs += 1
+                continue
+
+            depth -= 1
+            if tag == W + 'p':
+                yield ''.join(paragraphs.pop())
+            elif tag == W + 'r':
+                runs -= 1
+            elif runs and paragraphs:
+                # Only inside runs: w:tab also marks tab stops in paragraph properties
+                if tag == W + 't':
+                    paragraphs[-1].append(element.text or '')
+                elif tag == W + 'br':
+                    # Page and column breaks have no text equivalent
+                    if element.get(W + 'type', 'textWrapping') == 'textWrapping':
+                        paragraphs[-1].append('\n')
+                elif tag in RUN_CHARACTERS:
+                    paragraphs[-1].append(RUN_CHARACTERS[tag])
+            if depth == 2 and body is not None:
+                body.clear()
+
+def extract_docx_text(stream):
+    # One line per paragraph. Any seekable file object works, so uploads and
+    # ZIP members need no temp file.
+    return ''.join(paragraph + '\n' for paragraph in iter_docx_paragraphs(stream))
@@ -0,0 +1,124 @@
+import argparse
+import os
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import MaxAbsScaler, StandardScaler
+
+from compact_model import COMPACT_FORMAT, DEFAULT_COMPACT_MODEL_PATH
+from resume_analyzer import DEFAULT_MODEL_PATH, FEATURE_COLUMNS, ResumeAnalyzer
+
+# Default word tokenization of the scikit-learn vectorizers, the only one the
+# compact model reproduces
+TOKEN_PATTERN = r'(?u)\b\w\w+\b'
+
+def _check_tokenizer(vectorizer):
+    defaults = {'analyzer': 'word', 'lowercase': True, 'preprocessor': None, 'tokenizer': None,
+                'token_pattern': TOKEN_PATTERN, 'ngram_range': (1, 1), 'strip_accents': None,
+                'stop_words': None, 'binary': False, 'dtype': np.float64}
+    for name, value in defaults.items():
+        if vectorizer.get_params()[name] != value:
+            raise ValueError(f'Cannot export a vectorizer with {name}={vectorizer.get_params()[name]!r}')
+
+def _check_tfidf(tfidf):
+    if tfidf.sublinear_tf or tfidf.norm not in ('l2', None) or not tfidf.use_idf:
+        raise ValueError('Only plain TF-IDF weighting with L2 or no normalization can be exported')
+
+def _section_arrays(transformer):
+    # (terms, idf, normalize) of one fitted section transformer
+    if isinstance(transformer, TfidfVectorizer):
+        _check_tokenizer(transformer)
+        _check_tfidf(transformer)
+        terms = np.empty(len(transformer.vocabulary_), dtype=object)
+        for term, index in transformer.vocabulary_.items():
+            terms[index] = term
+        return terms.astype(str), transformer.idf_, transformer.norm == 'l2'
+    if isinstance(transformer, Pipeline) and len(transformer.steps) == 2:
+        hashing, tfidf = transformer[0], transformer[1]
+        if (isinstance(hashing, HashingVectorizer) and isinstance(tfidf, TfidfTransformer)
+                and hashing.norm is None and not hashing.alternate_sign):
+            _check_tokenizer(hashing)
+            _check_tfidf(tfidf)
+            return np.array([], dtype=str), tfidf.idf_, tfidf.norm == 'l2'
+    raise ValueError(f'Cannot export section transformer {transformer!r}')
+
+def _scaler_arrays(scaler, n_features, sparse):
+    # (mean, scale, reciprocal): sparse input is scaled by multiplying with
+    # 1 / scale and dense input by dividing, exactly as the scalers do
+    if scaler is None or scaler == 'passthrough':
+        return np.zeros(n_features), np.ones(n_features), False
+    if isinstance(scaler, StandardScaler):
+        mean = scaler.mean_ if scaler.with_mean else np.zeros(n_features)
+        scale = scaler.scale_ if scaler.with_std else np.ones(n_features)
+        return mean, scale, sparse
+    if isinstance(scaler, MaxAbsScaler):
+        return np.zeros(n_features), scaler.scale_, sparse
+    raise ValueError(f'Cannot export scaler {scaler!r}')
+
+def _forest_arrays(forest):
+    # All trees in flat node arrays with global child indices. Leaves get
+    # themselves as children and feature 0, so a walk can keep stepping.
+    node_features, thresholds, left, right, values, roots = [], [], [], [], [], []
+    offset = 0
+    depth = 0
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        nodes = np.arange(tree.node_count)
+        leaf = tree.children_left == -1
+        roots.append(offset)
+        node_features.append(np.where(leaf, 0, tree.feature))
+        thresholds.append(tree.threshold)
+        left.append(np.where(leaf, nodes, tree.children_left) + offset)
+        right.append(np.where(leaf, nodes, tree.children_right) + offset)
+        values.append(tree.value[:, 0, 0])
+        offset += tree.node_count
+        depth = max(depth, tree.max_depth)
+    return {
+        'roots': np.array(roots, dtype=np.int64),
+        'node_features': np.concatenate(node_features).astype(np.int32),
+        'thresholds': np.concatenate(thresholds),
+        'left': np.concatenate(left).astype(np.int64),
+        'right': np.concatenate(right).astype(np.int64),
+        'values': np.concatenate(values),
+        'depth': np.array(depth)
+    }
+
+def export_compact_model(analyzer, path=DEFAULT_COMPACT_MODEL_PATH):
+    # Write the fitted pipeline of a loaded ResumeAnalyzer as plain arrays
+    features = analyzer.pipeline.named_steps['features']
+    arrays = {
+        'format': np.array(COMPACT_FORMAT),
+        'version': np.array(analyzer.model_version or ''),
+        'token_pattern': np.array(TOKEN_PATTERN),
+        'sections': np.array(FEATURE_COLUMNS)
+    }
+    n_features = 0
+    for index, name in enumerate(FEATURE_COLUMNS):
+        terms, idf, normalize = _section_arrays(features.named_transformers_[name])
+        arrays[f'section{index}_terms'] = terms
+        arrays[f'section{index}_idf'] = np.asarray(idf, dtype=np.float64)
+        arrays[f'section{index}_normalize'] = np.array(normalize)
+        n_features += len(idf)
+    mean, scale, reciprocal = _scaler_arrays(analyzer.pipeline.named_steps['scaler'], n_features, analyzer.sparse)
+    arrays['scaler_mean'] = np.asarray(mean, dtype=np.float64)
+    arrays['scaler_scale'] = np.asarray(scale, dtype=np.float64)
+    arrays['scaler_reciprocal'] = np.array(reciprocal)
+    arrays.update(_forest_arrays(analyzer.pipeline.named_steps['model']))
+
+    # Written under a temporary name and renamed, like the joblib artifact
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.tmp.npz'
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+    return path
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export the fitted model for the NumPy-only inference path')
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--output', default=DEFAULT_COMPACT_MODEL_PATH)
+    args = parser.parse_args()
+    analyzer = ResumeAnalyzer(model_path=args.model)
+    if not analyzer.load_model():
+        raise SystemExit(f'Could not load the model from {args.model}')
+    print(f'Compact model written to {export_compact_model(analyzer, args.output)}')
@@ -0,0 +1,141 @@
+import multiprocessing
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from io import BytesIO
+
+from pdf_text import extract_pdf_text
+
+# Pool settings, overridable from the environment
+EXTRACTION_WORKERS = int(os.environ.get('EXTRACTION_WORKERS', 2))
+EXTRACTION_QUEUE_SIZE = int(os.environ.get('EXTRACTION_QUEUE_SIZE', 4))
+EXTRACTION_TIMEOUT = float(os.environ.get('EXTRACTION_TIMEOUT', 10))
+EXTRACTION_MAX_PAGES = int(os.environ.get('EXTRACTION_MAX_PAGES', 20))
+# Skip the remaining pages once every section header has been seen
+EXTRACTION_STOP_AFTER_SECTIONS = os.environ.get('EXTRACTION_STOP_AFTER_SECTIONS', '0') == '1'
+# Uploads larger than this are spooled to a temp file and handed to the
+# worker by path instead of being copied through the pipe
+EXTRACTION_SPOOL_BYTES = int(os.environ.get('EXTRACTION_SPOOL_BYTES', 1024 * 1024))
+# Seconds a client is asked to wait before retrying when the pool is full
+EXTRACTION_RETRY_AFTER = int(os.environ.get('EXTRACTION_RETRY_AFTER', 2))
+
+class ExtractionPoolBusy(Exception):
+    pass
+
+class ExtractionTimeout(Exception):
+    pass
+
+class ExtractionFailed(Exception):
+    pass
+
+def _spool(stream):
+    # Small uploads travel as bytes, larger ones through a temp file copied in chunks
+    head = stream.read(EXTRACTION_SPOOL_BYTES + 1)
+    if len(head) <= EXTRACTION_SPOOL_BYTES:
+        return ('bytes', head)
+    with tempfile.NamedTemporaryFile(prefix='resume-', suffix='.pdf', delete=False) as spooled:
+        spooled.write(head)
+        shutil.copyfileobj(stream, spooled)
+    return ('path', spooled.name)
+
+def _worker_main(conn):
+    # Runs in the child process: extract documents until the pipe closes
+    while True:
+        try:
+            (kind, payload), max_pages, stop_after_sections = conn.recv()
+        except EOFError:
+            return
+        try:
+            if kind == 'path':
+                with open(payload, 'rb') as stream:
+                    text = extract_pdf_text(stream, max_pages, stop_after_sections)
+            else:
+                text = extract_pdf_text(BytesIO(payload), max_pages, stop_after_sections)
+            conn.send(('ok', text))
+        except Exception as e:
+            conn.send(('error', str(e)))
+
+class _Worker:
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+# A fixed set of extraction processes, each with its own pipe. Unlike
+# ProcessPoolExecutor, a single hung or crashed worker can be killed and
+# replaced without failing the documents the other workers are handling.
+class ExtractionPool:
+    def __init__(self, workers=EXTRACTION_WORKERS, queue_size=EXTRACTION_QUEUE_SIZE,
+                 timeout=EXTRACTION_TIMEOUT, max_pages=EXTRACTION_MAX_PAGES,
+                 stop_after_sections=EXTRACTION_STOP_AFTER_SECTIONS):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.stop_after_sections = stop_after_sections
+        # Documents being extracted plus documents waiting for a worker
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self._pid = None
+        self._idle = None
+
+    def _ensure_started(self):
+        # Start lazily, and again after a fork, so each gunicorn worker owns its pool
+        with self._lock:
+            if self._pid != os.getpid():
+                self._context = multiprocessing.get_context('spawn')
+                self._idle = queue.Queue()
+                for _ in range(self.workers):
+                    self._idle.put(_Worker(self._context))
+                self._pid = os.getpid()
+
+    def extract(self, stream, max_pages=None):
+        if not self._slots.acquire(blocking=False):
+            raise ExtractionPoolBusy('All PDF extraction workers are busy')
+        job = None
+        try:
+            self._ensure_started()
+            job = _spool(stream)
+            try:
+                worker = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                raise ExtractionPoolBusy('Timed out waiting for a PDF extraction worker')
+            return self._run(worker, job, max_pages or self.max_pages)
+        finally:
+            if job is not None and job[0] == 'path':
+                os.remove(job[1])
+            self._slots.release()
+
+    def _run(self, worker, job, max_pages):
+        try:
+            worker.conn.send((job, max_pages, self.stop_after_sections))
+            if not worker.conn.poll(self.timeout):
+                worker.kill()
+                worker = _Worker(self._context)
+                raise ExtractionTimeout(f'PDF extraction took longer than {self.timeout}s')
+            status, result = worker.conn.recv()
+        except (EOFError, OSError) as e:
+            # The worker died mid-document, e.g. a parser crash or OOM kill
+            worker.kill()
+            worker = _Worker(self._context)
+            raise ExtractionFailed(f'PDF extraction worker crashed: {e}')
+        finally:
+            self._idle.put(worker)
+
+        if status != 'ok':
+            raise ExtractionFailed(result)
+        return result
+
+    def shutdown(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                while not self._idle.empty():
+                    self._idle.get().kill()
+            self._pid = None
@@ -0,0 +1,62 @@
+# Category scores and written feedback for a predicted overall score. Kept
+# free of scikit-learn so the NumPy-only inference path can share it.
+
+# Overall scores at which the written feedback changes: the overall cut-offs
+# and each category's cut-offs over its weight, up to 100
+FEEDBACK_CUTOFFS = (60, 25 / 0.35, 75, 30 / 0.35, 100)
+
+def build_result(score):
+    # Calculate category scores
+    skills_score = min(100, max(0, score * 0.4))
+    experience_score = min(100, max(0, score * 0.35))
+    education_score = min(100, max(0, score * 0.25))
+
+    # Generate feedback
+    feedback = generate_feedback(score, skills_score, experience_score, education_score)
+
+    return {
+        'overall_score': round(score, 2),
+        'category_scores': {
+            'skills': round(skills_score, 2),
+            'experience': round(experience_score, 2),
+            'education': round(education_score, 2)
+        },
+        'feedback': feedback
+    }
+
+def generate_feedback(overall_score, skills_score, experience_score, education_score):
+    feedback = []
+
+    # Overall feedback
+    if overall_score < 60:
+        feedback.append("Your resume needs significant improvement to be competitive in the job market.")
+    elif overall_score < 75:
+        feedback.append("Your resume is decent but could use some improvements to stand out.")
+    else:
+        feedback.append("Your resume looks strong and well-structured.")
+
+    # Skills feedback
+    if skills_score < 30:
+        feedback.append("Consider adding more relevant technical skills and tools to your resume.")
+    elif skills_score < 40:
+        feedback.append("Your skills section is good but could be more comprehensive.")
+    else:
+        feedback.append("Your skills section is well-developed and shows good technical expertise.")
+
+    # Experience feedback
+    if experience_score < 25:
+        feedback.append("Try to highlight more relevant work experience and quantify your achievements.")
+    elif experience_score < 30:
+        feedback.append("Your experience section is solid but could be more detailed with specific accomplishments.")
+    else:
+        feedback.append("Your experience section effectively showcases your professional growth and achievements.")
+
+    # Education feedback
+    if education_score < 25:
+        feedback.append("Consider adding more details about your education, relevant coursework, and academic projects.")
+    elif education_score < 30:
+        feedback.append("Your education section is good but could be more detailed with relevant coursework and projects.")
+    else:
+        feedback.append("Your education section effectively highlights your academic background and achievements.")
+
+    return feedback
@@ -0,0 +1,208 @@
+import argparse
+import json
+import logging
+import os
+import shutil
+import time
+
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.preprocessing import normalize
+
+from telemetry import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes
+INDEX_FORMAT = 1
+
+DEFAULT_INDEX_PATH = os.environ.get('JOB_INDEX_PATH', 'models/job_index')
+
+def job_text(job):
+    return ' '.join([job.get('title', ''), ' '.join(job.get('skills', [])), job.get('description', '')])
+
+def resume_text(resume_data):
+    return ' '.join([' '.join(resume_data.get('skills', [])), resume_data.get('experience', ''),
+                     resume_data.get('education', '')])
+
+def _hasher(n_features):
+    # Stateless, so the catalog vocabulary never has to be held in memory
+    return HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None, dtype=np.float32)
+
+def _embed(hasher, idf, projection, texts):
+    # Hashed term counts -> TF-IDF -> SVD projection, L2-normalized at both
+    # ends. The projection is stored as a contiguous (terms x dims) array, so
+    # the product only reads the rows of the terms present in the texts.
+    X = hasher.transform(texts).tocsr()
+    X.data *= idf[X.indices]
+    return normalize(normalize(X) @ projection)
+
+def _read_lines(path, offsets, start, stop):
+    # Jobs start..stop-1, stepping over the blank lines between them
+    jobs = []
+    with open(path, 'rb') as f:
+        f.seek(offsets[start])
+        while len(jobs) < stop - start:
+            line = f.readline().strip()
+            if line:
+                jobs.append(json.loads(line))
+    return jobs
+
+# Approximate nearest-neighbour index over a job catalog, stored on disk.
+# Jobs are embedded as hashed TF-IDF vectors reduced with TruncatedSVD, then
+# partitioned into k-means cells (an inverted file). A query only scans the
+# nprobe cells whose centroids are closest to it, so nprobe trades recall
+# for latency. Vector arrays are memory-mapped on load.
+class JobIndex:
+    def __init__(self, path, nprobe=None):
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as f:
+            self.meta = json.load(f)
+        if self.meta['format'] != INDEX_FORMAT:
+            raise ValueError(f"Unsupported job index format: {self.meta['format']}")
+
+        self.hasher = _hasher(self.meta['n_features'])
+        self.idf = np.load(os.path.join(path, 'idf.npy'))
+        self.projection = np.load(os.path.join(path, 'projection.npy'))
+        self.centroids = np.load(os.path.join(path, 'centroids.npy'))
+        self.vectors = np.load(os.path.join(path, 'vectors.npy'), mmap_mode='r')
+        self.ids = np.load(os.path.join(path, 'ids.npy'), mmap_mode='r')
+        self.list_offsets = np.load(os.path.join(path, 'list_offsets.npy'))
+        self.job_offsets = np.load(os.path.join(path, 'job_offsets.npy'), mmap_mode='r')
+        self.nprobe = nprobe or self.meta['nprobe']
+
+    def __len__(self):
+        return self.meta['count']
+
+    def embed(self, texts):
+        return _embed(self.hasher, self.idf, self.projection, texts)
+
+    def search(self, text, k=10, nprobe=None):
+        query = self.embed([text])[0]
+        nprobe = min(nprobe or self.nprobe, len(self.centroids))
+
+        # Pick the closest cells, then score only the vectors stored in them
+        centroid_scores = self.centroids @ query
+        cells = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        positions = np.concatenate([
+            np.arange(self.list_offsets[cell], self.list_offsets[cell + 1]) for cell in cells
+        ])
+        # Cells are contiguous on disk; sorting keeps the mmap reads sequential
+        positions.sort()
+        scores = self.vectors[positions] @ query
+        return self._top(positions, scores, k)
+
+    def search_exact(self, text, k=10):
+        # Brute-force cosine scan over the whole catalog, for measuring recall
+        query = self.embed([text])[0]
+        return self._top(np.arange(len(self)), self.vectors @ query, k)
+
+    def _top(self, positions, scores, k):
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [(int(self.ids[positions[i]]), float(scores[i])) for i in best]
+
+    def jobs(self, job_ids):
+        # Read the catalog records of the given jobs from the copied JSONL file
+        path = os.path.join(self.path, 'jobs.jsonl')
+        return [_read_lines(path, self.job_offsets, job_id, job_id + 1)[0] for job_id in job_ids]
+
+def build_index(catalog_path, path, n_features=2 ** 16, dim=128, n_lists=None, nprobe=8,
+                sample_size=50000, chunk_size=10000):
+    started = time.perf_counter()
+    os.makedirs(path, exist_ok=True)
+    jobs_path = os.path.join(path, 'jobs.jsonl')
+    shutil.copyfile(catalog_path, jobs_path)
+
+    # Pass 1: remember where every job starts so records can be read back lazily
+    offsets = []
+    position = 0
+    with open(jobs_path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                offsets.append(position)
+            position += len(line)
+    job_offsets = np.array(offsets, dtype=np.int64)
+    count = len(job_offsets)
+    # The SVD projection needs at least two jobs to fit
+    if min(count, sample_size) < 2:
+        raise ValueError(f'{catalog_path} has {count} jobs, at least 2 are needed to build an index')
+    logger.info("Indexing %d jobs from %s...", count, catalog_path)
+
+    # Fit the IDF weights and the SVD projection on a sample of the catalog
+    hasher = _hasher(n_features)
+    sample = _read_lines(jobs_path, job_offsets, 0, min(sample_size, count))
+    X_sample = hasher.transform([job_text(job) for job in sample])
+    tfidf = TfidfTransformer().fit(X_sample)
+    svd = TruncatedSVD(n_components=min(dim, n_features - 1, len(sample) - 1), random_state=0)
+    svd.fit(normalize(X_sample.multiply(tfidf.idf_).tocsr()))
+    idf = tfidf.idf_.astype(np.float32)
+    projection = np.ascontiguousarray(svd.components_.T, dtype=np.float32)
+    np.save(os.path.join(path, 'idf.npy'), idf)
+    np.save(os.path.join(path, 'projection.npy'), projection)
+
+    # Pass 2: embed the catalog chunk by chunk straight into a memory-mapped file
+    unsorted_path = os.path.join(path, 'vectors.unsorted.npy')
+    vectors = np.lib.format.open_memmap(unsorted_path, mode='w+', dtype=np.float32,
+                                        shape=(count, projection.shape[1]))
+    for start in range(0, count, chunk_size):
+        stop = min(start + chunk_size, count)
+        texts = [job_text(job) for job in _read_lines(jobs_path, job_offsets, start, stop)]
+        vectors[start:stop] = _embed(hasher, idf, projection, texts)
+        logger.info("Embedded %d/%d jobs", stop, count)
+
+    # Partition into k-means cells and store each cell's vectors contiguously
+    n_lists = n_lists or max(1, int(np.sqrt(count)))
+    rng = np.random.default_rng(0)
+    training = vectors[np.sort(rng.choice(count, min(count, 100000), replace=False))]
+    kmeans = MiniBatchKMeans(n_clusters=n_lists, batch_size=4096, n_init=1, random_state=0).fit(training)
+    centroids = normalize(kmeans.cluster_centers_).astype(np.float32)
+    labels = np.concatenate([
+        np.argmax(vectors[start:start + chunk_size] @ centroids.T, axis=1)
+        for start in range(0, count, chunk_size)
+    ])
+    ids = np.argsort(labels, kind='stable')
+    sorted_vectors = np.lib.format.open_memmap(os.path.join(path, 'vectors.npy'), mode='w+',
+                                               dtype=np.float32, shape=vectors.shape)
+    for start in range(0, count, chunk_size):
+        sorted_vectors[start:start + chunk_size] = vectors[ids[start:start + chunk_size]]
+    sorted_vectors.flush()
+    del vectors, sorted_vectors
+    os.remove(unsorted_path)
+
+    np.save(os.path.join(path, 'centroids.npy'), centroids)
+    np.save(os.path.join(path, 'ids.npy'), ids.astype(np.int64))
+    np.save(os.path.join(path, 'list_offsets.npy'),
+            np.searchsorted(labels[ids], np.arange(n_lists + 1)).astype(np.int64))
+    np.save(os.path.join(path, 'job_offsets.npy'), job_offsets)
+    with open(os.path.join(path, 'meta.json'), 'w') as f:
+        json.dump({
+            'format': INDEX_FORMAT,
+            'count': count,
+            'n_features': n_features,
+            'dim': int(projection.shape[1]),
+            'n_lists': n_lists,
+            'nprobe': nprobe,
+            'built_at': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }, f)
+    logger.info("Job index with %d cells written to %s in %.1fs", n_lists, path, time.perf_counter() - started)
+    return JobIndex(path)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build the job catalog index from a JSONL file')
+    parser.add_argument('catalog', help='JSONL file with one job per line: title, skills, description')
+    parser.add_argument('--output', default=DEFAULT_INDEX_PATH)
+    parser.add_argument('--dim', type=int, default=128)
+    parser.add_argument('--lists', type=int, help='number of k-means cells, default sqrt(jobs)')
+    parser.add_argument('--nprobe', type=int, default=8, help='cells scanned per query by default')
+    args = parser.parse_args()
+    configure_logging()
+    try:
+        build_index(args.catalog, args.output, dim=args.dim, n_lists=args.lists, nprobe=args.nprobe)
+    except ValueError as e:
+        parser.error(str(e))
@@ -0,0 +1,354 @@
+import argparse
+import fcntl
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import signal
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+
+import numpy as np
+
+from extraction_pool import EXTRACTION_MAX_PAGES, EXTRACTION_STOP_AFTER_SECTIONS
+from model_registry import ModelWatcher, create_registry
+from pdf_text import extract_pdf_text
+from result_cache import analysis_key, create_cache
+from resume_analyzer import SCORING_MODE, ResumeAnalyzer, section_digests
+from resume_store import create_store
+from revision_store import RevisionStore
+from section_parser import parse_sections
+from telemetry import configure_logging, span
+
+logger = logging.getLogger(__name__)
+
+# Queue settings, overridable from the environment. Asynchronous analysis is
+# only available when JOB_QUEUE_DIR is set.
+JOB_QUEUE_DIR = os.environ.get('JOB_QUEUE_DIR')
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+JOB_TIMEOUT = float(os.environ.get('JOB_TIMEOUT', 60))
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 3))
+# Submissions are refused with a 503 once this many jobs are waiting
+JOB_MAX_QUEUED = int(os.environ.get('JOB_MAX_QUEUED', 1000))
+# Finished jobs and their results are kept this long for polling clients
+JOB_RESULT_TTL = float(os.environ.get('JOB_RESULT_TTL', 24 * 60 * 60))
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 0.2))
+# Seconds a client is asked to wait before submitting again when the queue is full
+JOB_RETRY_AFTER = int(os.environ.get('JOB_RETRY_AFTER', 5))
+
+class JobQueueFull(Exception):
+    pass
+
+# Analysis jobs in a SQLite file, with the uploads spooled next to it, so the
+# queue survives restarts and needs no broker. Web workers submit and poll;
+# the worker processes started by run_workers claim and complete jobs.
+class JobQueue:
+    def __init__(self, directory=JOB_QUEUE_DIR):
+        self.directory = directory
+        self.upload_dir = os.path.join(directory, 'uploads')
+        self.path = os.path.join(directory, 'queue.sqlite3')
+        self._local = threading.local()
+        os.makedirs(self.upload_dir, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    filename TEXT,
+                    upload_hash TEXT,
+                    upload_path TEXT,
+                    resume_id TEXT,
+                    mode TEXT,
+                    result TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    worker_pid INTEGER,
+                    submitted_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )
+            """)
+            # Queues created before jobs had a resume_id and a scoring mode
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column in ('resume_id', 'mode'):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, submitted_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_started ON jobs (started_at)")
+
+    def _connection(self):
+        # Connections must not cross a fork, so keep one per process and thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def depth(self):
+        return self._connection().execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+
+    def submit(self, stream, filename, upload_hash=None, resume_id=None, mode=SCORING_MODE,
+               max_queued=JOB_MAX_QUEUED):
+        if self.depth() >= max_queued:
+            raise JobQueueFull(f'{max_queued} analysis jobs are already waiting')
+
+        # Copy the upload to disk in chunks; the rename makes it visible whole
+        job_id = uuid.uuid4().hex
+        upload_path = os.path.join(self.upload_dir, f'{job_id}.pdf')
+        with open(f'{upload_path}.tmp', 'wb') as spooled:
+            shutil.copyfileobj(stream, spooled)
+        os.replace(f'{upload_path}.tmp', upload_path)
+
+        with self._connection() as conn:
+            conn.execute("""
+                INSERT INTO jobs (id, status, filename, upload_hash, upload_path, resume_id, mode, submitted_at)
+                VALUES (?, 'queued', ?, ?, ?, ?, ?, ?)
+            """, (job_id, filename, upload_hash, upload_path, resume_id, mode, time.time()))
+        return job_id
+
+    def get(self, job_id):
+        conn = self._connection()
+        row = conn.execute("""
+            SELECT status, filename, result, error, attempts, submitted_at, started_at, finished_at
+            FROM jobs WHERE id = ?
+        """, (job_id,)).fetchone()
+        if row is None:
+            return None
+        status, filename, result, error, attempts, submitted_at, started_at, finished_at = row
+        job = {
+            'job_id': job_id,
+            'status': status,
+            'filename': filename,
+            'attempts': attempts,
+            'submitted_at': submitted_at,
+            'started_at': started_at,
+            'finished_at': finished_at
+        }
+        if status == 'queued':
+            job['queue_position'] = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND submitted_at < ?", (submitted_at,)
+            ).fetchone()[0] + 1
+        elif status == 'done':
+            job['result'] = json.loads(result)
+        elif status == 'failed':
+            job['error'] = error
+        return job
+
+    def claim(self, worker_pid):
+        # A single UPDATE takes SQLite's write lock before its subquery runs,
+        # so two workers can never claim the same job. A worker runs one job
+        # at a time, which makes its pid enough to find the claimed row.
+        with self._connection() as conn:
+            conn.execute("""
+                UPDATE jobs SET status = 'running', worker_pid = ?, started_at = ?, attempts = attempts + 1
+                WHERE id = (SELECT id FROM jobs WHERE status = 'queued' ORDER BY submitted_at LIMIT 1)
+            """, (worker_pid, time.time()))
+            return conn.execute("""
+                SELECT id, filename, upload_hash, upload_path, resume_id, COALESCE(mode, ?) FROM jobs
+                WHERE status = 'running' AND worker_pid = ?
+            """, (SCORING_MODE, worker_pid)).fetchone()
+
+    def complete(self, job_id, result):
+        self._finish(job_id, 'done', json.dumps(result), None)
+
+    def fail(self, job_id, error):
+        self._finish(job_id, 'failed', None, error)
+
+    def _finish(self, job_id, status, result, error):
+        # Only running jobs finish, so a job killed for overrunning the
+        # timeout just after it completed keeps its result
+        with self._connection() as conn:
+            row = conn.execute("SELECT upload_path FROM jobs WHERE id = ? AND status = 'running'", (job_id,)).fetchone()
+            conn.execute("""
+                UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, upload_path = NULL
+                WHERE id = ? AND status = 'running'
+            """, (status, result, error, time.time(), job_id))
+        if row and row[0] and os.path.exists(row[0]):
+            os.remove(row[0])
+
+    def requeue_abandoned(self, live_pids):
+        # Jobs left running by a worker that is gone (crashed, killed, or the
+        # whole host restarted) go back to the queue until they run out of attempts
+        with self._connection() as conn:
+            rows = conn.execute("SELECT id, worker_pid, attempts FROM jobs WHERE status = 'running'").fetchall()
+            abandoned = [(job_id, attempts) for job_id, worker_pid, attempts in rows if worker_pid not in live_pids]
+            retry = [job_id for job_id, attempts in abandoned if attempts < JOB_MAX_ATTEMPTS]
+            conn.executemany("UPDATE jobs SET status = 'queued', worker_pid = NULL WHERE id = ?",
+                             [(job_id,) for job_id in retry])
+        for job_id, attempts in abandoned:
+            if attempts >= JOB_MAX_ATTEMPTS:
+                self.fail(job_id, f'Worker stopped while processing the job {attempts} times')
+        return len(retry), len(abandoned) - len(retry)
+
+    def overdue(self, timeout):
+        return self._connection().execute(
+            "SELECT id, worker_pid FROM jobs WHERE status = 'running' AND started_at < ?", (time.time() - timeout,)
+        ).fetchall()
+
+    def purge(self, ttl=JOB_RESULT_TTL):
+        with self._connection() as conn:
+            return conn.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?", (time.time() - ttl,)
+            ).rowcount
+
+    def stats(self):
+        conn = self._connection()
+        now = time.time()
+        counts = {'queued': 0, 'running': 0, 'done': 0, 'failed': 0}
+        counts.update(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        oldest = conn.execute("SELECT MIN(submitted_at) FROM jobs WHERE status = 'queued'").fetchone()[0]
+        # Wait and run times of the most recently started jobs
+        recent = conn.execute("""
+            SELECT started_at - submitted_at, finished_at - started_at FROM jobs
+            WHERE started_at IS NOT NULL ORDER BY started_at DESC LIMIT 1000
+        """).fetchall()
+        waits = np.array([wait for wait, _ in recent], dtype=np.float64)
+        runs = np.array([run for _, run in recent if run is not None], dtype=np.float64)
+        return {
+            'depth': counts['queued'],
+            'jobs': counts,
+            'oldest_queued_seconds': round(now - oldest, 3) if oldest else 0.0,
+            'wait_seconds': _summary(waits),
+            'run_seconds': _summary(runs)
+        }
+
+def _summary(samples):
+    if not len(samples):
+        return {'count': 0}
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {
+        'count': len(samples),
+        'mean': round(float(samples.mean()), 3),
+        'p50': round(float(p50), 3),
+        'p95': round(float(p95), 3),
+        'p99': round(float(p99), 3),
+        'max': round(float(samples.max()), 3)
+    }
+
+def create_queue(directory=JOB_QUEUE_DIR):
+    return JobQueue(directory) if directory else None
+
+def _worker_main(directory):
+    # Runs in a worker process: load the model once, then claim jobs until killed
+    configure_logging()
+    job_queue = JobQueue(directory)
+    model_registry = create_registry()
+    version = model_registry.active_version() if model_registry is not None else None
+    analyzer = ResumeAnalyzer(model_path=model_registry.path(version)) if version else ResumeAnalyzer()
+    if not analyzer.load_model():
+        sys.exit(1)
+    result_cache = create_cache()
+    resume_store = create_store(analyzer)
+    revision_store = RevisionStore()
+
+    # Like the web workers, follow the registry's active version
+    current = {'analyzer': analyzer}
+    def swap_analyzer(analyzer):
+        current['analyzer'] = analyzer
+        if resume_store is not None:
+            resume_store.analyzer = analyzer
+    if model_registry is not None:
+        ModelWatcher(model_registry, version, swap_analyzer).start()
+
+    while True:
+        job = job_queue.claim(os.getpid())
+        if job is None:
+            time.sleep(JOB_POLL_INTERVAL)
+            continue
+        job_id, filename, upload_hash, upload_path, resume_id, mode = job
+        analyzer = current['analyzer']
+        try:
+            # The same cache entries as analyze_upload in app.py
+            cache_key = analysis_key(upload_hash, analyzer.model_version, mode)
+            analysis = result_cache.get('analysis', cache_key) if upload_hash else None
+            # A revision needs the section digests, which are cached with the upload
+            sections = result_cache.get('sections', upload_hash) if resume_id and analysis is not None else None
+            if analysis is None or (resume_id and sections is None):
+                with open(upload_path, 'rb') as stream, span('pdf_parse'):
+                    text = extract_pdf_text(stream, EXTRACTION_MAX_PAGES, EXTRACTION_STOP_AFTER_SECTIONS)
+                with span('section_extraction'):
+                    resume_data = parse_sections(text)
+                analysis = analyzer.analyze_resume(resume_data, mode)
+                if analysis is None:
+                    raise ValueError('Failed to analyze resume')
+                if upload_hash:
+                    result_cache.set('analysis', cache_key, analysis)
+                if resume_store is not None:
+                    resume_store.add(upload_hash or job_id, filename, resume_data, analysis)
+                if resume_id:
+                    sections = section_digests(resume_data)
+                    if upload_hash:
+                        result_cache.set('sections', upload_hash, sections)
+            result = {**analysis, 'model_version': analyzer.model_version}
+            if resume_id:
+                result['revision'] = revision_store.record(resume_id, sections, analysis['overall_score'])
+            job_queue.complete(job_id, result)
+        except Exception as e:
+            logger.exception("Error in analysis job %s", job_id)
+            job_queue.fail(job_id, str(e))
+
+def run_workers(directory=JOB_QUEUE_DIR, processes=JOB_WORKERS, timeout=JOB_TIMEOUT):
+    # Supervise the worker processes: replace the ones that die, requeue the
+    # jobs they were running and kill the ones stuck on a job past the timeout
+    job_queue = JobQueue(directory)
+    lock = open(os.path.join(directory, 'workers.lock'), 'w')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        logger.error("Another worker pool is already running for %s", directory)
+        return 1
+
+    context = multiprocessing.get_context('spawn')
+    workers = {}
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+    signal.signal(signal.SIGINT, lambda *_: stopping.set())
+
+    requeued, failed = job_queue.requeue_abandoned(set())
+    logger.info("Requeued %d interrupted jobs, failed %d", requeued, failed)
+    last_purge = 0
+    while not stopping.is_set():
+        for pid, process in list(workers.items()):
+            if not process.is_alive():
+                process.join()
+                logger.warning("Analysis worker %d exited with code %s", pid, process.exitcode)
+                del workers[pid]
+        job_queue.requeue_abandoned(set(workers))
+
+        for job_id, pid in job_queue.overdue(timeout):
+            if pid in workers:
+                workers.pop(pid).kill()
+                job_queue.fail(job_id, f'Analysis took longer than {timeout}s')
+
+        while len(workers) < processes:
+            process = context.Process(target=_worker_main, args=(directory,), daemon=True)
+            process.start()
+            workers[process.pid] = process
+
+        if time.time() - last_purge > 60:
+            job_queue.purge()
+            last_purge = time.time()
+        stopping.wait(1)
+
+    # Jobs still running are requeued when the pool starts again
+    for process in workers.values():
+        process.terminate()
+    for process in workers.values():
+        process.join()
+    return 0
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run the resume analysis worker processes')
+    parser.add_argument('--queue-dir', default=JOB_QUEUE_DIR, required=JOB_QUEUE_DIR is None)
+    parser.add_argument('--processes', type=int, default=JOB_WORKERS)
+    parser.add_argument('--timeout', type=float, default=JOB_TIMEOUT)
+    args = parser.parse_args()
+    configure_logging()
+    sys.exit(run_workers(args.queue_dir, args.processes, args.timeout))
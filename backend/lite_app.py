@@ -0,0 +1,106 @@
+import logging
+import os
+import sys
+import time
+
+from flask import Flask, jsonify, request
+from flask_cors import CORS
+
+# Same sibling imports as app.py
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from compact_model import DEFAULT_COMPACT_MODEL_PATH, CompactModel
+from pdf_text import extract_pdf_text
+from section_parser import is_resume_data, parse_sections
+from telemetry import configure_logging, span
+
+# Resume analysis for serverless deployments. The model is the NumPy-only
+# export written by export_model.py, so a cold start imports neither
+# scikit-learn, SciPy nor joblib. Only the resume analysis endpoints of
+# app.py are served; PDFs are parsed in the request process, since a
+# serverless instance handles one request at a time.
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+app = Flask(__name__)
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_UPLOAD_MB', 10)) * 1024 * 1024
+CORS(app)
+
+EXTRACTION_MAX_PAGES = int(os.environ.get('EXTRACTION_MAX_PAGES', 20))
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', 5000))
+
+model = None
+model_state = {'ready': False, 'model_version': None, 'load_seconds': None, 'error': None}
+
+@app.route('/api/analyze-resume', methods=['POST'])
+def analyze_resume():
+    try:
+        if model is None:
+            return jsonify({'error': 'Model is not loaded yet'}), 503
+
+        file = request.files.get('file')
+        if file is None or file.filename == '':
+            return jsonify({'error': 'No file provided'}), 400
+        if not file.filename.lower().endswith('.pdf'):
+            return jsonify({'error': 'Only PDF files are supported'}), 400
+
+        try:
+            with span('pdf_parse'):
+                text = extract_pdf_text(file.stream, EXTRACTION_MAX_PAGES)
+        except Exception:
+            logger.exception("Error extracting text from PDF")
+            return jsonify({'error': 'Failed to extract text from PDF'}), 400
+
+        with span('section_extraction'):
+            resume_data = parse_sections(text)
+        with span('prediction'):
+            analysis = model.analyze_resume(resume_data)
+        return jsonify(analysis)
+
+    except Exception as e:
+        logger.exception("Error in analyze_resume endpoint")
+        return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
+
+@app.route('/api/analyze-resumes', methods=['POST'])
+def analyze_resumes():
+    try:
+        if model is None:
+            return jsonify({'error': 'Model is not loaded yet'}), 503
+
+        data = request.get_json(silent=True)
+        if data is None:
+            data = {}
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        batch = data.get('resumes', [])
+        if not isinstance(batch, list) or not all(is_resume_data(item) for item in batch):
+            return jsonify({'error': 'resumes must be a list of objects with skills, experience and education'}), 400
+        if not batch:
+            return jsonify({'error': 'Please provide at least one resume'}), 400
+        if len(batch) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'At most {MAX_BATCH_SIZE} resumes can be analyzed per request'}), 400
+        return jsonify({'results': model.analyze_resumes(batch)})
+
+    except Exception as e:
+        logger.exception("Error in analyze_resumes endpoint")
+        return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
+
+@app.route('/healthz')
+def healthz():
+    status = 'ready' if model_state['ready'] else ('error' if model_state['error'] else 'loading')
+    return jsonify({'status': status, **model_state}), 200 if model_state['ready'] else 503
+
+def create_app(path=DEFAULT_COMPACT_MODEL_PATH):
+    global model
+    start = time.perf_counter()
+    try:
+        model = CompactModel(path)
+    except Exception as e:
+        model_state['error'] = f'Failed to load compact model from {path}: {e}'
+        logger.error(model_state['error'])
+        return app
+    model_state['load_seconds'] = round(time.perf_counter() - start, 3)
+    model_state['model_version'] = model.model_version
+    model_state['ready'] = True
+    logger.info("Compact model %s loaded in %ss", model.model_version, model_state['load_seconds'])
+    return app
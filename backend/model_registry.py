@@ -0,0 +1,175 @@
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+
+from resume_analyzer import DEFAULT_MODEL_PATH, ResumeAnalyzer
+import telemetry
+from telemetry import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# Hot reloading is only enabled when MODEL_REGISTRY_DIR is set, normally to
+# the directory train.py writes its versioned artifacts to
+MODEL_REGISTRY_DIR = os.environ.get('MODEL_REGISTRY_DIR')
+MODEL_NAME = os.path.splitext(os.path.basename(DEFAULT_MODEL_PATH))[0]
+# Seconds between two looks at the active version
+MODEL_RELOAD_INTERVAL = float(os.environ.get('MODEL_RELOAD_INTERVAL', 5))
+# Previously active versions remembered for rollback
+MODEL_HISTORY_SIZE = 20
+
+# Versioned artifacts <name>-<version>.joblib in one directory, as written by
+# train.py, and a pointer file <name>.active.json naming the version to serve
+# and the ones served before it. The pointer is replaced atomically, so
+# readers always see either the old or the new version.
+class ModelRegistry:
+    def __init__(self, directory, name=MODEL_NAME):
+        self.directory = directory
+        self.name = name
+        self.pointer_path = os.path.join(directory, f'{name}.active.json')
+
+    def path(self, version):
+        return os.path.join(self.directory, f'{self.name}-{version}.joblib')
+
+    def versions(self):
+        # Oldest first; train.py versions are timestamps, so they sort by age
+        prefix, suffix = f'{self.name}-', '.joblib'
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[len(prefix):-len(suffix)] for name in names
+                      if name.startswith(prefix) and name.endswith(suffix))
+
+    def _read_pointer(self):
+        try:
+            with open(self.pointer_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'version': None, 'history': []}
+
+    def _write_pointer(self, pointer):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f'{self.pointer_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(pointer, f)
+        os.replace(tmp_path, self.pointer_path)
+
+    def active_version(self):
+        # None until a version has been activated
+        return self._read_pointer()['version']
+
+    def history(self):
+        # Previously active versions, most recent last
+        return self._read_pointer()['history']
+
+    def activate(self, version):
+        if not os.path.exists(self.path(version)):
+            raise ValueError(f'No model version {version} in {self.directory}')
+        pointer = self._read_pointer()
+        history = pointer['history']
+        if pointer['version'] is not None and pointer['version'] != version:
+            history = (history + [pointer['version']])[-MODEL_HISTORY_SIZE:]
+        self._write_pointer({'version': version, 'history': history, 'activated_at': time.time()})
+        logger.info("Activated model version %s", version)
+        return version
+
+    def rollback(self):
+        # Go back to the version that was active before the current one
+        pointer = self._read_pointer()
+        history = [version for version in pointer['history'] if os.path.exists(self.path(version))]
+        if not history:
+            raise ValueError('No previous model version to roll back to')
+        version = history.pop()
+        self._write_pointer({'version': version, 'history': history, 'activated_at': time.time()})
+        logger.info("Rolled back model version %s to %s", pointer['version'], version)
+        return version
+
+def create_registry(directory=MODEL_REGISTRY_DIR):
+    return ModelRegistry(directory) if directory else None
+
+# Keeps this process on the registry's active version. A background thread
+# polls the pointer, loads and warms up a new version off the request path and
+# hands it to on_swap, which replaces the serving analyzer with one reference
+# assignment: requests in flight finish on the analyzer they started with.
+class ModelWatcher:
+    def __init__(self, registry, version, on_swap, warmup_resume=None, interval=MODEL_RELOAD_INTERVAL):
+        self.registry = registry
+        self.version = version
+        self.on_swap = on_swap
+        self.warmup_resume = warmup_resume
+        self.interval = interval
+        self._failed_version = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def load(self, version):
+        analyzer = ResumeAnalyzer(model_path=self.registry.path(version))
+        if not analyzer.load_model():
+            return None
+        if self.warmup_resume is not None and analyzer.analyze_resume(self.warmup_resume) is None:
+            return None
+        return analyzer
+
+    def check(self):
+        # Swap in the active version if it changed; True when a swap happened
+        version = self.registry.active_version()
+        if version is None or version in (self.version, self._failed_version):
+            return False
+        logger.info("Loading model version %s...", version)
+        start = time.perf_counter()
+        analyzer = self.load(version)
+        if analyzer is None:
+            # Not retried until the active version changes again
+            logger.error("Could not load model version %s, still serving %s", version, self.version)
+            self._failed_version = version
+            telemetry.model_reloads_total.inc('failure')
+            return False
+        self.on_swap(analyzer)
+        logger.info("Swapped model version %s for %s, loaded and warmed up in %.2fs",
+                    self.version, version, time.perf_counter() - start)
+        self.version = version
+        telemetry.model_reloads_total.inc('success')
+        return True
+
+    def start(self):
+        # Threads do not survive a fork, so every worker starts its own watcher
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name='model-watcher', daemon=True).start()
+
+    def _run(self):
+        while True:
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Error checking the model registry")
+            time.sleep(self.interval)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='List, activate or roll back versioned models')
+    parser.add_argument('command', choices=('list', 'activate', 'rollback'))
+    parser.add_argument('version', nargs='?', help='version to activate')
+    parser.add_argument('--dir', default=MODEL_REGISTRY_DIR or os.path.dirname(DEFAULT_MODEL_PATH) or '.')
+    parser.add_argument('--name', default=MODEL_NAME)
+    args = parser.parse_args()
+    configure_logging()
+    registry = ModelRegistry(args.dir, args.name)
+    try:
+        if args.command == 'activate':
+            if not args.version:
+                parser.error('activate needs a version')
+            registry.activate(args.version)
+        elif args.command == 'rollback':
+            registry.rollback()
+    except ValueError as e:
+        raise SystemExit(str(e))
+    active = registry.active_version()
+    for version in registry.versions():
+        print(f"{'*' if version == active else ' '} {version}")
@@ -0,0 +1,136 @@
+import os
+from io import StringIO
+
+import PyPDF2
+
+from section_parser import SECTION_KEYWORDS, find_sections
+
+# Comma-separated backend names tried in order, or 'auto' for every
+# installed backend. 'auto' tries PyPDF2 first, the extractor the model has
+# always scored, and falls back to the others (fastest first) only when it
+# fails, so installing pypdfium2 does not change any score.
+PDF_BACKEND = os.environ.get('PDF_BACKEND', 'auto')
+
+class PdfBackend:
+    name = None
+
+    def available(self):
+        return True
+
+    def iter_pages(self, stream, max_pages=None):
+        raise NotImplementedError
+
+class PyPDF2Backend(PdfBackend):
+    name = 'pypdf2'
+
+    def iter_pages(self, stream, max_pages=None):
+        # PdfReader seeks around the stream as it needs objects, so the upload is
+        # never copied into memory as a whole. Pages are parsed one at a time.
+        reader = PyPDF2.PdfReader(stream)
+        for number, page in enumerate(reader.pages):
+            if max_pages is not None and number >= max_pages:
+                break
+            yield page.extract_text() or ''
+
+class PdfiumBackend(PdfBackend):
+    name = 'pdfium'
+
+    def available(self):
+        try:
+            import pypdfium2
+            return True
+        except ImportError:
+            return False
+
+    def iter_pages(self, stream, max_pages=None):
+        import pypdfium2
+
+        document = pypdfium2.PdfDocument(stream)
+        try:
+            count = len(document) if max_pages is None else min(len(document), max_pages)
+            for number in range(count):
+                page = document[number]
+                textpage = page.get_textpage()
+                try:
+                    yield textpage.get_text_range()
+                finally:
+                    textpage.close()
+                    page.close()
+        finally:
+            document.close()
+
+class PdfminerBackend(PdfBackend):
+    name = 'pdfminer'
+
+    def available(self):
+        try:
+            import pdfminer
+            return True
+        except ImportError:
+            return False
+
+    def iter_pages(self, stream, max_pages=None):
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+
+        resources = PDFResourceManager()
+        for page in PDFPage.get_pages(stream, maxpages=max_pages or 0):
+            output = StringIO()
+            device = TextConverter(resources, output, laparams=LAParams())
+            try:
+                PDFPageInterpreter(resources, device).process_page(page)
+            finally:
+                device.close()
+            yield output.getvalue()
+
+PDF_BACKENDS = {backend.name: backend for backend in (PyPDF2Backend(), PdfiumBackend(), PdfminerBackend())}
+
+def get_backends(names=None):
+    names = names or PDF_BACKEND
+    if names == 'auto':
+        return [backend for backend in PDF_BACKENDS.values() if backend.available()]
+    backends = []
+    for name in names.split(','):
+        name = name.strip()
+        if name not in PDF_BACKENDS:
+            raise ValueError(f"Unknown PDF backend: {name}")
+        if PDF_BACKENDS[name].available():
+            backends.append(PDF_BACKENDS[name])
+    return backends
+
+def iter_pdf_pages(stream, max_pages=None, backend=None):
+    backend = PDF_BACKENDS[backend] if backend else get_backends()[0]
+    return backend.iter_pages(stream, max_pages)
+
+def _extract_with(backend, stream, max_pages, stop_after_sections):
+    # With stop_after_sections the rest of the document is skipped once the
+    # page containing the last missing section header has been read
+    pages = []
+    found = set()
+    for text in backend.iter_pages(stream, max_pages):
+        pages.append(text)
+        if stop_after_sections:
+            found |= find_sections(text)
+            if len(found) == len(SECTION_KEYWORDS):
+                break
+    return ''.join(pages)
+
+def extract_pdf_text(stream, max_pages=None, stop_after_sections=False, backends=None):
+    # Try each configured backend in turn, falling back to the next one when a
+    # backend fails or finds no text (e.g. on a PDF it cannot decode)
+    errors = []
+    for backend in get_backends(backends):
+        try:
+            stream.seek(0)
+            text = _extract_with(backend, stream, max_pages, stop_after_sections)
+        except Exception as e:
+            errors.append(f"{backend.name}: {str(e)}")
+            continue
+        if text.strip():
+            return text
+        errors.append(f"{backend.name}: no text found")
+    if errors and all(error.endswith('no text found') for error in errors):
+        return ''
+    raise ValueError(f"Could not extract text from PDF ({'; '.join(errors) or 'no PDF backend installed'})")
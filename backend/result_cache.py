@@ -0,0 +1,229 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Cache settings, overridable from the environment
+CACHE_BACKEND = os.environ.get('RESULT_CACHE_BACKEND', 'memory')
+CACHE_SIZE = int(os.environ.get('RESULT_CACHE_SIZE', 1024))
+CACHE_TTL = float(os.environ.get('RESULT_CACHE_TTL', 24 * 60 * 60))
+CACHE_PATH = os.environ.get('RESULT_CACHE_PATH', 'cache/results.sqlite3')
+# The SQLite cache writes access times and hit counters in batches, at most
+# this many seconds apart, instead of on every lookup
+CACHE_FLUSH_SECONDS = float(os.environ.get('RESULT_CACHE_FLUSH_SECONDS', 5))
+
+def hash_upload(file, chunk_size=1 << 16):
+    # Hash the upload in chunks, then rewind it for the extractor
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: file.read(chunk_size), b''):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+def analysis_key(upload_hash, model_version, mode):
+    # Analyses are cached per model and per scoring mode, since the fast
+    # tier's scores differ slightly. Shared by app.py and the queue workers.
+    return f"{upload_hash}:{model_version}:{mode}"
+
+# LRU cache with per-entry expiry, private to the current process
+class MemoryCache:
+    backend = 'memory'
+
+    def __init__(self, max_size=CACHE_SIZE, ttl=CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def get(self, namespace, key):
+        full_key = f"{namespace}:{key}"
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is not None and entry[0] < time.time():
+                del self._entries[full_key]
+                entry = None
+            if entry is None:
+                self._count(namespace, 'misses')
+                return None
+            self._entries.move_to_end(full_key)
+            self._count(namespace, 'hits')
+            return entry[1]
+
+    def set(self, namespace, key, value):
+        full_key = f"{namespace}:{key}"
+        with self._lock:
+            self._entries[full_key] = (time.time() + self.ttl, value)
+            self._entries.move_to_end(full_key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+    def stats(self):
+        with self._lock:
+            return _format_stats(self.backend, len(self._entries), self.max_size, self.ttl, self._counters)
+
+    def _count(self, namespace, counter):
+        counters = self._counters.setdefault(namespace, {'hits': 0, 'misses': 0})
+        counters[counter] += 1
+
+# LRU cache in a SQLite file, shared by every gunicorn worker on the host
+class SQLiteCache:
+    backend = 'sqlite'
+
+    def __init__(self, path=CACHE_PATH, max_size=CACHE_SIZE, ttl=CACHE_TTL, flush_seconds=CACHE_FLUSH_SECONDS):
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.flush_seconds = flush_seconds
+        self._local = threading.local()
+        # Access times and counter increments not written yet, by this process
+        self._lock = threading.Lock()
+        self._accessed = {}
+        self._counts = {}
+        self._flushed_at = time.time()
+        # Eviction runs every so many inserts rather than on each, so the
+        # cache can briefly hold up to a tenth more than max_size per worker
+        self._evict_every = max(1, max_size // 10)
+        self._inserts = 0
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS counters (
+                    namespace TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    value INTEGER NOT NULL,
+                    PRIMARY KEY (namespace, name)
+                )
+            """)
+
+    def _connection(self):
+        # Connections must not cross a fork, so keep one per process and thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, namespace, key):
+        # A read only: the access time and hit or miss are written later, in a batch
+        full_key = f"{namespace}:{key}"
+        now = time.time()
+        row = self._connection().execute(
+            "SELECT value FROM entries WHERE key = ? AND expires_at >= ?", (full_key, now)
+        ).fetchone()
+        with self._lock:
+            if row is not None:
+                self._accessed[full_key] = now
+            counter = (namespace, 'misses' if row is None else 'hits')
+            self._counts[counter] = self._counts.get(counter, 0) + 1
+        self._flush(now)
+        return None if row is None else json.loads(row[0])
+
+    def set(self, namespace, key, value):
+        full_key = f"{namespace}:{key}"
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (full_key, json.dumps(value), now + self.ttl, now)
+            )
+        with self._lock:
+            self._inserts += 1
+            evict = self._inserts % self._evict_every == 0
+        if evict:
+            self._evict(now)
+
+    def _evict(self, now):
+        # Access times are written first so recently read entries are kept
+        self._flush(now, force=True)
+        with self._connection() as conn:
+            conn.execute("DELETE FROM entries WHERE expires_at < ?", (now,))
+            if conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] > self.max_size:
+                # Evict the least recently used entries beyond max_size
+                conn.execute("""
+                    DELETE FROM entries WHERE key IN (
+                        SELECT key FROM entries ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_size,))
+
+    def _flush(self, now, force=False):
+        # One write transaction for everything accessed since the last flush
+        with self._lock:
+            if not force and now - self._flushed_at < self.flush_seconds:
+                return
+            accessed, self._accessed = self._accessed, {}
+            counts, self._counts = self._counts, {}
+            self._flushed_at = now
+        if not accessed and not counts:
+            return
+        with self._connection() as conn:
+            conn.executemany(
+                "UPDATE entries SET last_access = MAX(last_access, ?) WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in accessed.items()]
+            )
+            conn.executemany("""
+                INSERT INTO counters (namespace, name, value) VALUES (?, ?, ?)
+                ON CONFLICT (namespace, name) DO UPDATE SET value = value + excluded.value
+            """, [(namespace, name, count) for (namespace, name), count in counts.items()])
+
+    def clear(self):
+        with self._lock:
+            self._accessed.clear()
+            self._counts.clear()
+        with self._connection() as conn:
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM counters")
+
+    def stats(self):
+        # Includes this process's unwritten counts; other workers' show up
+        # once they flush
+        self._flush(time.time(), force=True)
+        conn = self._connection()
+        size = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        counters = {}
+        for namespace, name, value in conn.execute("SELECT namespace, name, value FROM counters"):
+            counters.setdefault(namespace, {'hits': 0, 'misses': 0})[name] = value
+        return _format_stats(self.backend, size, self.max_size, self.ttl, counters)
+
+def _format_stats(backend, size, max_size, ttl, counters):
+    namespaces = {}
+    for namespace, counts in counters.items():
+        lookups = counts['hits'] + counts['misses']
+        namespaces[namespace] = {
+            **counts,
+            'hit_rate': round(counts['hits'] / lookups, 4) if lookups else 0.0
+        }
+    return {
+        'backend': backend,
+        'size': size,
+        'max_size': max_size,
+        'ttl_seconds': ttl,
+        'namespaces': namespaces
+    }
+
+def create_cache(backend=CACHE_BACKEND):
+    if backend == 'sqlite':
+        return SQLiteCache()
+    if backend == 'memory':
+        return MemoryCache()
+    raise ValueError(f"Unknown result cache backend: {backend}")
@@ -1,153 +1,315 @@
 import numpy as np
+from scipy import sparse
+from sklearn.compose import ColumnTransformer
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.preprocessing import StandardScaler
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler, MaxAbsScaler, normalize
 from sklearn.ensemble import RandomForestRegressor
 import joblib
+import hashlib
+import logging
 import os
 import re
+import time
+from feedback import build_result, generate_feedback
+from result_cache import MemoryCache
+from skill_taxonomy import get_skill_index
+from surrogate import fit_surrogate, near_cutoff, surrogate_scores
+from telemetry import scores_total, span
+
+logger = logging.getLogger(__name__)
+
+# Column order of the raw text matrix fed to the pipeline
+FEATURE_COLUMNS = ('skills', 'experience', 'education')
+
+# Bump when the layout of the saved artifact changes
+ARTIFACT_FORMAT = 1
+
+DEFAULT_MODEL_PATH = os.environ.get('RESUME_MODEL_PATH', 'models/resume_model.joblib')
+
+# Vectorized sections kept per process, so a re-uploaded resume only has its
+# edited sections vectorized again; 0 turns the cache off
+SECTION_CACHE_SIZE = int(os.environ.get('SECTION_CACHE_SIZE', 4096))
+
+# How resumes are scored when the caller does not say: 'accurate' always runs
+# the forest, 'fast' only the linear surrogate, and 'auto' the surrogate with
+# the forest for scores close to a feedback cut-off
+SCORING_MODES = ('fast', 'accurate', 'auto')
+SCORING_MODE = os.environ.get('SCORING_MODE', 'accurate')
+
+def build_pipeline(sparse=False):
+    # One TF-IDF vectorizer per resume section; sparse_threshold decides whether
+    # the stacked output stays CSR or is densified
+    features = ColumnTransformer(
+        [(name, TfidfVectorizer(), index) for index, name in enumerate(FEATURE_COLUMNS)],
+        sparse_threshold=1.0 if sparse else 0.0
+    )
+    # StandardScaler centers the data, which would destroy sparsity
+    scaler = MaxAbsScaler() if sparse else StandardScaler()
+    # Out-of-bag predictions are what the fast tier's surrogate is distilled from
+    model = RandomForestRegressor(n_estimators=100, random_state=42, oob_score=True)
+    return Pipeline([('features', features), ('scaler', scaler), ('model', model)])
+
+def resume_columns(batch):
+    # One row per resume, one column per entry in FEATURE_COLUMNS
+    X = np.empty((len(batch), len(FEATURE_COLUMNS)), dtype=object)
+    for i, resume_data in enumerate(batch):
+        X[i, 0] = ' '.join(resume_data.get('skills', []))
+        X[i, 1] = resume_data.get('experience', '')
+        X[i, 2] = resume_data.get('education', '')
+    return X
+
+def section_digest(text):
+    # Case and whitespace make no difference to the vectorizers, so they are
+    # normalized away before hashing
+    return hashlib.sha256(' '.join(text.lower().split()).encode('utf-8')).hexdigest()
+
+def section_digests(resume_data):
+    row = resume_columns([resume_data])[0]
+    return {name: section_digest(text) for name, text in zip(FEATURE_COLUMNS, row)}
 
 class ResumeAnalyzer:
-    def __init__(self):
+    def __init__(self, sparse=False, model_path=DEFAULT_MODEL_PATH):
+        # With sparse=True the TF-IDF features stay in CSR form end to end
+        # instead of being densified before scaling and prediction
+        self.sparse = sparse
+        self.pipeline = build_pipeline(sparse)
+        self.model_version = None
+        self.surrogate = None
+        # Section vectors by model version and section digest, counted per section
+        self.section_cache = MemoryCache(SECTION_CACHE_SIZE) if SECTION_CACHE_SIZE else None
+
         # Add sample resumes for training
         self.sample_resumes = [
             {
                 'skills': ['Python', 'Java', 'SQL'],
                 'experience': 'Software Developer with 3 years experience',
-                'education': 'Bachelor in Computer Science'
+                'education': 'Bachelor in Computer Science',
+                'score': 72
             },
             {
                 'skills': ['JavaScript', 'React', 'HTML', 'CSS'],
                 'experience': 'Frontend Developer for 2 years',
-                'education': 'Masters in Information Technology'
+                'education': 'Masters in Information Technology',
+                'score': 68
             },
-            # Add more sample resumes as needed
+            # Only enough to start the app; train.py fits a real model on a labelled corpus
         ]
-        self.model_path = 'models/resume_model.joblib'
+        self.model_path = model_path
 
     def train_model(self):
         try:
-            print("Starting model training...")
+            logger.info("Starting model training...")
             # Prepare training data
-            skills_texts = [' '.join(resume['skills']) for resume in self.sample_resumes]
-            experience_texts = [resume['experience'] for resume in self.sample_resumes]
-            education_texts = [resume['education'] for resume in self.sample_resumes]
-            scores = [resume['score'] for resume in self.sample_resumes]
-
-            print("Fitting vectorizers...")
-            # Fit vectorizers
-            skills_features = self.skills_vectorizer.fit_transform(skills_texts).toarray()
-            experience_features = self.experience_vectorizer.fit_transform(experience_texts).toarray()
-            education_features = self.education_vectorizer.fit_transform(education_texts).toarray()
-
-            print("Combining features...")
-            # Combine features
-            X = np.hstack([skills_features, experience_features, education_features])
-            y = np.array(scores)
-
-            print("Scaling features...")
-            # Scale features
-            X_scaled = self.scaler.fit_transform(X)
-
-            print("Training model...")
-            # Train model
-            self.model.fit(X_scaled, y)
-
-            print("Saving model...")
-            # Save the trained model and vectorizers
+            X = self._to_columns(self.sample_resumes)
+            y = np.array([resume['score'] for resume in self.sample_resumes])
+
+            logger.info("Training model...")
+            # Fit vectorizers, scaler and model in one go
+            self.pipeline.fit(X, y)
+            self.model_version = time.strftime('%Y%m%d%H%M%S')
+            self.fit_surrogate(self.sample_resumes, self.pipeline.named_steps['model'].oob_prediction_)
+
+            logger.info("Saving model...")
+            # Save the trained pipeline
             self.save_model()
-            print("Model training completed successfully")
+            logger.info("Model training completed successfully")
             return True
         except Exception as e:
-            print(f"Error in train_model: {str(e)}")
+            logger.exception("Error in train_model")
             return False
 
     def save_model(self):
         try:
-            print("Saving model and vectorizers...")
+            logger.info("Saving model to %s...", self.model_path)
             # Create models directory if it doesn't exist
-            os.makedirs('models', exist_ok=True)
-            
-            # Save model and vectorizers
-            joblib.dump(self.model, 'models/resume_model.joblib')
-            joblib.dump(self.skills_vectorizer, 'models/skills_vectorizer.joblib')
-            joblib.dump(self.experience_vectorizer, 'models/experience_vectorizer.joblib')
-            joblib.dump(self.education_vectorizer, 'models/education_vectorizer.joblib')
-            joblib.dump(self.scaler, 'models/scaler.joblib')
-            print("Model and vectorizers saved successfully")
+            os.makedirs(os.path.dirname(self.model_path) or '.', exist_ok=True)
+
+            artifact = {
+                'format': ARTIFACT_FORMAT,
+                'version': self.model_version,
+                'sparse': self.sparse,
+                'pipeline': self.pipeline,
+                'surrogate': self.surrogate
+            }
+            # Dump uncompressed so the arrays can be memory-mapped on load, and
+            # rename into place so readers never see a half-written file
+            tmp_path = f"{self.model_path}.tmp"
+            joblib.dump(artifact, tmp_path)
+            os.replace(tmp_path, self.model_path)
+            logger.info("Model saved successfully")
             return True
         except Exception as e:
-            print(f"Error in save_model: {str(e)}")
+            logger.exception("Error in save_model")
             return False
 
     def load_model(self):
         try:
-            print("Loading model and vectorizers...")
-            self.model = joblib.load('models/resume_model.joblib')
-            self.skills_vectorizer = joblib.load('models/skills_vectorizer.joblib')
-            self.experience_vectorizer = joblib.load('models/experience_vectorizer.joblib')
-            self.education_vectorizer = joblib.load('models/education_vectorizer.joblib')
-            self.scaler = joblib.load('models/scaler.joblib')
-            print("Model and vectorizers loaded successfully")
+            logger.info("Loading model from %s...", self.model_path)
+            # mmap_mode keeps the numpy arrays in the page cache, shared between
+            # processes. The forest's tree nodes are still copied by scikit-learn
+            # when unpickled, so load before forking to share those too.
+            artifact = joblib.load(self.model_path, mmap_mode='r')
+            if artifact.get('format') != ARTIFACT_FORMAT:
+                logger.error("Unsupported model artifact format: %s", artifact.get('format'))
+                return False
+
+            self.pipeline = artifact['pipeline']
+            self.sparse = artifact['sparse']
+            self.model_version = artifact['version']
+            # Artifacts saved before the fast tier existed have no surrogate
+            self.surrogate = artifact.get('surrogate')
+            logger.info("Model version %s loaded successfully", self.model_version)
             return True
         except Exception as e:
-            print(f"Error in load_model: {str(e)}")
+            logger.exception("Error in load_model")
             return False
 
-    def analyze_resume(self, resume_data):
+    def fit_surrogate(self, batch, targets=None):
+        # Distill the fitted forest into the linear model of the fast tier.
+        # targets are the forest's scores for resumes it was not trained on,
+        # by default its predictions for the batch.
+        X = self._to_columns(batch)
+        if targets is None:
+            targets = self.pipeline.predict(X)
+        self.surrogate = fit_surrogate(self._section_matrix(X), targets)
+        if self.surrogate is None:
+            logger.info("Too few resumes to fit a surrogate, every mode uses the forest")
+        else:
+            logger.info("Surrogate fitted on %d resumes, escalation margin %.2f",
+                        self.surrogate['rows'], self.surrogate['margin'])
+
+    def analyze_resume(self, resume_data, mode=SCORING_MODE):
         try:
-            print("Starting resume analysis...")
-            
             # Prepare input features
-            skills_text = ' '.join(resume_data.get('skills', []))
-            experience_text = resume_data.get('experience', '')
-            education_text = resume_data.get('education', '')
-            
-            print(f"Skills text length: {len(skills_text)}")
-            print(f"Experience text length: {len(experience_text)}")
-            print(f"Education text length: {len(education_text)}")
-
-            # Transform text data
-            print("Transforming text data...")
-            skills_features = self.skills_vectorizer.transform([skills_text]).toarray()
-            experience_features = self.experience_vectorizer.transform([experience_text]).toarray()
-            education_features = self.education_vectorizer.transform([education_text]).toarray()
-
-            # Combine features
-            print("Combining features...")
-            X = np.hstack([skills_features, experience_features, education_features])
-            X_scaled = self.scaler.transform(X)
-
-            # Predict score
-            print("Predicting score...")
-            score = self.model.predict(X_scaled)[0]
-            
-            # Calculate category scores
-            print("Calculating category scores...")
-            skills_score = min(100, max(0, score * 0.4))
-            experience_score = min(100, max(0, score * 0.35))
-            education_score = min(100, max(0, score * 0.25))
-
-            # Generate feedback
-            print("Generating feedback...")
-            feedback = self.generate_feedback(score, skills_score, experience_score, education_score)
-
-            result = {
-                'overall_score': round(score, 2),
-                'category_scores': {
-                    'skills': round(skills_score, 2),
-                    'experience': round(experience_score, 2),
-                    'education': round(education_score, 2)
-                },
-                'feedback': feedback
-            }
-            
-            print("Analysis completed successfully")
+            X = self._to_columns([resume_data])
+            logger.debug("Analyzing resume", extra={
+                'skills_chars': len(X[0, 0]), 'experience_chars': len(X[0, 1]), 'education_chars': len(X[0, 2])
+            })
+
+            # Transform text data and predict score
+            scores, tiers = self._score(X, mode)
+            score = scores[0]
+
+            with span('feedback'):
+                result = self._build_result(score)
+            result['scored_by'] = tiers[0]
             return result
             
         except Exception as e:
-            print(f"Error in analyze_resume: {str(e)}")
+            logger.exception("Error in analyze_resume")
+            return None
+
+    def analyze_resumes(self, batch, mode=SCORING_MODE):
+        try:
+            logger.debug("Starting batch analysis of %d resumes...", len(batch))
+            if not batch:
+                return []
+
+            # Prepare input features for the whole batch, keeping input order
+            X = self._to_columns(batch)
+
+            # One transform per field and one predict over the whole matrix
+            scores, tiers = self._score(X, mode)
+
+            with span('feedback'):
+                results = [{**self._build_result(score), 'scored_by': tier} for score, tier in zip(scores, tiers)]
+            logger.debug("Batch analysis of %d resumes completed successfully", len(results))
+            return results
+
+        except Exception as e:
+            logger.exception("Error in analyze_resumes")
             return None
 
+    def _to_columns(self, batch):
+        return resume_columns(batch)
+
+    def feature_vectors(self, batch):
+        # Per-section TF-IDF vectors side by side, unscaled and L2-normalized,
+        # so a dot product between two rows is their cosine similarity
+        features = self.pipeline.named_steps['features']
+        X = self._to_columns(batch)
+        return normalize(sparse.hstack([
+            features.named_transformers_[name].transform(X[:, index])
+            for index, name in enumerate(FEATURE_COLUMNS)
+        ]).tocsr())
+
+    def _transform(self, X):
+        # Vectorize and scale without predicting
+        if self.section_cache is not None and len(X) == 1:
+            return self._transform_cached(X)
+        return self.pipeline[:-1].transform(X)
+
+    def _section_blocks(self, X):
+        # Unscaled sparse vector of each section. A single resume's sections
+        # are taken from the cache when seen before; batches skip the cache,
+        # vectorizing them whole is cheaper.
+        features = self.pipeline.named_steps['features']
+        if self.section_cache is None or len(X) != 1:
+            return [features.named_transformers_[name].transform(X[:, index])
+                    for index, name in enumerate(FEATURE_COLUMNS)]
+        blocks = []
+        for index, name in enumerate(FEATURE_COLUMNS):
+            key = f"{self.model_version}:{section_digest(X[0, index])}"
+            vector = self.section_cache.get(name, key)
+            if vector is None:
+                vector = features.named_transformers_[name].transform(X[:, index])
+                self.section_cache.set(name, key, vector)
+            blocks.append(vector)
+        return blocks
+
+    def _section_matrix(self, X):
+        return sparse.hstack(self._section_blocks(X)).tocsr()
+
+    def _transform_cached(self, X):
+        # Same result as the pipeline for a single resume, with each section's
+        # vector taken from the cache when that section was seen before
+        return self._scale(self._section_matrix(X))
+
+    def _scale(self, sections):
+        # Model input from the stacked section vectors: densified when the
+        # ColumnTransformer would have, then scaled
+        if not self.pipeline.named_steps['features'].sparse_output_:
+            sections = sections.toarray()
+        return self.pipeline[1:-1].transform(sections)
+
+    def _predict(self, X):
+        # Same as pipeline.predict, split in two so each half is timed
+        with span('vectorization'):
+            features = self._transform(X)
+        with span('prediction'):
+            return self.pipeline[-1].predict(features)
+
+    def _score(self, X, mode):
+        # Scores and the tier that produced each one
+        if mode not in SCORING_MODES:
+            raise ValueError(f'Unknown scoring mode: {mode}')
+        if mode == 'accurate' or self.surrogate is None:
+            scores = self._predict(X)
+            tiers = ['forest'] * len(scores)
+        else:
+            with span('vectorization'):
+                sections = self._section_matrix(X)
+            with span('surrogate'):
+                scores = surrogate_scores(self.surrogate, sections)
+            tiers = ['surrogate'] * len(scores)
+            if mode == 'auto':
+                escalate = np.flatnonzero(near_cutoff(scores, self.surrogate['margin']))
+                if len(escalate):
+                    # The forest reuses the section vectors already computed
+                    with span('prediction'):
+                        scores[escalate] = self.pipeline[-1].predict(self._scale(sections[escalate]))
+                    for index in escalate:
+                        tiers[index] = 'forest'
+        for tier in ('surrogate', 'forest'):
+            count = tiers.count(tier)
+            if count:
+                scores_total.inc(tier, amount=count)
+        return scores, tiers
+
+    def _build_result(self, score):
+        return build_result(score)
+
     def extract_years_of_experience(self, experience_text):
         # Extract years of experience using regex
         years_pattern = r'(\d+)\s*(?:years?|yrs?)'
@@ -188,57 +350,23 @@ class ResumeAnalyzer:
         return min(100, max(0, base_score))
 
     def generate_feedback(self, overall_score, skills_score, experience_score, education_score):
-        feedback = []
-        
-        # Overall feedback
-        if overall_score < 60:
-            feedback.append("Your resume needs significant improvement to be competitive in the job market.")
-        elif overall_score < 75:
-            feedback.append("Your resume is decent but could use some improvements to stand out.")
-        else:
-            feedback.append("Your resume looks strong and well-structured.")
-
-        # Skills feedback
-        if skills_score < 30:
-            feedback.append("Consider adding more relevant technical skills and tools to your resume.")
-        elif skills_score < 40:
-            feedback.append("Your skills section is good but could be more comprehensive.")
-        else:
-            feedback.append("Your skills section is well-developed and shows good technical expertise.")
-
-        # Experience feedback
-        if experience_score < 25:
-            feedback.append("Try to highlight more relevant work experience and quantify your achievements.")
-        elif experience_score < 30:
-            feedback.append("Your experience section is solid but could be more detailed with specific accomplishments.")
-        else:
-            feedback.append("Your experience section effectively showcases your professional growth and achievements.")
-
-        # Education feedback
-        if education_score < 25:
-            feedback.append("Consider adding more details about your education, relevant coursework, and academic projects.")
-        elif education_score < 30:
-            feedback.append("Your education section is good but could be more detailed with relevant coursework and projects.")
-        else:
-            feedback.append("Your education section effectively highlights your academic background and achievements.")
-
-        return feedback
+        return generate_feedback(overall_score, skills_score, experience_score, education_score)
 
     def determine_role_type(self, skills_text):
-        skills_text = skills_text.lower()
+        skills = set(get_skill_index().find(skills_text))
         
-        # Define role-specific keywords
+        # Define role-specific skills, by their canonical taxonomy names
         role_keywords = {
-            'software_engineer': ['python', 'java', 'javascript', 'react', 'node.js', 'sql', 'git'],
-            'data_scientist': ['machine learning', 'data analysis', 'python', 'r', 'statistics', 'pandas', 'numpy'],
-            'devops': ['aws', 'azure', 'docker', 'kubernetes', 'ci/cd', 'terraform', 'jenkins'],
-            'ui_ux': ['figma', 'adobe xd', 'ui/ux', 'prototyping', 'user research', 'wireframing']
+            'software_engineer': ['Python', 'Java', 'JavaScript', 'React', 'Node.js', 'SQL', 'Git'],
+            'data_scientist': ['Machine Learning', 'Data Analysis', 'Python', 'R', 'Statistics', 'Pandas', 'NumPy'],
+            'devops': ['AWS', 'Azure', 'Docker', 'Kubernetes', 'CI/CD', 'Terraform', 'Jenkins'],
+            'ui_ux': ['Figma', 'Adobe XD', 'UI/UX', 'Prototyping', 'User Research', 'Wireframing']
         }
         
         # Count matches for each role
         role_matches = {}
         for role, keywords in role_keywords.items():
-            matches = sum(1 for keyword in keywords if keyword in skills_text)
+            matches = sum(1 for keyword in keywords if keyword in skills)
             role_matches[role] = matches
         
         # Return role with most matches
@@ -0,0 +1,291 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+from scipy import sparse
+
+from skill_taxonomy import get_skill_index
+
+logger = logging.getLogger(__name__)
+
+# The store is only kept when a path is configured
+RESUME_STORE_PATH = os.environ.get('RESUME_STORE_PATH')
+# Share of the ranking score given to job skills the candidate has; the rest
+# comes from the text similarity between the resume and the job description
+RANK_SKILL_WEIGHT = float(os.environ.get('RANK_SKILL_WEIGHT', 0.7))
+
+def resume_skills(resume_data):
+    # Canonical taxonomy skills mentioned anywhere in the parsed resume
+    index = get_skill_index()
+    found = {}
+    for text in (*resume_data.get('skills', []), resume_data.get('experience', ''),
+                 resume_data.get('education', '')):
+        for skill in index.find(text):
+            found.setdefault(skill, None)
+    return list(found)
+
+def _pack(row):
+    return row.indices.astype(np.int32).tobytes(), row.data.astype(np.float32).tobytes()
+
+# Parsed resumes with their analysis score and feature vectors, persisted in
+# SQLite next to an inverted index from canonical skill to resume. Each
+# process mirrors the store in memory (a CSR matrix of feature vectors and a
+# postings array per skill) and catches up on rows added by other workers
+# before every query, so ranking only touches the resumes that share at
+# least one skill with the job description.
+class ResumeStore:
+    def __init__(self, path, analyzer):
+        self.path = path
+        self.analyzer = analyzer
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._reset(analyzer)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS resumes (
+                    id INTEGER PRIMARY KEY,
+                    resume_key TEXT NOT NULL UNIQUE,
+                    name TEXT,
+                    data TEXT NOT NULL,
+                    skills TEXT NOT NULL,
+                    overall_score REAL,
+                    model_version TEXT,
+                    feature_indices BLOB,
+                    feature_data BLOB,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS resume_skills (
+                    skill TEXT NOT NULL,
+                    resume_id INTEGER NOT NULL,
+                    PRIMARY KEY (skill, resume_id)
+                ) WITHOUT ROWID
+            """)
+
+    def _connection(self):
+        # Connections must not cross a fork, so keep one per process and thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _reset(self, analyzer):
+        # analyzer is the one the loaded vectors are computed with. The app
+        # can swap self.analyzer for a new model version at any time.
+        self._analyzer = analyzer
+        self._last_id = 0
+        self._model_version = analyzer.model_version
+        self._ids = np.empty(0, dtype=np.int64)
+        self._keys = []
+        self._names = []
+        self._skills = []
+        self._scores = np.empty(0)
+        # Feature vectors transposed (terms x resumes) so scoring a job only
+        # reads the rows of its terms, plus blocks of rows added since the
+        # last merge, kept separate so a refresh never rebuilds the matrix
+        self._vectors_t = None
+        self._tail = []
+        self._postings = {}
+
+    def __len__(self):
+        # Resumes loaded into this process as of the last refresh
+        return len(self._keys)
+
+    def add(self, resume_key, name, resume_data, analysis):
+        return self.add_many([(resume_key, name, resume_data, analysis)])
+
+    def add_many(self, records):
+        # records: (resume_key, name, resume_data, analysis) tuples. Resumes
+        # already stored under the same key are left as they are.
+        if not records:
+            return 0
+        analyzer = self.analyzer
+        vectors = analyzer.feature_vectors([record[2] for record in records])
+        now = time.time()
+        added = 0
+        with self._connection() as conn:
+            for row, (resume_key, name, resume_data, analysis) in enumerate(records):
+                skills = resume_skills(resume_data)
+                cursor = conn.execute("""
+                    INSERT OR IGNORE INTO resumes (resume_key, name, data, skills, overall_score,
+                        model_version, feature_indices, feature_data, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (resume_key, name, json.dumps(resume_data), json.dumps(skills),
+                      analysis['overall_score'] if analysis else None, analyzer.model_version,
+                      *_pack(vectors[row]), now))
+                if cursor.rowcount:
+                    conn.executemany("INSERT OR IGNORE INTO resume_skills (skill, resume_id) VALUES (?, ?)",
+                                     [(skill, cursor.lastrowid) for skill in skills])
+                    added += 1
+        return added
+
+    def refresh(self):
+        # Load rows added since the last refresh, by this or any other process.
+        # Vectors computed under another model version are recomputed from the
+        # stored fields, since the TF-IDF vocabularies differ between models.
+        with self._lock:
+            analyzer = self.analyzer
+            if self._model_version != analyzer.model_version:
+                self._reset(analyzer)
+            conn = self._connection()
+            rows = conn.execute("""
+                SELECT id, resume_key, name, data, skills, overall_score, model_version,
+                    feature_indices, feature_data
+                FROM resumes WHERE id > ? ORDER BY id
+            """, (self._last_id,)).fetchall()
+            if not rows:
+                return
+
+            width = analyzer.feature_vectors([{}]).shape[1]
+            stale = [i for i, row in enumerate(rows) if row[6] != analyzer.model_version]
+            fresh = {}
+            if stale:
+                logger.info("Recomputing feature vectors of %d stored resumes...", len(stale))
+                vectors = analyzer.feature_vectors([json.loads(rows[i][3]) for i in stale])
+                with conn:
+                    for row, i in enumerate(stale):
+                        fresh[i] = vectors[row]
+                        conn.execute("""
+                            UPDATE resumes SET model_version = ?, feature_indices = ?, feature_data = ?
+                            WHERE id = ?
+                        """, (analyzer.model_version, *_pack(vectors[row]), rows[i][0]))
+
+            indptr, indices, data = [0], [], []
+            for i, row in enumerate(rows):
+                if i in fresh:
+                    row_indices, row_data = fresh[i].indices, fresh[i].data
+                else:
+                    row_indices = np.frombuffer(row[7], dtype=np.int32)
+                    row_data = np.frombuffer(row[8], dtype=np.float32)
+                indices.append(row_indices)
+                data.append(row_data)
+                indptr.append(indptr[-1] + len(row_indices))
+            block = sparse.csr_matrix(
+                (np.concatenate(data), np.concatenate(indices), np.array(indptr)),
+                shape=(len(rows), width), dtype=np.float32
+            )
+            tail = self._tail + [block]
+            tail_rows = sum(block.shape[0] for block in tail)
+            merged_rows = 0 if self._vectors_t is None else self._vectors_t.shape[1]
+            if tail_rows > max(1024, merged_rows // 8):
+                blocks = ([] if self._vectors_t is None else [self._vectors_t]) + [block.T for block in tail]
+                self._vectors_t = sparse.hstack(blocks).tocsr()
+                tail = []
+            self._tail = tail
+
+            start = len(self._keys)
+            new_postings = {}
+            for position, row in enumerate(rows, start):
+                skills = tuple(json.loads(row[4]))
+                self._skills.append(skills)
+                for skill in skills:
+                    new_postings.setdefault(skill, []).append(position)
+            # A new dict rather than an update, so a query holding the old one
+            # never sees postings for resumes it does not count
+            postings = dict(self._postings)
+            for skill, positions in new_postings.items():
+                postings[skill] = np.concatenate([
+                    postings.get(skill, np.empty(0, dtype=np.int64)), np.array(positions, dtype=np.int64)
+                ])
+            self._postings = postings
+
+            self._ids = np.concatenate([self._ids, np.array([row[0] for row in rows], dtype=np.int64)])
+            self._keys.extend(row[1] for row in rows)
+            self._names.extend(row[2] for row in rows)
+            self._scores = np.concatenate([
+                self._scores, np.array([np.nan if row[5] is None else row[5] for row in rows])
+            ])
+            self._last_id = rows[-1][0]
+
+    def swap(self, analyzer):
+        # Switch to a new model version. The stored resumes are vectorized
+        # again in a staged copy of the mirror, outside the lock, and the copy
+        # replaces the mirror in one go: queries meanwhile keep ranking with
+        # the previous version, and the first one after the swap has nothing
+        # left to recompute.
+        staged = ResumeStore(self.path, analyzer)
+        staged.refresh()
+        with self._lock:
+            self.analyzer = analyzer
+            for name in ('_analyzer', '_last_id', '_model_version', '_ids', '_keys', '_names', '_skills',
+                         '_scores', '_vectors_t', '_tail', '_postings'):
+                setattr(self, name, getattr(staged, name))
+
+    def rank(self, job_description, top_n=10, prune=True):
+        self.refresh()
+        job_skills = get_skill_index().find(job_description)
+        # A consistent view of the mirror as of this refresh. Another thread's
+        # refresh only appends to the lists and replaces everything else, so
+        # nothing read below changes under the query.
+        with self._lock:
+            analyzer, vectors_t, tail, postings = self._analyzer, self._vectors_t, self._tail, self._postings
+            ids, keys, names, stored_skills, stored_scores = (self._ids, self._keys, self._names,
+                                                              self._skills, self._scores)
+            count = len(keys)
+        if not count:
+            return [], 0
+
+        # The posting counts are how many of the job's skills each resume has.
+        # Pruning keeps only the resumes sharing at least one of them.
+        hits = [postings[skill] for skill in job_skills if skill in postings]
+        matched = np.bincount(np.concatenate(hits), minlength=count) if hits else np.zeros(count, dtype=np.int64)
+        candidates = np.flatnonzero(matched) if prune and job_skills else np.arange(count)
+        matched = matched[candidates]
+        if not len(candidates):
+            return [], 0
+
+        job_vector = analyzer.feature_vectors([{
+            'skills': [job_description], 'experience': job_description, 'education': job_description
+        }]).astype(np.float32)
+        # Only the job's term rows of the merged matrix are read, and only the
+        # candidates' rows of the tail blocks that hold any. Slicing the
+        # candidate columns out of the term rows costs more than the product.
+        similarity = np.zeros(len(candidates), dtype=np.float32)
+        start = 0 if vectors_t is None else vectors_t.shape[1]
+        merged = np.searchsorted(candidates, start)
+        if merged:
+            terms = vectors_t[job_vector.indices]
+            similarity[:merged] = (terms.T @ job_vector.data)[candidates[:merged]]
+        for block in tail:
+            stop = start + block.shape[0]
+            low, high = np.searchsorted(candidates, [start, stop])
+            if high > low:
+                similarity[low:high] = (block[candidates[low:high] - start] @ job_vector.T).toarray().ravel()
+            start = stop
+        similarity *= 100
+        match_percentage = matched / len(job_skills) * 100 if job_skills else np.zeros(len(candidates))
+        scores = RANK_SKILL_WEIGHT * match_percentage + (1 - RANK_SKILL_WEIGHT) * similarity
+
+        # Best first; ties keep the order the resumes were stored in
+        top_n = min(top_n, len(candidates))
+        best = np.argpartition(-scores, top_n - 1)[:top_n]
+        best = best[np.lexsort((candidates[best], -scores[best]))]
+
+        job_skill_set = set(job_skills)
+        ranked = []
+        for i in best:
+            position = candidates[i]
+            ranked.append({
+                'resume_id': int(ids[position]),
+                'resume_key': keys[position],
+                'name': names[position],
+                'rank_score': round(float(scores[i]), 2),
+                'match_percentage': round(float(match_percentage[i]), 2),
+                'similarity': round(float(similarity[i]), 2),
+                'matched_skills': [skill for skill in stored_skills[position] if skill in job_skill_set],
+                'overall_score': None if np.isnan(stored_scores[position]) else round(float(stored_scores[position]), 2)
+            })
+        return ranked, len(candidates)
+
+def create_store(analyzer, path=RESUME_STORE_PATH):
+    return ResumeStore(path, analyzer) if path else None
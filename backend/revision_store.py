@@ -0,0 +1,78 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from resume_analyzer import FEATURE_COLUMNS
+
+# Latest analysis of every resume_id, in a SQLite file shared by the web
+# workers and the job queue workers on the host, apart from the result cache
+# so revisions are neither per process nor evicted by analyses
+REVISION_STORE_PATH = os.environ.get('REVISION_STORE_PATH', 'cache/revisions.sqlite3')
+# Resumes not uploaded again for this many seconds are forgotten
+REVISION_TTL = float(os.environ.get('REVISION_TTL', 90 * 24 * 60 * 60))
+# Forgotten resumes are deleted every so many recorded revisions
+REVISION_PURGE_EVERY = 1000
+
+class RevisionStore:
+    def __init__(self, path=REVISION_STORE_PATH, ttl=REVISION_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._recorded = 0
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS revisions (
+                    resume_id TEXT PRIMARY KEY,
+                    sections TEXT NOT NULL,
+                    overall_score REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS revisions_updated ON revisions (updated_at)")
+
+    def _connection(self):
+        # Connections must not cross a fork, so keep one per process and thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def record(self, resume_id, sections, overall_score):
+        # Compare an analysis with the previous one stored under the same
+        # resume_id, then store it in its place. The write lock is taken up
+        # front so two workers recording the same resume_id see each other.
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            previous = conn.execute(
+                "SELECT sections, overall_score FROM revisions WHERE resume_id = ? AND updated_at >= ?",
+                (resume_id, now - self.ttl)
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO revisions (resume_id, sections, overall_score, updated_at) VALUES (?, ?, ?, ?)",
+                (resume_id, json.dumps(sections), overall_score, now)
+            )
+        with self._lock:
+            self._recorded += 1
+            purge = self._recorded % REVISION_PURGE_EVERY == 0
+        if purge:
+            with conn:
+                conn.execute("DELETE FROM revisions WHERE updated_at < ?", (now - self.ttl,))
+
+        if previous is None:
+            return {'changed_sections': list(FEATURE_COLUMNS), 'previous_score': None, 'score_change': None}
+        previous_sections, previous_score = json.loads(previous[0]), previous[1]
+        return {
+            'changed_sections': [name for name in FEATURE_COLUMNS if sections[name] != previous_sections.get(name)],
+            'previous_score': previous_score,
+            'score_change': round(overall_score - previous_score, 2)
+        }
@@ -0,0 +1,77 @@
+import re
+
+# Keywords that open each resume section, in priority order: a header line
+# mentioning keywords of several sections belongs to the first one
+SECTION_KEYWORDS = {
+    'skills': ['skills', 'technical skills', 'expertise', 'proficiencies'],
+    'experience': ['experience', 'work history', 'employment', 'professional experience'],
+    'education': ['education', 'academic background', 'qualifications']
+}
+
+_HEADER_KEYWORDS = [keyword for keywords in SECTION_KEYWORDS.values() for keyword in keywords]
+_SKILL_SEPARATORS = re.compile(r'[,;]')
+
+def classify_header(line):
+    for section, keywords in SECTION_KEYWORDS.items():
+        if any(keyword in line for keyword in keywords):
+            return section
+    return None
+
+def find_sections(text):
+    text = text.lower()
+    return {section for section, keywords in SECTION_KEYWORDS.items() if any(k in text for k in keywords)}
+
+def _header_lines(text):
+    # Locate header lines with one str.find sweep per keyword over the whole
+    # text, jumping to the end of the line after each hit. Measured faster
+    # than a compiled regex alternation, which CPython tries at every offset.
+    headers = {}
+    for keyword in _HEADER_KEYWORDS:
+        index = text.find(keyword)
+        while index != -1:
+            line_start = text.rfind('\n', 0, index) + 1
+            line_end = headers.get(line_start)
+            if line_end is None:
+                line_end = text.find('\n', index)
+                if line_end == -1:
+                    line_end = len(text)
+                headers[line_start] = line_end
+            index = text.find(keyword, line_end)
+    return sorted(headers.items())
+
+def parse_sections(text):
+    # Lowercase once, then walk from header line to header line, slicing the
+    # section bodies out of the text instead of looking at every line
+    text = text.lower()
+    bodies = {section: [] for section in SECTION_KEYWORDS}
+    current_section = None
+    body_start = 0
+    for line_start, line_end in _header_lines(text):
+        if current_section:
+            bodies[current_section].append(text[body_start:line_start])
+        current_section = classify_header(text[line_start:line_end])
+        body_start = line_end
+    if current_section:
+        bodies[current_section].append(text[body_start:])
+
+    def lines(section):
+        return [line for line in (raw.strip() for body in bodies[section] for raw in body.split('\n')) if line]
+
+    skills = [
+        skill for skill in (part.strip() for line in lines('skills') for part in _SKILL_SEPARATORS.split(line))
+        if skill
+    ]
+    return {
+        'skills': skills,
+        'experience': ' '.join(lines('experience')),
+        'education': ' '.join(lines('education'))
+    }
+
+def is_resume_data(item):
+    # Parsed resume data as parse_sections returns it: a list of skills
+    # and experience and education texts, each of them optional
+    return (isinstance(item, dict)
+            and isinstance(item.get('skills', []), list)
+            and all(isinstance(skill, str) for skill in item.get('skills', []))
+            and isinstance(item.get('experience', ''), str)
+            and isinstance(item.get('education', ''), str))
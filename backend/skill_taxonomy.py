@@ -0,0 +1,127 @@
+import json
+import os
+import re
+import threading
+
+DEFAULT_TAXONOMY_PATH = os.environ.get(
+    'SKILL_TAXONOMY_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'skills.jsonl')
+)
+
+# Words may carry the punctuation found in skill names (c++, c#, node.js,
+# ci/cd, scikit-learn, .net, r&d) but not trailing sentence punctuation
+_TOKEN_PATTERN = re.compile(r'\.?[\w+#&]+(?:[./\-][\w+#&]+)*')
+
+def tokenize(text):
+    return _TOKEN_PATTERN.findall(text.lower())
+
+# Aho-Corasick automaton whose alphabet is words rather than characters, so
+# every match is a whole-word match ('r' no longer matches inside 'developer')
+# and a text is matched against all skills and synonyms in a single pass.
+class SkillIndex:
+    def __init__(self, entries):
+        self.skills = []
+        self._skill_ids = {}
+        self._phrases = {}
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+
+        for canonical, synonyms in entries:
+            skill_id = self._skill_ids.get(canonical.lower())
+            if skill_id is None:
+                skill_id = len(self.skills)
+                self.skills.append(canonical)
+                self._skill_ids[canonical.lower()] = skill_id
+            for name in (canonical, *synonyms):
+                tokens = tuple(tokenize(name))
+                if tokens:
+                    self._phrases.setdefault(tokens, skill_id)
+                    self._add(tokens, skill_id)
+        self._link()
+
+    def _add(self, tokens, skill_id):
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        if skill_id not in self._output[state]:
+            self._output[state] += (skill_id,)
+
+    def _link(self):
+        # Breadth-first pass setting each state's failure link to the longest
+        # proper suffix that is also a prefix, and inheriting its matches
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(token, 0)
+                self._output[next_state] += tuple(
+                    skill_id for skill_id in self._output[self._fail[next_state]]
+                    if skill_id not in self._output[next_state]
+                )
+
+    def find(self, text):
+        # Canonical names of every skill mentioned in text, in order of first mention
+        goto, fail, output = self._goto, self._fail, self._output
+        found = {}
+        state = 0
+        for token in tokenize(text):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for skill_id in output[state]:
+                found.setdefault(skill_id, None)
+        return [self.skills[skill_id] for skill_id in found]
+
+    def canonical(self, name):
+        # Canonical name for a skill or synonym given on its own, or None
+        skill_id = self._phrases.get(tuple(tokenize(name)))
+        return None if skill_id is None else self.skills[skill_id]
+
+    def normalize(self, names):
+        # Map user-entered skills onto canonical names, keeping unknown ones as given
+        normalized = []
+        for name in names:
+            canonical = self.canonical(name)
+            if canonical is None:
+                matches = self.find(name)
+                normalized.extend(matches or [name])
+            else:
+                normalized.append(canonical)
+        return list(dict.fromkeys(normalized))
+
+    def __len__(self):
+        return len(self.skills)
+
+def load_taxonomy(path=DEFAULT_TAXONOMY_PATH):
+    # One JSON object per line: {"skill": "Kubernetes", "synonyms": ["k8s"]}
+    entries = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                entries.append((record['skill'], record.get('synonyms', [])))
+    return SkillIndex(entries)
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_skill_index():
+    # Built once per process; create_app builds it before gunicorn forks
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = load_taxonomy()
+    return _index
@@ -0,0 +1,47 @@
+import os
+
+import numpy as np
+from sklearn.linear_model import Ridge
+from sklearn.model_selection import KFold, cross_val_predict
+
+from feedback import FEEDBACK_CUTOFFS
+
+# Linear model distilled from the forest for the fast scoring tier. It is fit
+# on the unscaled section features against the forest's predictions for
+# resumes it was not trained on, so scoring a resume is one sparse dot product.
+
+SURROGATE_ALPHA = float(os.environ.get('SURROGATE_ALPHA', 1.0))
+# Share of the surrogate's held-out errors the escalation margin covers
+SURROGATE_MARGIN_QUANTILE = float(os.environ.get('SURROGATE_MARGIN_QUANTILE', 0.95))
+# Below this many resumes the surrogate's error cannot be measured, and no
+# surrogate is fitted
+SURROGATE_MIN_ROWS = 20
+
+def fit_surrogate(features, targets, alpha=SURROGATE_ALPHA, quantile=SURROGATE_MARGIN_QUANTILE):
+    # Returns None when there are too few resumes to distill from
+    targets = np.asarray(targets, dtype=np.float64)
+    if len(targets) < SURROGATE_MIN_ROWS:
+        return None
+    model = Ridge(alpha=alpha)
+    # Out-of-fold errors, so the margin reflects resumes the surrogate was not fit on
+    predicted = cross_val_predict(model, features, targets, cv=KFold(5, shuffle=True, random_state=0))
+    margin = float(np.quantile(np.abs(predicted - targets), quantile))
+    model.fit(features, targets)
+    return {
+        'coef': np.asarray(model.coef_, dtype=np.float64),
+        'intercept': float(model.intercept_),
+        # Scores are kept within the range the forest was seen to predict
+        'low': float(targets.min()),
+        'high': float(targets.max()),
+        'margin': margin,
+        'alpha': alpha,
+        'rows': len(targets)
+    }
+
+def surrogate_scores(surrogate, features):
+    return np.clip(features @ surrogate['coef'] + surrogate['intercept'], surrogate['low'], surrogate['high'])
+
+def near_cutoff(scores, margin, cutoffs=FEEDBACK_CUTOFFS):
+    # Scores close enough to a feedback cut-off that the forest could land on
+    # the other side of it
+    return (np.abs(np.asarray(scores)[:, None] - np.array(cutoffs)) < margin).any(axis=1)
@@ -0,0 +1,286 @@
+import bisect
+import fcntl
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+
+# Logging settings, overridable from the environment. LOG_LEVEL=OFF turns
+# logging off entirely; LOG_FORMAT=text gives plain lines instead of JSON.
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')
+
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+# With several worker processes (e.g. gunicorn), each process keeps its
+# metrics in a file in this directory and /metrics adds them all up, with
+# the processes that have exited folded into one file. Counters carry over
+# restarts; empty the directory to reset them. Without it every process
+# only reports its own numbers.
+METRICS_DIR = os.environ.get('METRICS_DIR')
+# Totals of the processes that have exited, in METRICS_DIR
+EXITED_METRICS_FILE = 'metrics-exited.npy'
+
+logger = logging.getLogger(__name__)
+
+# Attributes every LogRecord has; anything else was passed through extra=
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_FIELDS)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+def configure_logging(level=LOG_LEVEL, log_format=LOG_FORMAT):
+    if level == 'OFF':
+        logging.disable(logging.CRITICAL)
+        return
+    handler = logging.StreamHandler()
+    if log_format == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level)
+
+# Buckets in seconds, from sub-millisecond stages to slow PDF parses
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _label_text(names, values, extra=''):
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, registry, name, help_text, label_names, label_values, offset):
+        self.registry = registry
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.label_values = label_values
+        self.offset = offset
+        self._slots = {values: offset + index for index, values in enumerate(label_values)}
+        self.size = len(label_values)
+
+    def inc(self, *labels, amount=1):
+        if METRICS_ENABLED:
+            self.registry.add(self._slots[labels], amount)
+
+    def render(self, values):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {self.kind}']
+        for labels, slot in self._slots.items():
+            lines.append(f'{self.name}{_label_text(self.label_names, labels)} {_format_value(values[slot])}')
+        return lines
+
+class Histogram(Counter):
+    kind = 'histogram'
+
+    def __init__(self, registry, name, help_text, label_names, label_values, offset, buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, help_text, label_names, label_values, offset)
+        self.buckets = buckets
+        # Per label set: one count per bucket, one for +Inf, then the sum
+        self.width = len(buckets) + 2
+        self._slots = {values: offset + index * self.width for index, values in enumerate(label_values)}
+        self.size = len(label_values) * self.width
+
+    def observe(self, *labels, value):
+        if METRICS_ENABLED:
+            start = self._slots[labels]
+            self.registry.observe(start + bisect.bisect_left(self.buckets, value), start + self.width - 1, value)
+
+    def render(self, values):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {self.kind}']
+        for labels, start in self._slots.items():
+            cumulative = np.cumsum(values[start:start + self.width - 1])
+            for bound, count in zip((*self.buckets, '+Inf'), cumulative):
+                le = f'le="{bound}"'
+                lines.append(f'{self.name}_bucket{_label_text(self.label_names, labels, le)} {_format_value(count)}')
+            label_text = _label_text(self.label_names, labels)
+            lines.append(f'{self.name}_sum{label_text} {_format_value(values[start + self.width - 1])}')
+            lines.append(f'{self.name}_count{label_text} {_format_value(cumulative[-1])}')
+        return lines
+
+# Every metric and label combination is declared up front, so a process's
+# values fit in one flat array. With METRICS_DIR the array is a memory-mapped
+# file per process; updates are plain array writes, no I/O on the hot path.
+# Each process holds a lock on its file until it exits, which is how the
+# others tell the files of exited processes apart.
+class Registry:
+    def __init__(self, directory=METRICS_DIR):
+        self.directory = directory
+        self.metrics = []
+        self.size = 0
+        self._values = None
+        self._pid = None
+        self._path = None
+        self._owner = None
+        self._lock = threading.Lock()
+
+    def _declare(self, metric_class, name, help_text, labels, **kwargs):
+        # labels maps each label name to its possible values
+        label_names = tuple(labels)
+        label_values = list(itertools.product(*labels.values()))
+        metric = metric_class(self, name, help_text, label_names, label_values, self.size, **kwargs)
+        self.metrics.append(metric)
+        self.size += metric.size
+        return metric
+
+    def counter(self, name, help_text, **labels):
+        return self._declare(Counter, name, help_text, labels)
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS, **labels):
+        return self._declare(Histogram, name, help_text, labels, buckets=buckets)
+
+    def _local_values(self):
+        # Created on first use, and again after a fork so workers never share slots
+        if self._pid != os.getpid():
+            if self.directory:
+                os.makedirs(self.directory, exist_ok=True)
+                # The pid alone is not unique: in a container the workers of
+                # every restart get the same small pids. The file is locked
+                # before it is renamed into place, so it is never taken for
+                # the file of an exited process.
+                path = os.path.join(self.directory, f'metrics-{os.getpid()}-{uuid.uuid4().hex}.npy')
+                self._values = np.lib.format.open_memmap(f'{path}.tmp', mode='w+', dtype=np.float64,
+                                                         shape=(self.size,))
+                self._owner = open(f'{path}.tmp', 'rb')
+                fcntl.flock(self._owner, fcntl.LOCK_EX)
+                os.replace(f'{path}.tmp', path)
+                self._path = path
+            else:
+                self._values = np.zeros(self.size)
+            self._pid = os.getpid()
+        return self._values
+
+    def add(self, slot, amount):
+        with self._lock:
+            self._local_values()[slot] += amount
+
+    def observe(self, bucket_slot, sum_slot, value):
+        with self._lock:
+            values = self._local_values()
+            values[bucket_slot] += 1
+            values[sum_slot] += value
+
+    def totals(self):
+        # Values of every process sharing the directory, including exited
+        # ones so counters never go backwards
+        with self._lock:
+            local = self._local_values().copy()
+        if not self.directory:
+            return local
+        # One process at a time folds and sums, so none sees a file both
+        # folded and still in place, or neither
+        with open(os.path.join(self.directory, 'metrics.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self._fold_exited()
+            totals = np.zeros(self.size)
+            for name in os.listdir(self.directory):
+                if name.startswith('metrics-') and name.endswith('.npy'):
+                    values = np.load(os.path.join(self.directory, name), mmap_mode='r')
+                    if values.shape == totals.shape:
+                        totals += values
+        return totals
+
+    def _fold_exited(self):
+        # Add the files of processes that have exited to the exited totals
+        # and delete them, so the directory does not grow with every restart
+        exited_path = os.path.join(self.directory, EXITED_METRICS_FILE)
+        exited = None
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not name.startswith('metrics-') or not name.endswith('.npy') or name == EXITED_METRICS_FILE \
+                    or path == self._path:
+                continue
+            with open(path, 'rb') as f:
+                try:
+                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue
+                values = np.load(path)
+            if values.shape == (self.size,):
+                if exited is None:
+                    exited = self._exited_values(exited_path)
+                exited += values
+                exited.flush()
+            else:
+                logger.warning("Dropping metrics file %s written with another set of metrics", name)
+            os.remove(path)
+
+    def _exited_values(self, path):
+        if os.path.exists(path):
+            values = np.lib.format.open_memmap(path, mode='r+')
+            if values.shape == (self.size,):
+                return values
+            logger.warning("Resetting %s, written with another set of metrics", path)
+        return np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=(self.size,))
+
+    def render(self):
+        values = self.totals()
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render(values))
+        return '\n'.join(lines) + '\n'
+
+registry = Registry()
+
+STAGES = ('upload_read', 'pdf_parse', 'section_extraction', 'vectorization', 'surrogate', 'prediction',
+          'feedback')
+ENDPOINTS = ('analyze_resume', 'analyze_resumes', 'get_career_recommendations', 'get_job_matches',
+             'rank_candidates', 'get_job', 'other')
+STATUS_CLASSES = ('2xx', '3xx', '4xx', '5xx')
+
+stage_seconds = registry.histogram(
+    'resume_analyzer_stage_seconds', 'Time spent in each stage of resume analysis.', stage=STAGES
+)
+request_seconds = registry.histogram(
+    'resume_analyzer_request_seconds', 'Time spent handling API requests.', endpoint=ENDPOINTS
+)
+requests_total = registry.counter(
+    'resume_analyzer_requests_total', 'API requests handled, by status class.',
+    endpoint=ENDPOINTS, status=STATUS_CLASSES
+)
+rejections_total = registry.counter(
+    'resume_analyzer_rejections_total', 'Requests turned away because a pool or queue was full.',
+    reason=('extraction_busy', 'queue_full', 'too_many_requests')
+)
+model_reloads_total = registry.counter(
+    'resume_analyzer_model_reloads_total', 'Model versions swapped in by the registry watcher.',
+    outcome=('success', 'failure')
+)
+scores_total = registry.counter(
+    'resume_analyzer_scores_total', 'Resumes scored, by the tier that produced the score.',
+    tier=('surrogate', 'forest')
+)
+
+@contextmanager
+def span(stage):
+    # Time a block of work into the per-stage histogram
+    if not METRICS_ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_seconds.observe(stage, value=time.perf_counter() - start)
@@ -0,0 +1,255 @@
+import argparse
+import csv
+import json
+import logging
+import math
+import os
+import resource
+import shutil
+import time
+
+import numpy as np
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import RandomizedSearchCV
+from sklearn.pipeline import Pipeline
+
+from model_registry import ModelRegistry
+from resume_analyzer import DEFAULT_MODEL_PATH, FEATURE_COLUMNS, ResumeAnalyzer, resume_columns
+from telemetry import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# Training settings, overridable from the environment
+TRAIN_CHUNK_SIZE = int(os.environ.get('TRAIN_CHUNK_SIZE', 20000))
+# Hashed features per section. Forest fitting time grows with the number of
+# distinct columns, and at this width collisions cost no measurable accuracy.
+TRAIN_N_FEATURES = int(os.environ.get('TRAIN_N_FEATURES', 2 ** 12))
+TRAIN_N_ESTIMATORS = int(os.environ.get('TRAIN_N_ESTIMATORS', 100))
+# The hyperparameter search runs on a sample of the corpus kept in memory
+TRAIN_SEARCH_ROWS = int(os.environ.get('TRAIN_SEARCH_ROWS', 5000))
+TRAIN_SEARCH_ITERATIONS = int(os.environ.get('TRAIN_SEARCH_ITERATIONS', 8))
+# Every n-th row is held out for the validation metrics, up to a cap
+TRAIN_HOLDOUT_EVERY = int(os.environ.get('TRAIN_HOLDOUT_EVERY', 10))
+TRAIN_MAX_HOLDOUT_ROWS = int(os.environ.get('TRAIN_MAX_HOLDOUT_ROWS', 50000))
+
+SEARCH_SPACE = {
+    'max_depth': [None, 16, 32],
+    'min_samples_leaf': [1, 2, 5, 10],
+    'max_features': [1.0, 0.3, 'sqrt']
+}
+
+def _resume(record):
+    # Skills are a list in JSONL and a comma or semicolon separated string in CSV
+    skills = record.get('skills') or []
+    if isinstance(skills, str):
+        skills = [skill.strip() for skill in skills.replace(';', ',').split(',') if skill.strip()]
+    return {
+        'skills': skills,
+        'experience': record.get('experience') or '',
+        'education': record.get('education') or '',
+        'score': float(record['score'])
+    }
+
+def read_corpus(path, chunk_size=TRAIN_CHUNK_SIZE):
+    # Labelled resumes from a CSV or JSONL file, chunk_size at a time
+    with open(path, newline='', encoding='utf-8') as f:
+        records = csv.DictReader(f) if path.lower().endswith('.csv') else (json.loads(line) for line in f if line.strip())
+        chunk = []
+        for record in records:
+            chunk.append(_resume(record))
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+def build_streaming_pipeline(n_features=TRAIN_N_FEATURES, **model_params):
+    # HashingVectorizer needs no vocabulary, so the features are known without
+    # holding the corpus; the IDF weights are counted while streaming. Trees
+    # split on thresholds, so per-column scaling would change nothing and the
+    # scaler step is left out.
+    features = ColumnTransformer([
+        (name, Pipeline([
+            ('hashing', HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None)),
+            ('tfidf', TfidfTransformer())
+        ]), index)
+        for index, name in enumerate(FEATURE_COLUMNS)
+    ], sparse_threshold=1.0)
+    model = RandomForestRegressor(random_state=42, **model_params)
+    return Pipeline([('features', features), ('scaler', 'passthrough'), ('model', model)])
+
+def _count_documents(path, n_features, chunk_size, search_rows, holdout_every):
+    # Pass 1: document frequencies per section, row counts and a reservoir
+    # sample of the training rows for the hyperparameter search
+    hasher = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None)
+    document_counts = np.zeros((len(FEATURE_COLUMNS), n_features), dtype=np.int64)
+    rng = np.random.default_rng(0)
+    sample = []
+    rows = train_rows = 0
+    for chunk in read_corpus(path, chunk_size):
+        X = resume_columns(chunk)
+        for index in range(len(FEATURE_COLUMNS)):
+            counts = hasher.transform(X[:, index])
+            document_counts[index] += np.bincount(counts.indices, minlength=n_features)
+        for resume in chunk:
+            if not (holdout_every and rows % holdout_every == 0):
+                if len(sample) < search_rows:
+                    sample.append(resume)
+                else:
+                    slot = rng.integers(train_rows + 1)
+                    if slot < search_rows:
+                        sample[slot] = resume
+                train_rows += 1
+            rows += 1
+    return document_counts, rows, train_rows, sample
+
+def _search(features, sample, iterations):
+    # Cross-validated search over the forest settings on every core. Each
+    # candidate forest is small and single-threaded so the candidates run in
+    # parallel, and the fitted features are computed once, not per fold.
+    search = RandomizedSearchCV(
+        RandomForestRegressor(n_estimators=10, random_state=42, n_jobs=1), SEARCH_SPACE, n_iter=iterations,
+        cv=3, scoring='r2', n_jobs=-1, random_state=0
+    )
+    search.fit(features.transform(resume_columns(sample)), [resume['score'] for resume in sample])
+    return search.best_params_, float(search.best_score_)
+
+def _training_chunks(path, rows_per_chunk, chunk_size, holdout_every, holdout, max_holdout_rows):
+    # Pass 2 input: training rows regrouped into chunks of rows_per_chunk,
+    # with every holdout_every-th row set aside in holdout instead
+    buffer = []
+    row = 0
+    for chunk in read_corpus(path, chunk_size):
+        for resume in chunk:
+            if holdout_every and row % holdout_every == 0:
+                if len(holdout) < max_holdout_rows:
+                    holdout.append(resume)
+            else:
+                buffer.append(resume)
+                if len(buffer) == rows_per_chunk:
+                    yield buffer
+                    buffer = []
+            row += 1
+    if buffer:
+        yield buffer
+
+def train(corpus_path, model_path=DEFAULT_MODEL_PATH, n_features=TRAIN_N_FEATURES,
+          n_estimators=TRAIN_N_ESTIMATORS, chunk_size=TRAIN_CHUNK_SIZE, search_rows=TRAIN_SEARCH_ROWS,
+          search_iterations=TRAIN_SEARCH_ITERATIONS, holdout_every=TRAIN_HOLDOUT_EVERY,
+          max_holdout_rows=TRAIN_MAX_HOLDOUT_ROWS, activate=True):
+    # Train on a labelled corpus without loading it into memory. Writes
+    # <model>-<version>.joblib and <model>-<version>.metrics.json next to
+    # model_path and, with activate, replaces model_path with the new model
+    # and makes it the registry's active version.
+    started = time.perf_counter()
+    logger.info("Counting documents in %s...", corpus_path)
+    document_counts, rows, train_rows, sample = _count_documents(
+        corpus_path, n_features, chunk_size, search_rows, holdout_every
+    )
+    if train_rows < 2:
+        raise ValueError(f'{corpus_path} has too few labelled resumes to train on')
+
+    # Fit the feature step on the sample, then give it the IDF of the whole corpus
+    pipeline = build_streaming_pipeline(n_features)
+    features = pipeline.named_steps['features']
+    features.fit(resume_columns(sample))
+    for index, name in enumerate(FEATURE_COLUMNS):
+        tfidf = features.named_transformers_[name].named_steps['tfidf']
+        tfidf.idf_ = np.log((1 + rows) / (1 + document_counts[index])) + 1
+    del document_counts
+
+    best_params, cv_r2 = {}, None
+    if search_iterations and len(sample) >= 30:
+        logger.info("Searching hyperparameters on %d resumes...", len(sample))
+        best_params, cv_r2 = _search(features, sample, search_iterations)
+        logger.info("Best parameters %s, cross-validated R2 %.3f", best_params, cv_r2)
+    del sample
+
+    # Pass 2: grow the forest chunk by chunk with warm_start. Each chunk adds
+    # its share of the trees, fitted on that chunk only, so memory is bounded
+    # by the chunk size and every training row is used by some trees.
+    n_chunks = math.ceil(train_rows / chunk_size)
+    rows_per_chunk = math.ceil(train_rows / n_chunks)
+    trees_per_chunk = [len(part) for part in np.array_split(np.arange(max(n_estimators, n_chunks)), n_chunks)]
+    forest = pipeline.named_steps['model']
+    forest.set_params(warm_start=True, n_estimators=0, n_jobs=-1, **best_params)
+
+    holdout = []
+    fitted_rows = 0
+    chunks = _training_chunks(corpus_path, rows_per_chunk, chunk_size, holdout_every, holdout, max_holdout_rows)
+    for number, chunk in enumerate(chunks):
+        forest.n_estimators += trees_per_chunk[number]
+        forest.fit(features.transform(resume_columns(chunk)), [resume['score'] for resume in chunk])
+        fitted_rows += len(chunk)
+        logger.info("Fitted %d trees on %d of %d resumes", forest.n_estimators, fitted_rows, train_rows)
+
+    # Threads help fitting, but only add overhead to single-resume predictions
+    forest.set_params(warm_start=False, n_jobs=None)
+
+    analyzer = ResumeAnalyzer(sparse=True, model_path=model_path)
+    analyzer.pipeline = pipeline
+    analyzer.model_version = time.strftime('%Y%m%d%H%M%S')
+
+    metrics = {
+        'model_version': analyzer.model_version,
+        'corpus': os.path.abspath(corpus_path),
+        'rows': rows,
+        'train_rows': train_rows,
+        'holdout_rows': len(holdout),
+        'n_features': n_features,
+        'n_estimators': forest.n_estimators,
+        'best_params': best_params,
+        'cv_r2': cv_r2,
+        'train_seconds': round(time.perf_counter() - started, 1),
+        # ru_maxrss is in KiB on Linux
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+    if holdout:
+        y_true = np.array([resume['score'] for resume in holdout])
+        y_pred = pipeline.predict(resume_columns(holdout))
+        metrics.update({
+            'holdout_r2': round(float(r2_score(y_true, y_pred)), 4),
+            'holdout_mae': round(float(mean_absolute_error(y_true, y_pred)), 4),
+            'holdout_rmse': round(float(math.sqrt(mean_squared_error(y_true, y_pred))), 4)
+        })
+        # The forest was not trained on the holdout, so its scores there are
+        # what the fast tier's surrogate is distilled from
+        analyzer.fit_surrogate(holdout, y_pred)
+        if analyzer.surrogate is not None:
+            metrics['surrogate_margin'] = round(analyzer.surrogate['margin'], 4)
+
+    stem, extension = os.path.splitext(model_path)
+    analyzer.model_path = f'{stem}-{analyzer.model_version}{extension}'
+    if not analyzer.save_model():
+        raise RuntimeError(f'Could not save the model to {analyzer.model_path}')
+    with open(f'{stem}-{analyzer.model_version}.metrics.json', 'w') as f:
+        json.dump(metrics, f, indent=2)
+    if activate:
+        shutil.copyfile(analyzer.model_path, f'{model_path}.tmp')
+        os.replace(f'{model_path}.tmp', model_path)
+        # Servers watching the registry swap the new version in without a restart
+        ModelRegistry(os.path.dirname(model_path) or '.', os.path.basename(stem)).activate(analyzer.model_version)
+    logger.info("Model %s trained on %d resumes in %.1fs", analyzer.model_version, train_rows,
+                time.perf_counter() - started, extra=metrics)
+    return analyzer.model_path, metrics
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Train the resume scoring model on a labelled corpus')
+    parser.add_argument('corpus', help='CSV or JSONL file with skills, experience, education and score')
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH,
+                        help='path of the active model; the versioned artifact is written next to it')
+    parser.add_argument('--features', type=int, default=TRAIN_N_FEATURES, help='hashed features per section')
+    parser.add_argument('--trees', type=int, default=TRAIN_N_ESTIMATORS)
+    parser.add_argument('--chunk-size', type=int, default=TRAIN_CHUNK_SIZE, help='resumes in memory at once')
+    parser.add_argument('--search-rows', type=int, default=TRAIN_SEARCH_ROWS)
+    parser.add_argument('--search-iterations', type=int, default=TRAIN_SEARCH_ITERATIONS,
+                        help='parameter settings tried, 0 to skip the search')
+    parser.add_argument('--no-activate', action='store_true', help='only write the versioned artifact')
+    args = parser.parse_args()
+    configure_logging()
+    path, metrics = train(args.corpus, args.model, args.features, args.trees, args.chunk_size, args.search_rows,
+                          args.search_iterations, activate=not args.no_activate)
+    print(json.dumps(metrics, indent=2))
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Registered users of the career recommendation app
+USER_STORE_PATH = os.environ.get('USER_STORE_PATH', 'data/users.sqlite3')
+# Users written per executemany call when registering in bulk
+USER_STORE_BATCH_SIZE = int(os.environ.get('USER_STORE_BATCH_SIZE', 1000))
+PASSWORD_HASH_ITERATIONS = int(os.environ.get('PASSWORD_HASH_ITERATIONS', 600000))
+# Threads hashing the passwords of a bulk registration. pbkdf2_hmac releases
+# the GIL, so they run on separate cores, and no more than this many hashes
+# are computed at once per process whatever the number of requests.
+PASSWORD_HASH_THREADS = int(os.environ.get('PASSWORD_HASH_THREADS', os.cpu_count() or 1))
+
+# The statements are module constants so every call passes sqlite3 the same
+# string and reuses the statement it prepared on that connection
+INSERT_USER = "INSERT INTO users (id, email, name, password_hash, data, created_at) VALUES (?, ?, ?, ?, ?, ?)"
+INSERT_SKILL = "INSERT OR IGNORE INTO user_skills (user_id, skill) VALUES (?, ?)"
+SELECT_SKILLS = "SELECT skill FROM user_skills WHERE user_id = ? ORDER BY skill"
+SELECT_SKILLS_BY_EMAIL = """
+    SELECT users.id, user_skills.skill FROM users LEFT JOIN user_skills ON user_skills.user_id = users.id
+    WHERE users.email = ? ORDER BY user_skills.skill
+"""
+SELECT_USER_EXISTS = "SELECT 1 FROM users WHERE id = ?"
+SELECT_USERS_WITH_SKILL = "SELECT user_id FROM user_skills WHERE skill = ? ORDER BY user_id LIMIT ?"
+
+hash_pool = ThreadPoolExecutor(PASSWORD_HASH_THREADS, thread_name_prefix='password-hash')
+
+class DuplicateEmail(Exception):
+    pass
+
+def parse_skills(skills):
+    # Lowercased skills from a list or a comma or semicolon separated string.
+    # Raises ValueError for anything else.
+    if skills is None:
+        return []
+    if isinstance(skills, str):
+        skills = re.split(r'[,;]', skills)
+    elif not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+        raise ValueError('skills must be a string or a list of strings')
+    found = {}
+    for skill in skills:
+        skill = skill.strip().lower()
+        if skill:
+            found.setdefault(skill, None)
+    return list(found)
+
+def normalize_email(email):
+    return email.strip().lower() if isinstance(email, str) and email.strip() else None
+
+def hash_password(password, iterations=PASSWORD_HASH_ITERATIONS):
+    salt = os.urandom(16)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+    return f'pbkdf2_sha256${iterations}${salt.hex()}${digest.hex()}'
+
+# Users in a SQLite file shared by every worker on the host. Each user's
+# skills are rows of user_skills, indexed by user for recommendations and by
+# skill for finding users.
+class UserStore:
+    def __init__(self, path=USER_STORE_PATH, batch_size=USER_STORE_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY,
+                    email TEXT UNIQUE,
+                    name TEXT,
+                    password_hash TEXT,
+                    data TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS user_skills (
+                    user_id INTEGER NOT NULL,
+                    skill TEXT NOT NULL,
+                    PRIMARY KEY (user_id, skill)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS user_skills_skill ON user_skills (skill, user_id)")
+
+    def _connection(self):
+        # Connections must not cross a fork, so keep one per process and thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def add(self, user):
+        return self.add_many([user])[0]
+
+    def add_many(self, users):
+        # Register users in one transaction and return their ids. Raises
+        # DuplicateEmail, adding none of them, if an email is already taken,
+        # and ValueError if a password or the skills are of the wrong type.
+        now = time.time()
+        passwords = [user.get('password') or None for user in users]
+        if not all(password is None or isinstance(password, str) for password in passwords):
+            raise ValueError('password must be a string')
+        skills = [parse_skills(user.get('skills')) for user in users]
+        hashes = list(hash_pool.map(lambda password: password and hash_password(password), passwords))
+        rows = []
+        for user, password_hash, user_skills in zip(users, hashes, skills):
+            # Fields without a column of their own, e.g. age or salary expectation
+            data = {key: value for key, value in user.items()
+                    if key not in ('email', 'name', 'password', 'skills')}
+            rows.append((
+                normalize_email(user.get('email')), user.get('name'), password_hash,
+                json.dumps(data), now, user_skills
+            ))
+
+        conn = self._connection()
+        try:
+            with conn:
+                # Taking the write lock up front makes the ids below safe to
+                # hand out while other workers register users too
+                conn.execute("BEGIN IMMEDIATE")
+                first_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM users").fetchone()[0]
+                for start in range(0, len(rows), self.batch_size):
+                    batch = rows[start:start + self.batch_size]
+                    ids = range(first_id + start, first_id + start + len(batch))
+                    conn.executemany(INSERT_USER, [(user_id, *row[:5]) for user_id, row in zip(ids, batch)])
+                    conn.executemany(INSERT_SKILL, [
+                        (user_id, skill) for user_id, row in zip(ids, batch) for skill in row[5]
+                    ])
+        except sqlite3.IntegrityError as e:
+            raise DuplicateEmail('Email is already registered') from e
+        return list(range(first_id, first_id + len(rows)))
+
+    def skills(self, user_id):
+        # A user's skills, or None if there is no such user
+        conn = self._connection()
+        skills = [row[0] for row in conn.execute(SELECT_SKILLS, (user_id,))]
+        if not skills and conn.execute(SELECT_USER_EXISTS, (user_id,)).fetchone() is None:
+            return None
+        return skills
+
+    def skills_by_email(self, email):
+        rows = self._connection().execute(SELECT_SKILLS_BY_EMAIL, (normalize_email(email),)).fetchall()
+        if not rows:
+            return None
+        return [skill for _, skill in rows if skill is not None]
+
+    def users_with_skill(self, skill, limit=100):
+        rows = self._connection().execute(SELECT_USERS_WITH_SKILL, (skill.strip().lower(), limit))
+        return [row[0] for row in rows]
+
+    def count(self):
+        return self._connection().execute("SELECT COUNT(*) FROM users").fetchone()[0]
@@ -0,0 +1,56 @@
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The backend modules import each other as top-level modules
+BACKEND_DIR = os.path.join(ROOT_DIR, 'backend')
+sys.path.insert(0, BACKEND_DIR)
+
+# Every store, cache and model the apps open on import lives in a scratch
+# directory for the session, never in the working tree. Set before any test
+# module imports them, since they read their settings at import time.
+TEST_DIR = tempfile.mkdtemp(prefix='resume-analyzer-tests-')
+os.environ.update({
+    'USER_STORE_PATH': os.path.join(TEST_DIR, 'users.sqlite3'),
+    'REVISION_STORE_PATH': os.path.join(TEST_DIR, 'revisions.sqlite3'),
+    'RESULT_CACHE_PATH': os.path.join(TEST_DIR, 'results.sqlite3'),
+    'RESUME_MODEL_PATH': os.path.join(TEST_DIR, 'models', 'resume_model.joblib'),
+    'COMPACT_MODEL_PATH': os.path.join(TEST_DIR, 'models', 'resume_model.npz'),
+    'JOB_INDEX_PATH': os.path.join(TEST_DIR, 'job_index'),
+    'LOG_LEVEL': 'OFF'
+})
+
+from benchmarks.common import fitted_analyzer
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope='session')
+def analyzer():
+    # A small model with a surrogate, trained once and saved where app.py loads it
+    return fitted_analyzer(200, model_path=os.environ['RESUME_MODEL_PATH'])
+
+
+@pytest.fixture(scope='session')
+def backend_app(analyzer):
+    # backend/app.py, loaded and warmed up as gunicorn would
+    import app
+    app.create_app()
+    assert app.model_state['ready'], app.model_state['error']
+    return app
+
+
+@pytest.fixture(scope='session')
+def root_app():
+    # The root app.py, under another module name than backend/app.py
+    spec = importlib.util.spec_from_file_location('root_app', os.path.join(ROOT_DIR, 'app.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,145 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pytest
+
+from job_index import JobIndex, build_index
+from job_queue import JobQueue
+from resume_store import ResumeStore
+
+RESUME = {
+    'skills': ['Python', 'SQL', 'Docker'],
+    'experience': 'Backend Engineer with 5 years experience, built scalable services',
+    'education': 'Bachelor in Computer Science'
+}
+RESUME_TEXT = """Skills
+Python, SQL, Docker
+Experience
+Backend Engineer with 5 years experience, built scalable services
+Education
+Bachelor in Computer Science
+"""
+
+
+class AnalysisApiTest(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def load_app(self, backend_app):
+        self.app = backend_app
+        self.client = backend_app.app.test_client()
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def patch(self, name, value):
+        patcher = mock.patch.object(self.app, name, value)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def upload(self, text, **fields):
+        # A fake PDF whose extracted text is already cached, so no extraction
+        # worker is started
+        content = f'%PDF {text}'.encode()
+        self.app.result_cache.set('text', hashlib.sha256(content).hexdigest(), text)
+        return self.client.post('/api/analyze-resume',
+                                data={'file': (io.BytesIO(content), 'resume.pdf'), **fields})
+
+    def test_analyze_resumes_validation(self):
+        for body in ([RESUME], {'resumes': RESUME}, {'resumes': [RESUME, 'text']},
+                     {'resumes': [{'skills': 'Python'}]}, {'resumes': [{'experience': 5}]}, {'resumes': []},
+                     {'resumes': [RESUME], 'mode': 'fastest'}):
+            self.assertEqual(self.client.post('/api/analyze-resumes', json=body).status_code, 400, body)
+
+        response = self.client.post('/api/analyze-resumes', json={'resumes': [RESUME, {}], 'mode': 'fast'})
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()['results']
+        self.assertEqual(len(results), 2)
+        self.assertEqual({result['scored_by'] for result in results}, {'surrogate'})
+
+    def test_too_many_files_rejected_before_extraction(self):
+        self.patch('MAX_BATCH_SIZE', 1)
+        files = [(io.BytesIO(b'%PDF'), 'a.pdf'), (io.BytesIO(b'%PDF'), 'b.pdf')]
+        with mock.patch.object(self.app, 'extract_text_from_pdf') as extract:
+            response = self.client.post('/api/analyze-resumes', data={'files': files})
+        self.assertEqual(response.status_code, 400)
+        extract.assert_not_called()
+
+    def test_revisions_of_a_resume(self):
+        first = self.upload(RESUME_TEXT, resume_id='candidate-1').get_json()
+        self.assertEqual(first['revision']['changed_sections'], ['skills', 'experience', 'education'])
+        self.assertIsNone(first['revision']['previous_score'])
+
+        edited = RESUME_TEXT.replace('Python, SQL, Docker', 'Python, SQL, Docker, Kubernetes')
+        second = self.upload(edited, resume_id='candidate-1').get_json()
+        self.assertEqual(second['revision']['changed_sections'], ['skills'])
+        self.assertEqual(second['revision']['previous_score'], first['overall_score'])
+
+        # A cached analysis still records the revision
+        again = self.upload(edited, resume_id='candidate-1').get_json()
+        self.assertEqual(again['revision']['changed_sections'], [])
+        self.assertEqual(again['overall_score'], second['overall_score'])
+
+    def test_resume_id_and_mode_validation(self):
+        self.assertEqual(self.upload(RESUME_TEXT, resume_id='x' * 201).status_code, 400)
+        self.assertEqual(self.upload(RESUME_TEXT, mode='fastest').status_code, 400)
+        self.assertEqual(self.upload(RESUME_TEXT, mode='fast').get_json()['scored_by'], 'surrogate')
+        self.assertEqual(self.upload(RESUME_TEXT, mode='accurate').get_json()['scored_by'], 'forest')
+
+    def test_async_job_keeps_resume_id_and_mode(self):
+        queue = JobQueue(os.path.join(self.directory, 'queue'))
+        self.patch('job_queue', queue)
+        response = self.upload(RESUME_TEXT, resume_id='candidate-2', mode='fast', **{'async': '1'})
+        self.assertEqual(response.status_code, 202)
+        job_id = response.get_json()['job_id']
+        self.assertEqual(self.client.get(f'/api/jobs/{job_id}').get_json()['status'], 'queued')
+
+        claimed = queue.claim(worker_pid=1)
+        self.assertEqual(claimed[0], job_id)
+        self.assertEqual(claimed[4:], ('candidate-2', 'fast'))
+
+        response = self.upload(RESUME_TEXT, mode='fastest', **{'async': '1'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(queue.depth(), 0)
+
+    def test_rank_candidates(self):
+        store = ResumeStore(os.path.join(self.directory, 'resumes.sqlite3'), self.app.resume_analyzer)
+        store.add_many([
+            ('a', 'Ada', RESUME, {'overall_score': 80}),
+            ('b', 'Bob', {'skills': ['Figma'], 'experience': 'UX Designer', 'education': ''}, {'overall_score': 60})
+        ])
+        self.patch('resume_store', store)
+        for top_n in (0, -1, 'many'):
+            response = self.client.post('/api/rank-candidates', json={'job_description': 'Python', 'top_n': top_n})
+            self.assertEqual(response.status_code, 400, top_n)
+
+        body = self.client.post('/api/rank-candidates', json={'job_description': 'Python and Docker'}).get_json()
+        self.assertEqual([candidate['resume_key'] for candidate in body['candidates']], ['a'])
+        self.assertEqual(body['candidates_scored'], 1)
+        self.assertEqual(body['pool_size'], 2)
+
+    def test_job_matches(self):
+        catalog = os.path.join(self.directory, 'jobs.jsonl')
+        with open(catalog, 'w') as f:
+            f.write(json.dumps({'title': 'Backend Engineer', 'skills': ['Python', 'SQL']}) + '\n\n')
+            f.write(json.dumps({'title': 'UX Designer', 'skills': ['Figma']}) + '\n')
+        index_path = os.path.join(self.directory, 'index')
+        build_index(catalog, index_path, dim=2, n_lists=1)
+        self.patch('job_index', JobIndex(index_path))
+
+        for body in ([RESUME], 'Python', {'skills': 'Python'}, {'skills': [1]}, {'experience': 5},
+                     {'skills': ['Python'], 'top_k': 0}, {'skills': ['Python'], 'top_k': 'all'},
+                     {'skills': ['Python'], 'nprobe': 0}, {}):
+            self.assertEqual(self.client.post('/api/job-matches', json=body).status_code, 400, body)
+
+        matches = self.client.post('/api/job-matches', json={'skills': ['Python', 'SQL'], 'top_k': 1}).get_json()
+        self.assertEqual([match['title'] for match in matches['matches']], ['Backend Engineer'])
+
+
+if __name__ == '__main__':
+    unittest.main()
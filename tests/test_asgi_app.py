@@ -0,0 +1,40 @@
+import unittest
+
+import pytest
+
+pytest.importorskip('starlette')
+pytest.importorskip('httpx')
+from starlette.testclient import TestClient
+
+
+class AsgiAppTest(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def load_app(self, backend_app):
+        import asgi_app
+        self.client = TestClient(asgi_app.create_app())
+
+    def recommend(self, **kwargs):
+        return self.client.post('/api/career-recommendations', **kwargs)
+
+    def test_career_recommendations(self):
+        response = self.recommend(json={'skills': ['Python', 'SQL']})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['recommendations']), 3)
+
+    def test_invalid_bodies(self):
+        for body in ([1, 2], 'Python', 5, {'skills': []}):
+            self.assertEqual(self.recommend(json=body).status_code, 400, body)
+        response = self.recommend(content=b'{not json', headers={'Content-Type': 'application/json'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_analyze_resume_needs_a_pdf(self):
+        self.assertEqual(self.client.post('/api/analyze-resume', data={'mode': 'fast'}).status_code, 400)
+        response = self.client.post('/api/analyze-resume', files={'file': ('resume.txt', b'text')})
+        self.assertEqual(response.status_code, 400)
+
+    def test_healthz(self):
+        self.assertEqual(self.client.get('/healthz').json()['status'], 'ready')
+
+
+if __name__ == '__main__':
+    unittest.main()
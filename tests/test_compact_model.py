@@ -0,0 +1,79 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.pipeline import Pipeline
+
+from compact_model import CompactModel
+from export_model import export_compact_model
+from resume_analyzer import ResumeAnalyzer, resume_columns
+
+WORDS = ['python', 'sql', 'react', 'docker', 'aws', 'design', 'leadership', 'statistics', 'java', 'linux']
+DEGREES = ['Bachelor', 'Masters', 'PhD', 'Diploma']
+
+
+def sample_resumes(count, seed):
+    rng = random.Random(seed)
+    resumes = []
+    for _ in range(count):
+        skills = rng.sample(WORDS, rng.randint(1, 6))
+        years = rng.randint(0, 12)
+        resumes.append({
+            'skills': [skill.title() for skill in skills],
+            'experience': f"Developer with {years} years experience " + ' '.join(rng.choices(WORDS, k=5)),
+            'education': f"{rng.choice(DEGREES)} in Computer Science",
+            'score': 40 + 3 * len(skills) + 2 * min(years, 10) + rng.uniform(-5, 5)
+        })
+    return resumes
+
+
+class CompactModelTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.train = sample_resumes(120, seed=0)
+        # Unseen resumes, with words outside the vocabulary and empty sections
+        self.resumes = sample_resumes(40, seed=1) + [
+            {'skills': ['Cobol', 'Fortran'], 'experience': 'Mainframe operator', 'education': ''},
+            {'skills': [], 'experience': '', 'education': ''}
+        ]
+
+    def fitted_analyzer(self, sparse, hashed):
+        analyzer = ResumeAnalyzer(sparse=sparse, model_path=os.path.join(self.directory, 'model.joblib'))
+        if hashed:
+            # The experience section hashed, the others with a vocabulary
+            hashing = Pipeline([
+                ('hashing', HashingVectorizer(n_features=2 ** 10, norm=None, alternate_sign=False)),
+                ('tfidf', TfidfTransformer())
+            ])
+            analyzer.pipeline.set_params(features__experience=hashing)
+        analyzer.pipeline.set_params(model=RandomForestRegressor(n_estimators=10, random_state=0))
+        analyzer.pipeline.fit(resume_columns(self.train), [resume['score'] for resume in self.train])
+        analyzer.model_version = 'test'
+        return analyzer
+
+    def assert_same_predictions(self, sparse, hashed):
+        analyzer = self.fitted_analyzer(sparse, hashed)
+        path = export_compact_model(analyzer, os.path.join(self.directory, 'model.npz'))
+        compact = CompactModel(path)
+        expected = analyzer.pipeline.predict(resume_columns(self.resumes))
+        self.assertTrue(np.allclose(compact.predict(self.resumes), expected))
+        self.assertEqual(compact.model_version, 'test')
+
+    def test_vocabulary_features(self):
+        self.assert_same_predictions(sparse=False, hashed=False)
+
+    def test_hashed_features(self):
+        self.assert_same_predictions(sparse=False, hashed=True)
+
+    def test_sparse_pipeline(self):
+        self.assert_same_predictions(sparse=True, hashed=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from job_index import JobIndex, build_index
+
+TITLES = ['Backend Engineer', 'Data Scientist', 'UX Designer', 'DevOps Engineer', 'Product Manager']
+SKILLS = [['Python', 'SQL'], ['Python', 'Statistics'], ['Figma', 'Research'], ['Docker', 'AWS'], ['Agile']]
+
+
+class JobIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.catalog = os.path.join(self.directory, 'jobs.jsonl')
+        self.path = os.path.join(self.directory, 'index')
+
+    def write_catalog(self, lines):
+        with open(self.catalog, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    def test_blank_lines_are_skipped(self):
+        jobs = [json.dumps({'title': title, 'skills': skills}) for title, skills in zip(TITLES, SKILLS)]
+        self.write_catalog(['', jobs[0], '', '  ', *jobs[1:], ''])
+        build_index(self.catalog, self.path, dim=4, n_lists=2)
+        index = JobIndex(self.path)
+        self.assertEqual(len(index), len(TITLES))
+        self.assertEqual([job['title'] for job in index.jobs(range(len(TITLES)))], TITLES)
+        job_id, _ = index.search('Figma user research', k=1, nprobe=2)[0]
+        self.assertEqual(index.jobs([job_id])[0]['title'], 'UX Designer')
+
+    def test_catalog_too_small(self):
+        for lines in ([], [json.dumps({'title': 'Backend Engineer'}), '']):
+            self.write_catalog(lines)
+            with self.assertRaises(ValueError):
+                build_index(self.catalog, self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
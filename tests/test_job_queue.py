@@ -0,0 +1,56 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from job_queue import JOB_MAX_ATTEMPTS, JobQueue, JobQueueFull
+
+
+class JobQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.queue = JobQueue(self.directory)
+
+    def submit(self, name, **kwargs):
+        return self.queue.submit(io.BytesIO(b'%PDF'), name, **kwargs)
+
+    def test_claim_in_submission_order(self):
+        first = self.submit('a.pdf', upload_hash='h1', resume_id='r1', mode='fast')
+        second = self.submit('b.pdf')
+        claimed = self.queue.claim(worker_pid=10)
+        self.assertEqual(claimed[0], first)
+        self.assertEqual((claimed[1], claimed[2], claimed[4], claimed[5]), ('a.pdf', 'h1', 'r1', 'fast'))
+        self.assertTrue(os.path.exists(claimed[3]))
+        self.assertEqual(self.queue.claim(worker_pid=11)[0], second)
+        self.assertIsNone(self.queue.claim(worker_pid=12))
+
+        self.queue.complete(first, {'overall_score': 70})
+        job = self.queue.get(first)
+        self.assertEqual((job['status'], job['result']), ('done', {'overall_score': 70}))
+        self.assertFalse(os.path.exists(claimed[3]))
+
+    def test_requeue_abandoned(self):
+        job_id = self.submit('a.pdf')
+        self.queue.claim(worker_pid=10)
+        # Worker 10 is gone, worker 11 is not running anything
+        self.assertEqual(self.queue.requeue_abandoned({11}), (1, 0))
+        self.assertEqual(self.queue.get(job_id)['status'], 'queued')
+
+        for attempt in range(2, JOB_MAX_ATTEMPTS + 1):
+            self.assertEqual(self.queue.claim(worker_pid=attempt)[0], job_id)
+            self.queue.requeue_abandoned(set())
+        job = self.queue.get(job_id)
+        self.assertEqual((job['status'], job['attempts']), ('failed', JOB_MAX_ATTEMPTS))
+        self.assertIsNone(self.queue.claim(worker_pid=99))
+
+    def test_full_queue(self):
+        self.submit('a.pdf', max_queued=1)
+        with self.assertRaises(JobQueueFull):
+            self.submit('b.pdf', max_queued=1)
+        self.assertEqual(self.queue.stats()['jobs']['queued'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from result_cache import MemoryCache, SQLiteCache, analysis_key
+
+
+class SQLiteCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'results.sqlite3')
+
+    def changes(self, cache):
+        return cache._connection().total_changes
+
+    def test_lookups_are_written_in_batches(self):
+        cache = SQLiteCache(self.path, flush_seconds=3600)
+        cache.set('analysis', 'a', {'overall_score': 70})
+        before = self.changes(cache)
+        for _ in range(5):
+            self.assertEqual(cache.get('analysis', 'a'), {'overall_score': 70})
+        self.assertIsNone(cache.get('analysis', 'b'))
+        self.assertEqual(self.changes(cache), before)
+
+        # Stats include the counts not written yet
+        stats = cache.stats()['namespaces']['analysis']
+        self.assertEqual((stats['hits'], stats['misses']), (5, 1))
+        self.assertGreater(self.changes(cache), before)
+
+    def test_evicts_least_recently_used(self):
+        cache = SQLiteCache(self.path, max_size=3, flush_seconds=3600)
+        for key in 'abc':
+            cache.set('text', key, key)
+        # Read, though not written yet: eviction flushes access times first
+        cache.get('text', 'a')
+        cache.set('text', 'd', 'd')
+        self.assertEqual(cache.get('text', 'a'), 'a')
+        self.assertIsNone(cache.get('text', 'b'))
+        self.assertEqual(cache.stats()['size'], 3)
+
+    def test_shared_between_instances(self):
+        SQLiteCache(self.path).set('text', 'a', 'hello')
+        self.assertEqual(SQLiteCache(self.path).get('text', 'a'), 'hello')
+        conn = sqlite3.connect(self.path)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0], 1)
+        conn.close()
+
+
+class MemoryCacheTest(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = MemoryCache(max_size=2)
+        cache.set('text', 'a', 1)
+        cache.set('text', 'b', 2)
+        cache.get('text', 'a')
+        cache.set('text', 'c', 3)
+        self.assertEqual(cache.get('text', 'a'), 1)
+        self.assertIsNone(cache.get('text', 'b'))
+
+    def test_analysis_key_depends_on_model_and_mode(self):
+        keys = {analysis_key('hash', version, mode) for version in ('1', '2') for mode in ('fast', 'accurate')}
+        self.assertEqual(len(keys), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
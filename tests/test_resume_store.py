@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pytest
+
+from benchmarks.common import fitted_analyzer, synthetic_resumes
+from resume_store import ResumeStore
+
+JOB = 'Backend Engineer with Python, SQL, Docker and Kubernetes'
+
+
+class ResumeStoreTest(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def load_analyzer(self, analyzer):
+        self.analyzer = analyzer
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'resumes.sqlite3')
+        self.store = ResumeStore(self.path, self.analyzer)
+        self.resumes = synthetic_resumes(300, seed=1)
+        self.store.add_many([(f'key{i}', f'Name {i}', resume, {'overall_score': 50 + i % 50})
+                             for i, resume in enumerate(self.resumes)])
+
+    def test_pruned_ranking_matches_full_scan(self):
+        ranked, scored = self.store.rank(JOB, top_n=20)
+        full, everyone = self.store.rank(JOB, top_n=20, prune=False)
+        self.assertEqual(everyone, len(self.resumes))
+        self.assertLess(scored, everyone)
+        # Resumes without any of the job's skills score lowest, so pruning
+        # them leaves the top of the ranking as it was
+        self.assertEqual(ranked, full)
+        scores = [candidate['rank_score'] for candidate in ranked]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertTrue(all(candidate['matched_skills'] for candidate in ranked))
+
+    def test_top_n_larger_than_candidates(self):
+        ranked, scored = self.store.rank(JOB, top_n=10000)
+        self.assertEqual(len(ranked), scored)
+        # A job without known skills has nothing to prune by
+        self.assertEqual(self.store.rank('Nothing relevant here', top_n=5)[1], len(self.resumes))
+
+    def test_sees_resumes_added_by_another_process(self):
+        self.store.rank(JOB)
+        other = ResumeStore(self.path, self.analyzer)
+        other.add('late', 'Late', {'skills': ['Python', 'SQL', 'Docker', 'Kubernetes'],
+                                   'experience': JOB, 'education': ''}, {'overall_score': 90})
+        ranked, _ = self.store.rank(JOB, top_n=1)
+        self.assertEqual(ranked[0]['resume_key'], 'late')
+        self.assertEqual(len(self.store), len(self.resumes) + 1)
+
+    def test_swap_vectorizes_under_the_new_model(self):
+        new_analyzer = fitted_analyzer(100, seed=2, model_path=os.path.join(self.directory, 'model.joblib'))
+        new_analyzer.model_version = 'new'
+        self.store.rank(JOB)
+        self.store.swap(new_analyzer)
+        self.assertEqual(self.store._model_version, 'new')
+        # Nothing is left to recompute on the first query, which ranks like a
+        # store loaded from scratch under the new model
+        expected = ResumeStore(self.path, new_analyzer).rank(JOB)
+        self.assertEqual(self.store.rank(JOB), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
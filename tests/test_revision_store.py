@@ -0,0 +1,42 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from revision_store import RevisionStore
+
+SECTIONS = {'skills': 's1', 'experience': 'e1', 'education': 'd1'}
+
+
+class RevisionStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'revisions.sqlite3')
+
+    def test_changed_sections(self):
+        store = RevisionStore(self.path)
+        first = store.record('r1', SECTIONS, 60.0)
+        self.assertEqual(first, {'changed_sections': ['skills', 'experience', 'education'],
+                                 'previous_score': None, 'score_change': None})
+        second = store.record('r1', {**SECTIONS, 'experience': 'e2'}, 64.5)
+        self.assertEqual(second, {'changed_sections': ['experience'], 'previous_score': 60.0,
+                                  'score_change': 4.5})
+        # Another resume_id has its own history
+        self.assertIsNone(store.record('r2', SECTIONS, 50.0)['previous_score'])
+
+    def test_shared_between_instances(self):
+        RevisionStore(self.path).record('r1', SECTIONS, 60.0)
+        self.assertEqual(RevisionStore(self.path).record('r1', SECTIONS, 61.0)['changed_sections'], [])
+
+    def test_expired_revisions_are_forgotten(self):
+        store = RevisionStore(self.path, ttl=60)
+        store.record('r1', SECTIONS, 60.0)
+        with mock.patch('time.time', return_value=time.time() + 120):
+            self.assertIsNone(store.record('r1', SECTIONS, 60.0)['previous_score'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pytest
+
+from user_store import UserStore
+
+
+class UserEndpointsTest(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def load_app(self, root_app):
+        self.app = root_app
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        store = UserStore(os.path.join(self.directory, 'users.sqlite3'))
+        patcher = mock.patch.object(self.app, 'user_store', store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.client = self.app.app.test_client()
+
+    def register(self, body):
+        return self.client.post('/api/register', json=body)
+
+    def recommend(self, body):
+        return self.client.post('/api/recommendations', json=body)
+
+    def test_register_and_recommend_by_id_and_email(self):
+        response = self.register([
+            {'email': 'ada@example.com', 'skills': 'data, python'},
+            {'email': 'bob@example.com', 'skills': ['Design']}
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['user_ids'], [1, 2])
+
+        by_id = self.recommend({'user_id': 1}).get_json()['recommendations']
+        self.assertIn('Data Scientist', by_id)
+        by_email = self.recommend({'email': 'BOB@example.com'}).get_json()['recommendations']
+        self.assertIn('Product Designer', by_email)
+
+    def test_unknown_user(self):
+        self.register({'email': 'ada@example.com', 'skills': 'data'})
+        self.assertEqual(self.recommend({'user_id': 2}).status_code, 404)
+        self.assertEqual(self.recommend({'email': 'nobody@example.com'}).status_code, 404)
+
+    def test_duplicate_email_in_bulk_list(self):
+        response = self.register([{'email': 'ada@example.com'}, {'email': 'bob@example.com'},
+                                  {'email': 'Ada@example.com'}])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.app.user_store.count(), 0)
+        self.assertEqual(self.recommend({'email': 'bob@example.com'}).status_code, 404)
+
+    def test_invalid_skills(self):
+        self.assertEqual(self.register({'email': 'ada@example.com', 'skills': 5}).status_code, 400)
+        self.assertEqual(self.recommend({'skills': {'data': 1}}).status_code, 400)
+        self.assertEqual(self.recommend([1, 2]).status_code, 400)
+        self.assertEqual(self.app.user_store.count(), 0)
+
+    def test_bulk_password_limit(self):
+        users = [{'email': f'user{number}@example.com', 'password': 'secret'} for number in range(3)]
+        with mock.patch.object(self.app, 'MAX_BULK_PASSWORDS', 2):
+            self.assertEqual(self.register(users).status_code, 400)
+            self.assertEqual(self.register(users[:2]).status_code, 200)
+        self.assertEqual(self.app.user_store.count(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
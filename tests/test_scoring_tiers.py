@@ -0,0 +1,51 @@
+import unittest
+
+import pytest
+
+from benchmarks.common import synthetic_resumes
+
+
+class ScoringTiersTest(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def load_analyzer(self, analyzer):
+        self.analyzer = analyzer
+        self.resumes = synthetic_resumes(200, seed=3)
+
+    def set_margin(self, margin):
+        original = self.analyzer.surrogate['margin']
+        self.analyzer.surrogate['margin'] = margin
+        self.addCleanup(self.analyzer.surrogate.__setitem__, 'margin', original)
+
+    def scores(self, mode):
+        results = self.analyzer.analyze_resumes(self.resumes, mode)
+        return [result['overall_score'] for result in results], [result['scored_by'] for result in results]
+
+    def test_auto_escalates_scores_near_a_cutoff(self):
+        # Narrower than the small test model's own margin, so both tiers score
+        self.set_margin(2)
+        forest, forest_tiers = self.scores('accurate')
+        surrogate, surrogate_tiers = self.scores('fast')
+        auto, tiers = self.scores('auto')
+        self.assertEqual(set(forest_tiers), {'forest'})
+        self.assertEqual(set(surrogate_tiers), {'surrogate'})
+        self.assertEqual(set(tiers), {'forest', 'surrogate'})
+        for index, tier in enumerate(tiers):
+            self.assertEqual(auto[index], (forest if tier == 'forest' else surrogate)[index])
+
+    def test_margin_decides_escalation(self):
+        self.set_margin(1000)
+        self.assertEqual(set(self.scores('auto')[1]), {'forest'})
+        self.set_margin(0)
+        self.assertEqual(set(self.scores('auto')[1]), {'surrogate'})
+
+    def test_single_resume_matches_batch(self):
+        for mode in ('fast', 'accurate', 'auto'):
+            single = self.analyzer.analyze_resume(self.resumes[0], mode)
+            self.assertEqual(single, self.analyzer.analyze_resumes(self.resumes[:1], mode)[0])
+
+    def test_unknown_mode(self):
+        self.assertIsNone(self.analyzer.analyze_resumes(self.resumes, 'fastest'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from telemetry import EXITED_METRICS_FILE, Registry
+
+
+class RegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def registry(self):
+        registry = Registry(self.directory)
+        counter = registry.counter('requests_total', 'Requests.', status=('ok', 'error'))
+        return registry, counter
+
+    def write_exited(self, name, values):
+        # The file a process that has exited leaves behind: nobody holds its lock
+        np.save(os.path.join(self.directory, name), np.array(values, dtype=np.float64))
+
+    def test_exited_processes_are_folded(self):
+        registry, counter = self.registry()
+        counter.inc('ok', amount=2)
+        # Same pid as the earlier one, from a previous start
+        self.write_exited(f'metrics-{os.getpid()}-old.npy', [5, 1])
+        self.write_exited('metrics-1-other.npy', [3, 0])
+        self.assertEqual(registry.totals().tolist(), [10, 1])
+        self.assertEqual(sorted(name for name in os.listdir(self.directory) if name.endswith('.npy')),
+                         sorted([os.path.basename(registry._path), EXITED_METRICS_FILE]))
+        # Counters keep counting on from the folded totals
+        self.write_exited('metrics-2-other.npy', [1, 1])
+        counter.inc('error')
+        self.assertEqual(registry.totals().tolist(), [11, 3])
+
+    def test_other_metric_sets_are_dropped(self):
+        registry, counter = self.registry()
+        counter.inc('ok')
+        self.write_exited('metrics-1-other.npy', [1, 2, 3])
+        self.assertEqual(registry.totals().tolist(), [1, 0])
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'metrics-1-other.npy')))
+
+    def test_live_files_are_not_folded(self):
+        registry, counter = self.registry()
+        other, other_counter = self.registry()
+        counter.inc('ok')
+        other_counter.inc('ok', amount=4)
+        self.assertEqual(registry.totals().tolist(), [5, 0])
+        self.assertTrue(os.path.exists(other._path))
+        self.assertFalse(os.path.exists(os.path.join(self.directory, EXITED_METRICS_FILE)))
+
+
+if __name__ == '__main__':
+    unittest.main()
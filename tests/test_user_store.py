@@ -0,0 +1,83 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from user_store import DuplicateEmail, UserStore, parse_skills
+
+
+class UserStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        # Two users per executemany call, so a bulk list spans several batches
+        self.store = UserStore(os.path.join(self.directory, 'users.sqlite3'), batch_size=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_lookup_by_id_and_email(self):
+        ids = self.store.add_many([
+            {'email': 'Ada@Example.com ', 'name': 'Ada', 'skills': 'Python; SQL, python'},
+            {'email': 'bob@example.com', 'name': 'Bob', 'skills': ['Design']},
+            {'email': 'eve@example.com', 'name': 'Eve'}
+        ])
+        self.assertEqual(ids, [1, 2, 3])
+        self.assertEqual(self.store.skills(1), ['python', 'sql'])
+        self.assertEqual(self.store.skills_by_email('ada@example.com'), ['python', 'sql'])
+        self.assertEqual(self.store.skills_by_email('BOB@example.com'), ['design'])
+        # A user without skills is still found
+        self.assertEqual(self.store.skills(3), [])
+        self.assertEqual(self.store.skills_by_email('eve@example.com'), [])
+        self.assertEqual(self.store.users_with_skill('Python'), [1])
+
+    def test_unknown_user(self):
+        self.store.add({'email': 'ada@example.com', 'skills': 'python'})
+        self.assertIsNone(self.store.skills(2))
+        self.assertIsNone(self.store.skills_by_email('nobody@example.com'))
+
+    def test_duplicate_email_in_bulk_list_rolls_back(self):
+        self.store.add({'email': 'ada@example.com', 'skills': 'python'})
+        users = [
+            {'email': 'bob@example.com', 'skills': 'go'},
+            {'email': 'carol@example.com', 'skills': 'go'},
+            {'email': 'dan@example.com', 'skills': 'go'},
+            {'email': 'BOB@example.com', 'skills': 'go'}
+        ]
+        with self.assertRaises(DuplicateEmail):
+            self.store.add_many(users)
+        # The batches written before the duplicate are rolled back too
+        self.assertEqual(self.store.count(), 1)
+        self.assertIsNone(self.store.skills_by_email('bob@example.com'))
+        self.assertEqual(self.store.users_with_skill('go'), [])
+        self.assertEqual(self.store.add({'email': 'bob@example.com'}), 2)
+
+    def test_duplicate_of_registered_email(self):
+        self.store.add({'email': 'ada@example.com'})
+        with self.assertRaises(DuplicateEmail):
+            self.store.add_many([{'email': 'bob@example.com'}, {'email': 'ADA@example.com'}])
+        self.assertEqual(self.store.count(), 1)
+
+    def test_passwords_are_hashed(self):
+        self.store.add_many([{'email': 'ada@example.com', 'password': 'secret'}, {'email': 'bob@example.com'}])
+        conn = sqlite3.connect(self.store.path)
+        hashes = [row[0] for row in conn.execute("SELECT password_hash FROM users ORDER BY id")]
+        conn.close()
+        self.assertTrue(hashes[0].startswith('pbkdf2_sha256$'))
+        self.assertNotIn('secret', hashes[0])
+        self.assertIsNone(hashes[1])
+
+    def test_invalid_fields(self):
+        for user in ({'skills': 5}, {'skills': {'python': 1}}, {'skills': ['python', 3]}, {'password': 123}):
+            with self.assertRaises(ValueError):
+                self.store.add_many([{'email': 'ada@example.com'}, user])
+        self.assertEqual(self.store.count(), 0)
+
+    def test_parse_skills(self):
+        self.assertEqual(parse_skills(' Python , SQL;;python '), ['python', 'sql'])
+        self.assertEqual(parse_skills(['React', ' ', 'react']), ['react'])
+        self.assertEqual(parse_skills(None), [])
+
+
+if __name__ == '__main__':
+    unittest.main()